@@ -1,10 +1,51 @@
 from django.contrib import admin
-from .models import Card
+from .models import Card, CardStatusTransition, InventoryStat, Job
 
 
 @admin.register(Card)
 class CardAdmin(admin.ModelAdmin):
-    list_display = ['name', 'condition', 'price', 'sale_status', 'created_at']
-    list_filter = ['condition', 'sale_status', 'created_at']
+    list_display = ['name', 'condition', 'price', 'sale_status', 'image_status', 'created_at']
+    list_filter = ['condition', 'sale_status', 'image_status', 'created_at']
     search_fields = ['name']
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'image_status']
+
+
+@admin.register(CardStatusTransition)
+class CardStatusTransitionAdmin(admin.ModelAdmin):
+    """판매 상태 변경 이력 (조회 전용)"""
+    list_display = ['id', 'card_number', 'from_status', 'to_status', 'user', 'created_at']
+    list_filter = ['to_status', 'created_at']
+    search_fields = ['card_number']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(InventoryStat)
+class InventoryStatAdmin(admin.ModelAdmin):
+    """재고 통계 (조회 전용, 값이 어긋나면 rebuild_inventory_stats 명령으로 재계산)"""
+    list_display = ['sale_status', 'rarity', 'condition', 'count', 'price_total']
+    list_filter = ['sale_status', 'rarity', 'condition']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'task', 'key', 'status', 'attempts', 'max_attempts', 'run_after', 'updated_at']
+    list_filter = ['task', 'status']
+    search_fields = ['key']
+    readonly_fields = ['created_at', 'updated_at', 'locked_at', 'last_error']
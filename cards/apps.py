@@ -3,3 +3,7 @@ from django.apps import AppConfig
 
 class CardsConfig(AppConfig):
     name = 'cards'
+
+    def ready(self):
+        # 백그라운드 작업 처리 함수 등록
+        from . import tasks  # noqa: F401
@@ -0,0 +1,150 @@
+"""
+공개 조회 API의 비동기 버전 (ASGI 서버용)
+
+ASGI(`yugioh_site.asgi`, uvicorn 등)로 실행하면 settings.ASYNC_READ_VIEWS가 켜져 아래 경로의
+GET/HEAD를 이 모듈의 비동기 뷰가 처리합니다. 느린 클라이언트나 DB 대기 중에도 이벤트 루프가
+다른 요청을 처리하므로 워커 하나가 동시 연결 하나에 묶이지 않습니다.
+- GET /api/cards/                       목록 (필터/정렬/검색, keyset 페이지네이션)
+- GET /api/cards/<id>/                  상세
+- GET /api/cards/search_card_names/     카드명 자동완성
+
+응답 JSON, 응답 캐시 항목/ETag, 요청 빈도 제한은 CardViewSet과 같습니다 (WSGI와 ASGI 워커를 섞어
+운영해도 캐시를 공유). 쓰기 요청(POST/PUT/PATCH/DELETE)과 그 밖의 액션은 기존 동기 CardViewSet이
+처리합니다. 응답은 항상 JSON입니다 (DRF 브라우저 화면은 WSGI에서만).
+"""
+from types import SimpleNamespace
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.http import HttpResponse
+from django.utils.cache import patch_vary_headers
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotFound, Throttled
+from rest_framework.renderers import JSONRenderer
+
+from . import name_index, response_cache
+from .filters import filter_cards
+from .models import Card
+from .pagination import CardPagination
+from .search import search_cards
+from .serializers import CardListSerializer, CardSerializer
+from .throttles import CardActionThrottle
+from .views import CardViewSet
+
+READ_METHODS = ('GET', 'HEAD')
+
+# 조회가 아닌 요청을 넘길 기존 뷰 (DefaultRouter가 만드는 것과 같은 매핑)
+card_collection_view = CardViewSet.as_view({'get': 'list', 'post': 'create'}, basename='card', detail=False)
+card_item_view = CardViewSet.as_view(
+    {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+    basename='card', detail=True,
+)
+
+# 요청 빈도 제한은 CardViewSet.throttle_scopes의 범위를 그대로 사용
+search_throttle_view = SimpleNamespace(action='search_card_names', throttle_scopes=CardViewSet.throttle_scopes)
+
+renderer = JSONRenderer()
+
+
+def respond(data, status=200):
+    """DRF JSONRenderer와 같은 본문의 응답 (응답 캐시 저장용 data 속성 포함)"""
+    response = HttpResponse(renderer.render(data), content_type='application/json', status=status)
+    response.data = data
+    patch_vary_headers(response, ['Accept'])
+    return response
+
+
+def error_response(exc):
+    """DRF 기본 예외 처리와 같은 형식의 오류 응답"""
+    data = exc.detail if isinstance(exc.detail, (list, dict)) else {'detail': exc.detail}
+    response = respond(data, exc.status_code)
+    wait = getattr(exc, 'wait', None)
+    if wait is not None:
+        response['Retry-After'] = '%d' % wait
+    return response
+
+
+@csrf_exempt
+async def card_list(request):
+    """카드 목록 (CardViewSet.list와 같은 응답)"""
+    if request.method not in READ_METHODS:
+        return await sync_to_async(card_collection_view)(request)
+    try:
+        return await response_cache.acached_response(
+            request, 'list', lambda: _build_list(request), lambda: _list_validators(request), respond,
+        )
+    except APIException as exc:
+        return error_response(exc)
+
+
+async def _build_list(request):
+    queryset = Card.objects.all()
+    query = request.GET.get('q', '').strip()
+    if query:
+        # SQLite 등에서는 후보를 파이썬에서 점수화하므로 스레드에서 실행
+        queryset = await sync_to_async(search_cards)(queryset, query[:100])
+    queryset = filter_cards(queryset, request.GET).values(*CardListSerializer.source_fields)
+    paginator = CardPagination()
+    rows = await paginator.apaginate_queryset(queryset, request)
+    data = CardListSerializer(rows, many=True, context={'request': request}).data
+    return respond(paginator.get_paginated_data(data))
+
+
+async def _list_validators(request):
+    """CardViewSet._list_validators와 같은 값 (필터 범위의 max(updated_at)와 개수로 만든 ETag, Last-Modified 없음)"""
+    queryset = filter_cards(Card.objects.all(), request.GET)
+    stats = await queryset.order_by().aaggregate(last_modified=Max('updated_at'), count=Count('id'))
+    last_modified = stats['last_modified']
+    etag = response_cache.make_etag(
+        request, 'list', last_modified.isoformat() if last_modified else '', stats['count']
+    )
+    return etag, None
+
+
+@csrf_exempt
+async def card_detail(request, pk):
+    """카드 상세 (CardViewSet.retrieve와 같은 응답)"""
+    if request.method not in READ_METHODS:
+        return await sync_to_async(card_item_view)(request, pk=str(pk))
+    try:
+        return await response_cache.acached_response(
+            request, 'retrieve', lambda: _build_detail(request, pk), lambda: _detail_validators(request, pk), respond,
+        )
+    except APIException as exc:
+        return error_response(exc)
+
+
+async def _build_detail(request, pk):
+    try:
+        card = await Card.objects.aget(pk=pk)
+    except Card.DoesNotExist:
+        # DRF get_object_or_404와 같은 메시지
+        raise NotFound(f'No {Card._meta.object_name} matches the given query.')
+    return respond(CardSerializer(card, context={'request': request}).data)
+
+
+async def _detail_validators(request, pk):
+    last_modified = await Card.objects.filter(pk=pk).values_list('updated_at', flat=True).afirst()
+    if last_modified is None:
+        return None
+    return response_cache.make_etag(request, 'retrieve', last_modified.isoformat()), last_modified
+
+
+async def search_card_names(request):
+    """카드명 자동완성 (CardViewSet.search_card_names와 같은 응답, card_search 요청 빈도 제한)"""
+    if request.method not in READ_METHODS:
+        return error_response(MethodNotAllowed(request.method))
+    throttle = CardActionThrottle()
+    # 로그인 사용자 확인(세션 조회)과 캐시 카운터는 스레드에서
+    if not await sync_to_async(throttle.allow_request)(request, search_throttle_view):
+        return error_response(Throttled(throttle.wait()))
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return respond({'results': []})
+    try:
+        limit = min(max(int(request.GET.get('limit', 20)), 1), 50)
+    except ValueError:
+        limit = 20
+    results = [{'name': name} for name in await name_index.asearch(query, limit)]
+    return respond({'results': results, 'count': len(results)})
@@ -0,0 +1,757 @@
+"""
+성능 측정 도구 (대량 카탈로그 생성, 마이크로 벤치마크, HTTP 부하 시나리오, 결과 비교)
+
+- 카탈로그: 실제 카드명 사전(CardName)의 이름과 합성 이미지로 카드 N장을 생성합니다.
+  합성 이미지 몇 장과 그 파생 이미지를 한 번만 만들어 여러 카드가 공유하며,
+  MediaBlob 참조 횟수도 카드 수만큼 맞춰 두므로 생성한 카드를 지워도 파일 관리가 어긋나지 않습니다.
+  생성한 카드는 시리얼 번호가 SEED_SERIAL_PREFIX로 시작하며 clear_seeded()로 지웁니다.
+- 마이크로 벤치마크: 직렬화, 이미지 최적화 작업, 카드명 자동완성/검색의 1회당 시간
+- 부하 시나리오: 프로세스 안에서 WSGI 서버(스레드)를 띄우고 실제 HTTP로 목록/필터/상세/
+  등록/자동완성을 동시에 요청하여 p50/p95/p99 지연 시간과 RPS를 측정합니다.
+- 서버 비교: 워커 수가 고정된 WSGI 서버와 ASGI 서버(uvicorn)에 같은 수의 동시 연결로 조회 시나리오를 요청합니다.
+- 결과는 JSON으로 저장하고, compare()로 기준 결과와 비교하여 느려진 항목을 찾습니다.
+
+`python manage.py seed_cards`, `python manage.py benchmark`에서 사용합니다.
+"""
+import datetime
+import http.client
+import io
+import json
+import math
+import platform
+import random
+import secrets
+import shutil
+import socket
+import statistics
+import subprocess
+import tempfile
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from importlib import import_module
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.db.models import F, Max
+from django.test.utils import override_settings
+from PIL import Image, ImageDraw
+
+from . import imaging, name_index
+from .models import Card, CardName, Job, MediaBlob
+from .search import search_cards
+from .serializers import CardListSerializer, CardSerializer
+from .tasks import optimize_card_image, release_files, save_derivatives
+
+SEED_SERIAL_PREFIX = 'BENCH-'
+SEED_IMAGE_DIR = 'cards/bench'
+
+# 생성 데이터의 분포 (값, 가중치)
+SALE_STATUS_WEIGHTS = (('available', 70), ('reserved', 5), ('sold', 25))
+RARITY_WEIGHTS = (('N', 40), ('R', 20), ('SR', 15), ('UR', 12), ('SE', 8), ('UL', 3), ('HR', 2))
+CONDITION_WEIGHTS = (('S', 30), ('A', 40), ('B', 20), ('C', 10))
+
+# 결과 비교 시 값이 작을수록 좋은 지표와 클수록 좋은 지표
+LOWER_IS_BETTER = ('median', 'p50', 'p95', 'p99')
+HIGHER_IS_BETTER = ('rps',)
+# p99는 표본이 적으면 가장 느린 몇 건에 좌우되므로 양쪽 요청 수가 이 이상일 때만 비교
+MIN_P99_SAMPLES = 1000
+# WSGI/ASGI 서버 비교에 사용하는 조회 시나리오 (ASGI 비동기 뷰가 처리하는 경로)
+SERVER_SCENARIOS = ('list', 'filter', 'detail', 'autocomplete')
+
+
+class NoCardNamesError(ValueError):
+    """카드명 사전이 비어 있어 카드를 생성할 수 없음"""
+
+
+def parse_count(text):
+    """'10k', '100k', '1m', '2500' → 정수"""
+    text = str(text).strip().lower().replace('_', '').replace(',', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    if multiplier != 1:
+        text = text[:-1]
+    return int(float(text) * multiplier)
+
+
+# ---------------------------------------------------------------------------
+# 카탈로그 생성
+# ---------------------------------------------------------------------------
+
+def synthetic_image(rng, width=1000, height=1460, quality=90):
+    """카드 사진과 비슷한 크기/압축률의 합성 JPEG (같은 rng 상태면 같은 내용)"""
+    img = Image.new('RGB', (width, height))
+    draw = ImageDraw.Draw(img)
+    top = tuple(rng.randrange(256) for _ in range(3))
+    bottom = tuple(rng.randrange(256) for _ in range(3))
+    for y in range(height):
+        ratio = y / height
+        draw.line([(0, y), (width, y)], fill=tuple(int(a + (b - a) * ratio) for a, b in zip(top, bottom)))
+    for _ in range(40):
+        x, y = rng.randrange(width), rng.randrange(height)
+        size = rng.randrange(20, width // 3)
+        draw.ellipse([x, y, x + size, y + size], fill=tuple(rng.randrange(256) for _ in range(3)))
+    # 사진처럼 고주파 성분이 있어야 압축/리사이즈 비용이 현실적임
+    noise = Image.effect_noise((width, height), 24).convert('RGB')
+    img = Image.blend(img, noise, 0.15)
+    buffer = io.BytesIO()
+    img.save(buffer, 'JPEG', quality=quality)
+    return buffer.getvalue()
+
+
+def _make_template(rng, index):
+    """합성 이미지 하나를 저장하고 파생 이미지를 만들어 카드에 넣을 이미지 필드 값 반환"""
+    field = Card._meta.get_field('image')
+    name = field.storage.save(f'{SEED_IMAGE_DIR}/bench_{index}.jpg', ContentFile(synthetic_image(rng)))
+    card = Card(image=name)
+    variants = save_derivatives(card, imaging.build_derivatives(card.image.path))
+    fallback = variants['formats'].get('jpeg') or next(iter(variants['formats'].values()))
+    return {
+        'image': name,
+        'image_optimized': fallback[-1]['name'],
+        'image_variants': variants,
+        'image_status': Card.IMAGE_STATUS_DONE,
+    }
+
+
+def _template_files(fields):
+    """카드 이미지 필드 값이 참조하는 파일 경로 (원본, 최적화본, 파생 이미지)"""
+    return Card(**fields).file_names()
+
+
+def _weighted(rng, weights, count):
+    values, value_weights = zip(*weights)
+    return rng.choices(values, weights=value_weights, k=count)
+
+
+def seed_catalogue(count, images=20, batch_size=5000, seed=0, log=print):
+    """카드 count장 생성 (카드명은 CardName에서, 이미지는 합성 이미지 images장을 공유)
+
+    반환값: {'created', 'images', 'seconds'}
+    """
+    names = list(CardName.objects.order_by('id').values_list('name', flat=True))
+    if not names:
+        raise NoCardNamesError('카드명 사전이 비어 있습니다. 먼저 python manage.py load_card_names를 실행하세요.')
+    if count <= 0:
+        return {'created': 0, 'images': 0, 'seconds': 0.0}
+
+    started = time.monotonic()
+    rng = random.Random(seed)
+    templates = []
+    for index in range(min(images, count)):
+        templates.append(_make_template(rng, index))
+    log(f'합성 이미지 {len(templates)}장과 파생 이미지 생성 완료 ({time.monotonic() - started:.1f}초)')
+
+    offset = _next_seed_serial()
+    usage = Counter()
+    created = 0
+    while created < count:
+        size = min(batch_size, count - created)
+        statuses = _weighted(rng, SALE_STATUS_WEIGHTS, size)
+        rarities = _weighted(rng, RARITY_WEIGHTS, size)
+        conditions = _weighted(rng, CONDITION_WEIGHTS, size)
+        cards = []
+        for i in range(size):
+            template_index = rng.randrange(len(templates))
+            usage[template_index] += 1
+            cards.append(Card(
+                name=rng.choice(names),
+                serial_number=f'{SEED_SERIAL_PREFIX}{offset + created + i:07d}',
+                condition=conditions[i],
+                rarity=rarities[i],
+                # 대부분 수천~수만 원, 일부 고가 카드
+                price=int(min(rng.lognormvariate(9, 1.2), 9_999_999) // 100 * 100),
+                sale_status=statuses[i],
+                **templates[template_index],
+            ))
+        with transaction.atomic():
+            Card.objects.bulk_create(cards)
+        created += size
+        log(f'카드 {created:,}/{count:,}장 생성 ({time.monotonic() - started:.1f}초)')
+
+    # 템플릿 저장 시 파일마다 참조 1회가 기록되었으므로 실제 사용한 카드 수에 맞춤
+    with transaction.atomic():
+        for index, template in enumerate(templates):
+            MediaBlob.objects.filter(name__in=_template_files(template)).update(
+                refcount=F('refcount') + usage[index] - 1
+            )
+    for index, template in enumerate(templates):
+        if not usage[index]:
+            storage = Card._meta.get_field('image').storage
+            for name in _template_files(template):
+                storage.delete(name)
+
+    return {'created': created, 'images': len(templates), 'seconds': round(time.monotonic() - started, 2)}
+
+
+def _next_seed_serial():
+    """다음 생성 카드의 시리얼 번호 (기존 생성 카드 중 가장 큰 번호 + 1)
+
+    일부 생성 카드를 삭제했으면 개수가 가장 큰 번호보다 작으므로 개수를 쓰면 번호가 겹침.
+    번호는 7자리로 채우므로 문자열 최댓값이 숫자 최댓값과 같음
+    """
+    last = (
+        Card.objects.filter(serial_number__regex=rf'^{SEED_SERIAL_PREFIX}[0-9]{{7}}$')
+        .aggregate(last=Max('serial_number'))['last']
+    )
+    return int(last[len(SEED_SERIAL_PREFIX):]) + 1 if last else 0
+
+
+def clear_seeded(batch_size=5000, log=print):
+    """seed_catalogue()로 생성한 카드 삭제 (공유 이미지 파일은 참조 횟수에 따라 정리)"""
+    seeded = Card.objects.filter(serial_number__startswith=SEED_SERIAL_PREFIX)
+    deleted = 0
+    while True:
+        ids = list(seeded.order_by('id').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        # 일괄 삭제는 파일별 참조 수를 합쳐 release_files 작업으로 등록 (공유 파일은 배치마다 한 번)
+        Card.objects.filter(id__in=ids).delete()
+        deleted += len(ids)
+        log(f'카드 {deleted:,}장 삭제')
+    return {'deleted': deleted, 'files': _release_files_now()}
+
+
+def _release_files_now():
+    """카드 삭제로 등록된 파일 참조 해제 작업을 워커를 기다리지 않고 바로 처리, 처리한 파일 수 반환"""
+    released = 0
+    for job in Job.objects.filter(task='release_files', status=Job.STATUS_QUEUED).order_by('id'):
+        # 행 삭제로 작업을 점유 (워커가 먼저 가져간 작업은 건너뜀)
+        if Job.objects.filter(pk=job.pk, status=Job.STATUS_QUEUED).delete()[0]:
+            release_files(job.payload)
+            released += len(job.payload.get('names', {}))
+    return released
+
+
+# ---------------------------------------------------------------------------
+# 마이크로 벤치마크
+# ---------------------------------------------------------------------------
+
+def measure(func, number=1, rounds=5):
+    """func를 number번씩 rounds회 실행하여 1회당 시간(초)의 중앙값/최솟값"""
+    times = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        times.append((time.perf_counter() - started) / number)
+    return {'median': statistics.median(times), 'min': min(times), 'number': number, 'rounds': rounds}
+
+
+def _request():
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    return Request(APIRequestFactory().get('/api/cards/', HTTP_HOST='localhost'))
+
+
+def _rolled_back(func):
+    """func를 트랜잭션 안에서 실행하고 되돌림 (이미지 최적화 벤치마크가 DB를 바꾸지 않도록)"""
+    class Rollback(Exception):
+        pass
+
+    def run():
+        try:
+            with transaction.atomic():
+                func()
+                raise Rollback
+        except Rollback:
+            pass
+    return run
+
+
+def _optimize_benchmark(rng, rounds):
+    """카드 하나의 optimize_card_image 작업 (임시 MEDIA_ROOT, DB 변경은 되돌림)"""
+    media_root = tempfile.mkdtemp(prefix='bench-media-')
+    content = synthetic_image(rng)
+    try:
+        with override_settings(MEDIA_ROOT=media_root):
+            field = Card._meta.get_field('image')
+
+            def run():
+                # 내용이 같으면 해시 저장소가 파일을 재사용하므로 매번 조금씩 다른 이미지 사용
+                name = field.storage.save('cards/bench.jpg', ContentFile(content + uuid.uuid4().bytes))
+                card = Card.objects.bulk_create([Card(
+                    name='벤치마크', condition='S', rarity='N', price=1000, image=name,
+                )])[0]
+                optimize_card_image({'card_id': card.pk})
+
+            return measure(_rolled_back(run), number=1, rounds=rounds)
+    finally:
+        shutil.rmtree(media_root, ignore_errors=True)
+
+
+def run_micro(rounds=5, seed=0, log=print):
+    """마이크로 벤치마크 실행, {이름: {'median', 'min', 'number', 'rounds'}} 반환 (단위: 초/회)"""
+    rng = random.Random(seed)
+    results = {}
+
+    instances = list(Card.objects.order_by('-created_at', '-id')[:20])
+    rows = list(Card.objects.order_by('-created_at', '-id').values(*CardListSerializer.source_fields)[:20])
+    if instances:
+        request = _request()
+        results['serializer.detail'] = measure(
+            lambda: CardSerializer(instances[0], context={'request': request}).data, number=200, rounds=rounds,
+        )
+        results['serializer.page_model'] = measure(
+            lambda: CardSerializer(instances, many=True, context={'request': request}).data, number=20, rounds=rounds,
+        )
+        results['serializer.page_list'] = measure(
+            lambda: CardListSerializer(rows, many=True, context={'request': request}).data, number=50, rounds=rounds,
+        )
+    else:
+        log('카드가 없어 직렬화 벤치마크를 건너뜁니다 (python manage.py seed_cards).')
+
+    names = list(CardName.objects.order_by('id').values_list('name', flat=True)[:5000])
+    if names:
+        queries = _search_queries(rng, names)
+        name_index.get_index()
+        results['name_search.autocomplete'] = measure(
+            lambda: [name_index.search(query) for query in queries], number=1, rounds=rounds,
+        )
+        results['name_search.autocomplete']['queries'] = len(queries)
+        results['card_search.db'] = measure(
+            lambda: [list(search_cards(Card.objects.all(), query).values('id')[:20]) for query in queries[:10]],
+            number=1, rounds=rounds,
+        )
+        results['card_search.db']['queries'] = min(10, len(queries))
+    else:
+        log('카드명 사전이 비어 있어 검색 벤치마크를 건너뜁니다 (python manage.py load_card_names).')
+
+    results['optimize_card_image'] = _optimize_benchmark(rng, rounds)
+    for name, result in results.items():
+        log(f"{name}: {result['median'] * 1000:.3f}ms (최소 {result['min'] * 1000:.3f}ms)")
+    return results
+
+
+def _search_queries(rng, names, count=50):
+    """자동완성 입력 흉내: 카드명의 앞부분/중간 부분/초성"""
+    queries = []
+    for name in rng.sample(names, min(count, len(names))):
+        kind = rng.randrange(3)
+        if kind == 0:
+            queries.append(name[:rng.randint(1, min(4, len(name)))])
+        elif kind == 1 and len(name) > 3:
+            start = rng.randrange(len(name) - 2)
+            queries.append(name[start:start + 3])
+        else:
+            initials = name_index.chosung(name[:4])
+            queries.append(initials if name_index.is_chosung_query(initials) else name[:2])
+    return queries
+
+
+# ---------------------------------------------------------------------------
+# HTTP 부하 시나리오
+# ---------------------------------------------------------------------------
+
+class LoadServer:
+    """프로세스 안의 WSGI 서버 (요청마다 스레드, 운영과 같이 요청이 끝나면 DB 연결을 닫음)
+
+    connections_override: 서버 스레드가 사용할 DB 연결 (테스트의 메모리 SQLite처럼 연결을 공유해야 할 때)
+    """
+
+    def __init__(self, connections_override=None):
+        self.connections_override = connections_override
+
+    def __enter__(self):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadedWSGIServer(
+            ('127.0.0.1', 0), QuietHandler, allow_reuse_address=False,
+            connections_override=self.connections_override,
+        )
+        self.server.set_app(WSGIHandler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.host, self.port = self.server.server_address[:2]
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+
+class PooledLoadServer(LoadServer):
+    """워커 스레드 수가 고정된 WSGI 서버 (gunicorn sync 워커 N개와 같이 동시에 workers개 요청만 처리)
+
+    연결 유지(keep-alive) 없이 요청마다 연결을 닫으며, 나머지 연결은 워커가 빌 때까지 대기합니다.
+    """
+
+    def __init__(self, workers=4, connections_override=None):
+        super().__init__(connections_override)
+        self.workers = workers
+
+    def __enter__(self):
+        from django.core.handlers.wsgi import WSGIHandler
+        from django.core.servers.basehttp import WSGIRequestHandler, WSGIServer
+        from django.db import connections
+
+        override = self.connections_override
+        pool = self.pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='wsgi-worker')
+
+        class QuietHandler(WSGIRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+        class PooledWSGIServer(WSGIServer):
+            request_queue_size = 128
+
+            def process_request(self, request, client_address):
+                pool.submit(self.process_request_thread, request, client_address)
+
+            def process_request_thread(self, request, client_address):
+                if override:
+                    for alias, conn in override.items():
+                        connections[alias] = conn
+                try:
+                    self.finish_request(request, client_address)
+                except Exception:
+                    self.handle_error(request, client_address)
+                finally:
+                    self.shutdown_request(request)
+                    connections.close_all()
+
+        self.server = PooledWSGIServer(('127.0.0.1', 0), QuietHandler, allow_reuse_address=False)
+        self.server.set_app(WSGIHandler())
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.host, self.port = self.server.server_address[:2]
+        return self
+
+    def __exit__(self, *exc):
+        super().__exit__(*exc)
+        self.pool.shutdown(wait=True)
+
+
+class AsgiLoadServer:
+    """프로세스 안의 ASGI 서버 (uvicorn 이벤트 루프 하나, 공개 조회 API는 비동기 뷰가 처리)
+
+    uvicorn이 설치되어 있어야 합니다. 메모리 SQLite처럼 연결을 공유해야 하는 DB에서는 사용할 수 없습니다.
+    """
+
+    def __enter__(self):
+        import uvicorn
+        from django.core.handlers.asgi import ASGIHandler
+
+        from . import urls as card_urls
+
+        class AsyncReadUrls:
+            urlpatterns = [*card_urls.async_read_patterns, *import_module(settings.ROOT_URLCONF).urlpatterns]
+
+        self.urlconf = override_settings(ROOT_URLCONF=AsyncReadUrls)
+        self.urlconf.enable()
+        self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.socket.bind(('127.0.0.1', 0))
+        self.host, self.port = self.socket.getsockname()[:2]
+        config = uvicorn.Config(ASGIHandler(), log_level='warning', lifespan='off', access_log=False)
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, kwargs={'sockets': [self.socket]}, daemon=True)
+        self.thread.start()
+        deadline = time.monotonic() + 10
+        while not self.server.started:
+            if not self.thread.is_alive() or time.monotonic() > deadline:
+                self.__exit__()
+                raise RuntimeError('ASGI 서버를 시작하지 못했습니다.')
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join()
+        self.socket.close()
+        self.urlconf.disable()
+
+
+def percentile(sorted_values, fraction):
+    """정렬된 값의 백분위수 (nearest-rank)"""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, math.ceil(fraction * len(sorted_values)) - 1)]
+
+
+def summarize(latencies, errors, elapsed):
+    values = sorted(latencies)
+    return {
+        'requests': len(values),
+        'errors': errors,
+        'rps': round(len(values) / elapsed, 2) if elapsed else None,
+        'p50': percentile(values, 0.50),
+        'p95': percentile(values, 0.95),
+        'p99': percentile(values, 0.99),
+        'max': values[-1] if values else None,
+    }
+
+
+def run_load(server, make_request, requests=200, concurrency=8, warmup=None):
+    """make_request(rng) → (method, path, body, headers)를 concurrency개 스레드로 requests번 요청
+
+    처음 warmup번(기본: 동시 요청 수의 2배)은 캐시/인덱스 로드 등 첫 요청 비용이 섞이지 않도록 측정에서 제외합니다.
+    응답 코드가 400 이상이거나 연결 오류인 요청은 errors로 세고 지연 시간에서 제외합니다.
+    반환값: summarize() 결과와 응답 본문 목록(등록 시나리오의 정리용)
+    """
+    warmup = concurrency * 2 if warmup is None else warmup
+    if warmup:
+        _, warmup_bodies = run_load(server, make_request, requests=warmup, concurrency=concurrency, warmup=0)
+    lock = threading.Lock()
+    remaining = [requests]
+    latencies = []
+    bodies = []
+    errors = [0]
+
+    def worker(worker_index):
+        rng = random.Random(worker_index)
+        conn = http.client.HTTPConnection(server.host, server.port, timeout=30)
+        while True:
+            with lock:
+                if remaining[0] <= 0:
+                    break
+                remaining[0] -= 1
+            method, path, body, headers = make_request(rng)
+            started = time.perf_counter()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                content = response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                conn.close()
+                conn = http.client.HTTPConnection(server.host, server.port, timeout=30)
+                with lock:
+                    errors[0] += 1
+                continue
+            elapsed = time.perf_counter() - started
+            with lock:
+                if status >= 400:
+                    errors[0] += 1
+                else:
+                    latencies.append(elapsed)
+                    if method == 'POST':
+                        bodies.append(content)
+        conn.close()
+
+    started = time.perf_counter()
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    summary = summarize(latencies, errors[0], time.perf_counter() - started)
+    return summary, (warmup_bodies + bodies if warmup else bodies)
+
+
+def _multipart(fields, files):
+    boundary = secrets.token_hex(16)
+    lines = []
+    for key, value in fields.items():
+        lines.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"\r\n\r\n{value}\r\n'.encode())
+    for key, (filename, content, content_type) in files.items():
+        lines.append(
+            f'--{boundary}\r\nContent-Disposition: form-data; name="{key}"; filename="{filename}"\r\n'
+            f'Content-Type: {content_type}\r\n\r\n'.encode() + content + b'\r\n'
+        )
+    lines.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(lines), f'multipart/form-data; boundary={boundary}'
+
+
+class _AdminSession:
+    """등록 시나리오용 임시 관리자 세션 (Basic 인증은 요청마다 비밀번호 해시를 계산하므로 사용하지 않음)"""
+
+    def __enter__(self):
+        from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+
+        User = get_user_model()
+        self.user = User.objects.create_superuser(f'bench-{secrets.token_hex(4)}', None, secrets.token_urlsafe(16))
+        store = import_module(settings.SESSION_ENGINE).SessionStore()
+        store[SESSION_KEY] = str(self.user.pk)
+        store[BACKEND_SESSION_KEY] = 'django.contrib.auth.backends.ModelBackend'
+        store[HASH_SESSION_KEY] = self.user.get_session_auth_hash()
+        store.save()
+        self.store = store
+        csrf = secrets.token_hex(16)
+        self.headers = {
+            'Cookie': f'{settings.SESSION_COOKIE_NAME}={store.session_key}; {settings.CSRF_COOKIE_NAME}={csrf}',
+            'X-CSRFToken': csrf,
+        }
+        return self
+
+    def __exit__(self, *exc):
+        self.store.delete()
+        self.user.delete()
+
+
+def _scenarios(rng, card_ids, names, session, pages=5):
+    upload_image = synthetic_image(rng, width=800, height=1168)
+    filters = [
+        {'sale_status': 'available', 'rarity': 'UR'},
+        {'sale_status': 'available', 'max_price': 50000, 'ordering': 'price'},
+        {'rarity': 'SE', 'condition': 'S'},
+        {'sale_status': 'sold', 'ordering': '-created_at'},
+    ]
+    queries = _search_queries(rng, names) if names else ['블루']
+
+    def card_list(r):
+        return 'GET', f'/api/cards/?page={r.randint(1, pages)}', None, {}
+
+    def card_filter(r):
+        return 'GET', f'/api/cards/?{urlencode(r.choice(filters))}', None, {}
+
+    def card_detail(r):
+        return 'GET', f'/api/cards/{r.choice(card_ids)}/', None, {}
+
+    def autocomplete(r):
+        return 'GET', f"/api/cards/search_card_names/?{urlencode({'q': r.choice(queries)})}", None, {}
+
+    def upload(r):
+        # 내용이 다른 이미지여야 해시 저장소의 중복 제거 없이 실제 저장 비용이 측정됨
+        body, content_type = _multipart(
+            {'name': r.choice(names) if names else '블루아이즈 화이트 드래곤', 'condition': 'A', 'rarity': 'R',
+             'price': 1000, 'serial_number': f'{SEED_SERIAL_PREFIX}UP-{r.randrange(10 ** 9)}'},
+            {'image': ('upload.jpg', upload_image + uuid.uuid4().bytes, 'image/jpeg')},
+        )
+        return 'POST', '/api/cards/', body, {**session.headers, 'Content-Type': content_type}
+
+    scenarios = {'list': card_list, 'filter': card_filter, 'autocomplete': autocomplete}
+    if card_ids:
+        scenarios['detail'] = card_detail
+    if names:
+        # 카드명 사전에 있는 이름만 등록할 수 있음
+        scenarios['upload'] = upload
+    return scenarios
+
+
+def run_load_scenarios(requests=200, concurrency=8, scenarios=None, seed=0, log=print, connections_override=None):
+    """목록/필터/상세/자동완성/등록 시나리오를 차례로 실행, {시나리오: 요약} 반환
+
+    등록 시나리오로 만든 카드와 이미지 작업은 끝난 뒤 삭제합니다. 요청 빈도 제한은 측정 중에만 해제합니다.
+    """
+    rng = random.Random(seed)
+    card_ids = list(Card.objects.order_by('-id').values_list('id', flat=True)[:2000])
+    names = list(CardName.objects.order_by('id').values_list('name', flat=True)[:5000])
+    # 목록 시나리오는 앞쪽 5페이지 중에서 (카드가 적으면 있는 페이지만)
+    pages = max(1, min(5, math.ceil(Card.objects.count() / settings.REST_FRAMEWORK['PAGE_SIZE'])))
+    unlimited = {scope: None for scope in settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})}
+    results = {}
+    with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': unlimited}), \
+            _AdminSession() as session, LoadServer(connections_override) as server:
+        available = _scenarios(rng, card_ids, names, session, pages=pages)
+        for name in scenarios or available:
+            if name not in available:
+                log(f'{name}: 데이터가 없어 건너뜁니다.')
+                continue
+            summary, bodies = run_load(server, available[name], requests=requests, concurrency=concurrency)
+            if bodies:
+                _delete_uploaded(bodies)
+            results[name] = summary
+            log(
+                f"{name}: {summary['rps']} req/s, p50 {_ms(summary['p50'])} p95 {_ms(summary['p95'])} "
+                f"p99 {_ms(summary['p99'])}, 오류 {summary['errors']}"
+            )
+    return results
+
+
+def run_server_comparison(requests=200, concurrency=64, workers=4, scenarios=None, seed=0, log=print):
+    """조회 시나리오를 워커 workers개의 WSGI 서버와 ASGI 서버에 같은 동시 연결 수로 요청하여 비교
+
+    반환값: {'wsgi:<시나리오>': 요약, 'asgi:<시나리오>': 요약}
+    """
+    rng = random.Random(seed)
+    card_ids = list(Card.objects.order_by('-id').values_list('id', flat=True)[:2000])
+    names = list(CardName.objects.order_by('id').values_list('name', flat=True)[:5000])
+    pages = max(1, min(5, math.ceil(Card.objects.count() / settings.REST_FRAMEWORK['PAGE_SIZE'])))
+    unlimited = {scope: None for scope in settings.REST_FRAMEWORK.get('DEFAULT_THROTTLE_RATES', {})}
+    available = {
+        name: make_request for name, make_request in _scenarios(rng, card_ids, names, None, pages=pages).items()
+        if name in SERVER_SCENARIOS
+    }
+    results = {}
+    with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': unlimited}):
+        for kind, make_server in (('wsgi', lambda: PooledLoadServer(workers)), ('asgi', AsgiLoadServer)):
+            with make_server() as server:
+                for name in scenarios or available:
+                    if name not in available:
+                        log(f'{name}: 데이터가 없거나 조회 시나리오가 아니어서 건너뜁니다.')
+                        continue
+                    summary, _ = run_load(server, available[name], requests=requests, concurrency=concurrency)
+                    results[f'{kind}:{name}'] = summary
+                    log(
+                        f"{kind}:{name}: {summary['rps']} req/s, p50 {_ms(summary['p50'])} "
+                        f"p95 {_ms(summary['p95'])} p99 {_ms(summary['p99'])}, 오류 {summary['errors']}"
+                    )
+    return results
+
+
+def _ms(seconds):
+    return f'{seconds * 1000:.1f}ms' if seconds is not None else '-'
+
+
+def _delete_uploaded(bodies):
+    ids = []
+    for body in bodies:
+        try:
+            ids.append(json.loads(body)['id'])
+        except (ValueError, KeyError, TypeError):
+            continue
+    Job.objects.filter(task='optimize_card_image', key__in=[f'card:{pk}' for pk in ids]).delete()
+    Card.objects.filter(id__in=ids).delete()
+    _release_files_now()
+
+
+# ---------------------------------------------------------------------------
+# 결과 저장/비교
+# ---------------------------------------------------------------------------
+
+def environment():
+    """결과를 비교할 때 참고할 실행 환경"""
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'django': django.get_version(),
+        'database': connection.vendor,
+        'cards': Card.objects.count(),
+        'card_names': CardName.objects.count(),
+    }
+
+
+def compare(baseline, current, threshold=0.10, load_threshold=0.20):
+    """기준 결과 대비 threshold(부하 시나리오는 load_threshold) 비율 이상 나빠진 항목 목록
+
+    부하 시나리오는 스레드 스케줄링/DB 연결 등으로 같은 코드도 실행마다 10% 안팎 차이가 나므로 기준을 따로 둡니다.
+    반환값: [{'name', 'metric', 'baseline', 'current', 'change'}] (change: 나빠진 비율, 0.25 = 25%)
+    """
+    regressions = []
+    for section, limit in (('micro', threshold), ('load', load_threshold), ('servers', load_threshold)):
+        for name, result in (current.get(section) or {}).items():
+            base = (baseline.get(section) or {}).get(name)
+            if not base:
+                continue
+            for metric in LOWER_IS_BETTER + HIGHER_IS_BETTER:
+                old, new = base.get(metric), result.get(metric)
+                if not old or new is None:
+                    continue
+                if metric == 'p99' and min(base.get('requests', 0), result.get('requests', 0)) < MIN_P99_SAMPLES:
+                    continue
+                change = (new - old) / old if metric in LOWER_IS_BETTER else (old - new) / old
+                if change > limit:
+                    regressions.append({
+                        'name': f'{section}.{name}', 'metric': metric,
+                        'baseline': old, 'current': new, 'change': round(change, 4),
+                    })
+    return regressions
@@ -0,0 +1,95 @@
+"""
+카드 일괄 수정 (판매 상태 / 가격)
+
+여러 카드를 한 트랜잭션 안에서 `UPDATE ... WHERE id IN (...)` 한 번으로 수정합니다.
+모델 save()/post_save 시그널/직렬화를 카드마다 반복하지 않으며, 응답 캐시 무효화도
+id 목록을 나눠 수정하는 경우(SQLite의 파라미터 개수 제한 등)까지 커밋 후 한 번만 일어납니다.
+
+판매 상태 변경은 단건 변경(cards/transitions.py)과 같은 전이 규칙을 따르며,
+허용되지 않는 카드는 수정하지 않고 rejected로 보고합니다. 적용된 상태 변경은
+CardStatusTransition에 한 번의 bulk_create로 기록합니다.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import response_cache
+from .models import Card, CardStatusTransition
+from .transitions import is_allowed
+
+RESULT_UPDATED = 'updated'
+RESULT_UNCHANGED = 'unchanged'
+RESULT_NOT_FOUND = 'not_found'
+RESULT_REJECTED = 'rejected'
+
+
+def _batches(ids):
+    """DB의 파라미터 개수 제한(SQLite 등)에 맞춰 id 목록 분할 (PostgreSQL은 한 번에 처리)"""
+    size = connection.features.max_query_params
+    if not size:
+        yield ids
+        return
+    size = max(size - 10, 1)
+    for start in range(0, len(ids), size):
+        yield ids[start:start + size]
+
+
+def bulk_update_cards(ids, changes, user=None):
+    """ids의 카드에 changes({'sale_status': ..., 'price': ...})를 적용
+
+    반환값: {id: 'updated' | 'unchanged' | 'rejected' | 'not_found'} (요청한 id 순서)
+    """
+    ids = list(dict.fromkeys(ids))
+    # 판매 상태를 첫 번째 컬럼으로 조회 (values[0]이 현재 상태)
+    fields = sorted(changes, key=lambda field: field != 'sale_status')
+    to_status = changes.get('sale_status')
+    results = {}
+    rejected = set()
+
+    with transaction.atomic():
+        # 현재 값을 잠그고 읽어 변경이 필요한 카드만 수정 (이미 같은 값이면 unchanged)
+        # 동시에 실행되는 일괄 수정끼리 교착 상태가 되지 않도록 항상 id 순서로 잠금
+        current = {}
+        for batch in _batches(sorted(ids)):
+            rows = Card.objects.select_for_update().filter(id__in=batch).order_by('id').values_list('id', *fields)
+            for row in rows:
+                current[row[0]] = row[1:]
+
+        target = tuple(changes[field] for field in fields)
+        to_update = []
+        for card_id in ids:
+            values = current.get(card_id)
+            if values is None or values == target:
+                continue
+            from_status = values[0] if to_status else None
+            if to_status and from_status != to_status and not is_allowed(from_status, to_status):
+                rejected.add(card_id)
+                continue
+            to_update.append(card_id)
+
+        if to_update:
+            now = timezone.now()
+            # 나눠서 수정해도 응답 캐시 무효화는 커밋 후 한 번
+            with response_cache.invalidate_once():
+                for batch in _batches(to_update):
+                    Card.objects.filter(id__in=batch).update(updated_at=now, **changes)
+            if to_status:
+                authenticated_user = user if user is not None and user.is_authenticated else None
+                CardStatusTransition.objects.bulk_create([
+                    CardStatusTransition(
+                        card_id=card_id, card_number=card_id, from_status=current[card_id][0],
+                        to_status=to_status, user=authenticated_user,
+                    )
+                    for card_id in to_update if current[card_id][0] != to_status
+                ])
+
+    changed = set(to_update)
+    for card_id in ids:
+        if card_id not in current:
+            results[card_id] = RESULT_NOT_FOUND
+        elif card_id in rejected:
+            results[card_id] = RESULT_REJECTED
+        elif card_id in changed:
+            results[card_id] = RESULT_UPDATED
+        else:
+            results[card_id] = RESULT_UNCHANGED
+    return results
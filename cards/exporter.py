@@ -0,0 +1,128 @@
+"""
+카드 전체 내보내기 (CSV / NDJSON, 선택적으로 gzip)
+
+목록 API를 20장씩 넘기는 대신 필터 조건에 맞는 카드 전체를 한 번의 응답/파일로 내보냅니다.
+
+- 카드는 `.values_list().iterator(chunk_size)`로 읽으므로 PostgreSQL에서는 서버 측 커서로 chunk_size행씩만
+  가져오고, 행을 CHUNK_BYTES 정도씩 모아 바로 내보내므로 카드 수와 관계없이 메모리 사용량이 일정합니다.
+- CSV는 엑셀에서 한글이 깨지지 않도록 UTF-8 BOM으로 시작하며, 열 이름은 일괄 등록(cards/importer.py)
+  manifest와 같아 image 열의 파일을 함께 묶으면 다시 등록할 수 있습니다.
+- NDJSON은 한 줄에 카드 하나의 JSON 객체입니다 (가격은 API 응답과 같이 문자열).
+- gzip=True이면 zlib 스트림으로 압축하여 .gz 파일과 같은 형식으로 내보냅니다.
+
+`GET /api/cards/export/`(관리자)와 `python manage.py export_cards`에서 사용합니다.
+"""
+import csv
+import zlib
+
+from asgiref.sync import sync_to_async
+from django.core.serializers.json import DjangoJSONEncoder
+
+FORMATS = {
+    'csv': 'text/csv; charset=utf-8',
+    'ndjson': 'application/x-ndjson',
+}
+FIELDS = (
+    'id', 'name', 'serial_number', 'condition', 'rarity', 'price', 'sale_status',
+    'image', 'image_status', 'created_at', 'updated_at',
+)
+CHUNK_BYTES = 64 * 1024
+
+
+class _Line:
+    """csv.writer가 쓴 한 줄을 그대로 돌려받기 위한 파일 객체"""
+
+    def write(self, value):
+        return value
+
+
+class CardExport:
+    """queryset의 카드를 output_format으로 직렬화한 bytes 조각을 차례로 반환하는 iterable
+
+    rows: 지금까지 내보낸 카드 수, bytes: 내보낸 바이트 수 (압축 후)
+    """
+
+    def __init__(self, queryset, output_format='csv', gzip=False, chunk_size=2000):
+        if output_format not in FORMATS:
+            raise ValueError(f"지원하지 않는 형식: {output_format} (가능한 값: {', '.join(FORMATS)})")
+        self.queryset = queryset
+        self.output_format = output_format
+        self.gzip = gzip
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self.bytes = 0
+
+    @property
+    def content_type(self):
+        return 'application/gzip' if self.gzip else FORMATS[self.output_format]
+
+    @property
+    def extension(self):
+        return f"{self.output_format}.gz" if self.gzip else self.output_format
+
+    def _lines(self):
+        rows = self.queryset.values_list(*FIELDS).iterator(chunk_size=self.chunk_size)
+        if self.output_format == 'csv':
+            writer = csv.writer(_Line())
+            yield '\ufeff' + writer.writerow(FIELDS)
+            for row in rows:
+                self.rows += 1
+                yield writer.writerow([_csv_value(value) for value in row])
+        else:
+            encoder = DjangoJSONEncoder(ensure_ascii=False, separators=(',', ':'))
+            for row in rows:
+                self.rows += 1
+                yield encoder.encode(dict(zip(FIELDS, row))) + '\n'
+
+    def _chunks(self):
+        """줄을 CHUNK_BYTES 정도씩 모아 UTF-8 bytes로"""
+        buffer = []
+        size = 0
+        for line in self._lines():
+            buffer.append(line)
+            size += len(line)
+            if size >= CHUNK_BYTES:
+                yield ''.join(buffer).encode('utf-8')
+                buffer = []
+                size = 0
+        if buffer:
+            yield ''.join(buffer).encode('utf-8')
+
+    def __iter__(self):
+        chunks = self._chunks()
+        if self.gzip:
+            chunks = _gzip(chunks)
+        for chunk in chunks:
+            if chunk:
+                self.bytes += len(chunk)
+                yield chunk
+
+    async def __aiter__(self):
+        """ASGI 응답용: 한 조각씩 스레드에서 읽음 (Django는 동기 iterator를 ASGI에서 통째로 list로 읽으므로)"""
+        iterator = iter(self)
+        done = object()
+        while True:
+            chunk = await sync_to_async(next)(iterator, done)
+            if chunk is done:
+                return
+            yield chunk
+
+
+def _csv_value(value):
+    if value is None:
+        return ''
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+def _gzip(chunks, level=6):
+    """bytes 조각들을 gzip 형식으로 압축하며 차례로 반환
+
+    조각마다 Z_SYNC_FLUSH로 내보내 압축기 내부 버퍼에 쌓이지 않고 바로 전송되게 합니다
+    (조각이 CHUNK_BYTES 단위라 압축률 차이는 거의 없음).
+    """
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
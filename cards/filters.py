@@ -0,0 +1,86 @@
+"""
+카드 목록 필터/정렬 (`GET /api/cards/`)
+
+- `sale_status`, `rarity`, `condition`: 값 하나 또는 쉼표로 구분한 여러 값 (예: `rarity=UR,SE`)
+- `min_price`, `max_price`: 가격 범위 (원, 경계 포함)
+- `ordering`: `-created_at`(기본값), `created_at`, `price`, `-price`
+
+정렬 키는 항상 id로 끝나므로 keyset 페이지네이션과 함께 사용할 수 있습니다.
+상태별 최신순은 (sale_status, created_at, id) 인덱스로, 자주 쓰이는 가격 조회
+("판매중인 UR/SE 카드를 X원 이하 가격순으로")는 `sale_status='available'` 부분 인덱스로
+처리됩니다 (Card.Meta.indexes 참고).
+"""
+from decimal import Decimal, InvalidOperation
+
+from rest_framework.exceptions import ValidationError
+
+from .models import Card
+
+ORDERINGS = {
+    '-created_at': ('-created_at', '-id'),
+    'created_at': ('created_at', 'id'),
+    'price': ('price', 'id'),
+    '-price': ('-price', '-id'),
+}
+
+CHOICE_FILTERS = {
+    'sale_status': Card.SALE_STATUS_CHOICES,
+    'rarity': Card.RARITY_CHOICES,
+    'condition': Card.CONDITION_CHOICES,
+}
+
+
+def choice_lookups(params, errors):
+    """sale_status/rarity/condition 파라미터 → filter() 인자 (잘못된 값은 errors에 기록)
+
+    재고 통계(`/api/cards/stats/`)도 같은 파라미터로 조합을 좁힙니다.
+    """
+    lookups = {}
+    for name, choices in CHOICE_FILTERS.items():
+        raw = params.get(name, '').strip()
+        if not raw:
+            continue
+        allowed = {value for value, _ in choices}
+        values = [value.strip() for value in raw.split(',') if value.strip()]
+        invalid = [value for value in values if value not in allowed]
+        if invalid:
+            errors[name] = f'허용되지 않는 값입니다: {", ".join(invalid)} (가능한 값: {", ".join(sorted(allowed))})'
+        elif len(values) == 1:
+            lookups[name] = values[0]
+        elif values:
+            lookups[f'{name}__in'] = values
+    return lookups
+
+
+def filter_cards(queryset, params):
+    """쿼리 파라미터에 따라 필터/정렬한 queryset (잘못된 값이면 ValidationError → 400)"""
+    errors = {}
+
+    lookups = choice_lookups(params, errors)
+    if lookups:
+        queryset = queryset.filter(**lookups)
+
+    for name, lookup in (('min_price', 'price__gte'), ('max_price', 'price__lte')):
+        raw = params.get(name, '').strip()
+        if not raw:
+            continue
+        try:
+            value = Decimal(raw)
+        except InvalidOperation:
+            errors[name] = '숫자여야 합니다.'
+            continue
+        if not value.is_finite() or value < 0:
+            errors[name] = '0 이상의 숫자여야 합니다.'
+            continue
+        queryset = queryset.filter(**{lookup: value})
+
+    ordering = params.get('ordering', '').strip()
+    if ordering:
+        if ordering not in ORDERINGS:
+            errors['ordering'] = f'가능한 값: {", ".join(ORDERINGS)}'
+        else:
+            queryset = queryset.order_by(*ORDERINGS[ordering])
+
+    if errors:
+        raise ValidationError(errors)
+    return queryset
@@ -0,0 +1,163 @@
+"""
+카드 이미지 처리 (리사이즈 및 WebP/AVIF/JPEG 파생 이미지 생성)
+
+업로드 후 백그라운드 작업과 일괄 재생성 스크립트에서 공통으로 사용합니다.
+"""
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, features
+
+from .instrumentation import timed
+
+# 포맷 이름 -> (Pillow 포맷, 확장자, MIME 타입)
+FORMATS = {
+    'avif': ('AVIF', 'avif', 'image/avif'),
+    'webp': ('WEBP', 'webp', 'image/webp'),
+    'jpeg': ('JPEG', 'jpg', 'image/jpeg'),
+}
+
+# Pillow 포맷 -> 업로드 허용 여부 (확장자 검증과 별도로 실제 파일 내용 기준)
+ALLOWED_SOURCE_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP'}
+
+# 기본 최대 픽셀 수 (약 8000x5000). 압축 해제 시 메모리를 폭발적으로 사용하는 이미지 차단용
+DEFAULT_MAX_PIXELS = 40_000_000
+
+# 축소 시 reduce()로 먼저 정수배 축소한 뒤 LANCZOS 리샘플링 (품질 차이 없이 큰 이미지 축소가 빨라짐)
+REDUCING_GAP = 3.0
+
+DEFAULT_DERIVATIVES = {
+    'WIDTHS': [200, 400, 800],
+    'FORMATS': ['avif', 'webp', 'jpeg'],
+    'QUALITY': {'avif': 60, 'webp': 80, 'jpeg': 85},
+}
+
+
+def get_derivative_setting(name):
+    """settings.IMAGE_DERIVATIVES 값 조회 (없으면 기본값)"""
+    return getattr(settings, 'IMAGE_DERIVATIVES', {}).get(name, DEFAULT_DERIVATIVES[name])
+
+
+class ImageTooLargeError(ValueError):
+    """해상도가 허용 범위를 넘는 이미지 (decompression bomb 방지)"""
+
+
+def get_max_pixels():
+    return getattr(settings, 'IMAGE_MAX_PIXELS', DEFAULT_MAX_PIXELS)
+
+
+def check_dimensions(width, height):
+    """디코딩 전에 헤더의 해상도만으로 decompression bomb 여부 검사"""
+    if width * height > get_max_pixels():
+        raise ImageTooLargeError(f'이미지 해상도가 너무 큽니다: {width}x{height}')
+
+
+def inspect_image(file):
+    """업로드 파일의 헤더만 읽어 검증하고 메타데이터 반환 (픽셀 데이터는 디코딩하지 않음)
+
+    반환값: {'format', 'width', 'height', 'mode'}
+    """
+    try:
+        with timed('image'), Image.open(file) as img:
+            meta = {'format': img.format, 'width': img.width, 'height': img.height, 'mode': img.mode}
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e))
+    finally:
+        file.seek(0)
+
+    if meta['format'] not in ALLOWED_SOURCE_FORMATS:
+        raise ValueError(f'지원하지 않는 이미지 형식: {meta["format"]}')
+    check_dimensions(meta['width'], meta['height'])
+    return meta
+
+
+def available_formats():
+    """설정된 포맷 중 현재 Pillow 빌드에서 인코딩 가능한 포맷 목록 (AVIF는 빌드에 따라 미지원)"""
+    result = []
+    for fmt in get_derivative_setting('FORMATS'):
+        if fmt not in FORMATS:
+            continue
+        if fmt in ('avif', 'webp') and not features.check(fmt):
+            continue
+        result.append(fmt)
+    return result
+
+
+def to_rgb(img):
+    """RGB 모드로 변환 (투명도가 있는 경우 흰색 배경에 합성)"""
+    if img.mode in ('RGBA', 'LA', 'P'):
+        if img.mode == 'P':
+            img = img.convert('RGBA')
+        background = Image.new('RGB', img.size, (255, 255, 255))
+        background.paste(img, mask=img.split()[-1])
+        return background
+    if img.mode != 'RGB':
+        return img.convert('RGB')
+    return img
+
+
+def resize_to_width(img, width):
+    """비율을 유지하며 너비 width px로 축소 (확대는 하지 않음)"""
+    if img.width <= width:
+        return img
+    height = max(1, int(img.height * width / img.width))
+    return img.resize((width, height), Image.Resampling.LANCZOS, reducing_gap=REDUCING_GAP)
+
+
+def encode(img, fmt):
+    """이미지를 지정 포맷의 bytes로 인코딩 (EXIF 등 메타데이터는 저장하지 않음)"""
+    pil_format = FORMATS[fmt][0]
+    quality = get_derivative_setting('QUALITY').get(fmt, 85)
+    save_kwargs = {'format': pil_format, 'quality': quality}
+    if fmt == 'jpeg':
+        save_kwargs['optimize'] = True
+    elif fmt == 'webp':
+        save_kwargs['method'] = 4
+
+    img_io = BytesIO()
+    img.save(img_io, **save_kwargs)
+    return img_io.getvalue()
+
+
+def target_widths(source_width, widths=None):
+    """원본 너비보다 큰 너비는 제외한 파생 이미지 너비 목록 (최소 1개 보장)"""
+    widths = sorted(widths or get_derivative_setting('WIDTHS'))
+    result = [w for w in widths if w <= source_width]
+    if not result:
+        result = [source_width]
+    elif result[-1] < widths[-1] and result[-1] < source_width:
+        # 원본이 최대 너비보다 작으면 원본 크기 버전도 포함
+        result.append(source_width)
+    return result
+
+
+def build_derivatives(source, widths=None, formats=None):
+    """원본 이미지(경로 또는 파일 객체)로부터 파생 이미지 생성
+
+    반환값: [{'format', 'width', 'height', 'content'}, ...] (너비 오름차순)
+    EXIF orientation은 적용하지 않습니다 (자동 회전 방지).
+    """
+    formats = formats or available_formats()
+    derivatives = []
+    with Image.open(source) as img:
+        check_dimensions(img.width, img.height)
+        widths = target_widths(img.width, widths)
+
+        # JPEG는 DCT 단계에서 1/2, 1/4, 1/8로 축소하며 디코딩 (가장 큰 파생 이미지보다 작아지지 않는 범위에서)
+        # 원본 해상도 전체를 메모리에 펼치지 않아 디코딩 시간과 최대 메모리 사용량이 크게 줄어듦
+        if img.format == 'JPEG' and widths[-1] < img.width:
+            img.draft('RGB', (widths[-1], max(1, img.height * widths[-1] // img.width)))
+
+        img = to_rgb(img)
+        # 큰 크기부터 줄여 나가면 매 단계 리사이즈 비용이 작아짐
+        for width in reversed(widths):
+            img = resize_to_width(img, width)
+            for fmt in formats:
+                derivatives.append({
+                    'format': fmt,
+                    'width': img.width,
+                    'height': img.height,
+                    'content': encode(img, fmt),
+                })
+    derivatives.sort(key=lambda d: d['width'])
+    return derivatives
@@ -0,0 +1,230 @@
+"""
+카드 일괄 등록 (이미지 ZIP + CSV/JSON manifest)
+
+manifest의 각 행(name, serial_number, condition, rarity, price, image)을 검증하고,
+image 열의 파일을 ZIP에서 찾아 저장한 뒤 batch_size개씩 bulk_create로 등록합니다.
+
+- ZIP은 파일 단위로 스트리밍하여 읽으므로 아카이브 전체를 메모리에 올리지 않습니다.
+  업로드 파일은 디스크의 임시 파일로 받고, 이미지도 청크 단위로 저장됩니다.
+- 카드명은 CardName(카드명 사전)에 있는 이름만 허용하며, 배치마다 쿼리 한 번으로 확인합니다.
+- 파생 이미지 생성은 카드마다 작업 큐에 등록되어 여러 워커(run_jobs)가 병렬로 처리합니다.
+  일괄 등록 자체는 이미지 헤더만 확인하므로 이미지 처리 시간을 기다리지 않습니다.
+
+manifest를 따로 주지 않으면 ZIP 안의 manifest.csv 또는 manifest.json을 사용합니다.
+CSV는 첫 줄이 열 이름이고, JSON은 행 객체의 배열입니다 (`serial` 열 이름도 허용).
+"""
+import csv
+import io
+import json
+import logging
+import os
+import posixpath
+import zipfile
+from itertools import islice
+
+from django.core.files import File
+from django.db import transaction
+
+from . import imaging
+from .jobs import enqueue_many_on_commit
+from .models import Card, CardName
+from .serializers import CardImportRowSerializer
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAMES = ('manifest.csv', 'manifest.json')
+MAX_IMAGE_SIZE = 20 * 1024 * 1024  # 카드 등록(CardSerializer.validate_image)과 동일
+ALLOWED_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.gif', '.webp')
+COLUMN_ALIASES = {'serial': 'serial_number'}
+
+
+class ArchiveError(ValueError):
+    """아카이브/manifest 자체를 읽을 수 없음 (행 단위 오류는 보고서에 기록)"""
+
+
+def _is_ignored(name):
+    base = posixpath.basename(name)
+    return name.endswith('/') or name.startswith('__MACOSX/') or base.startswith('.')
+
+
+def _members(archive):
+    """ZIP 경로와 파일명(디렉터리 제외) → ZipInfo (manifest의 image는 둘 중 어느 쪽이든 가능)"""
+    members = {}
+    basenames = {}
+    for info in archive.infolist():
+        if _is_ignored(info.filename):
+            continue
+        members[info.filename] = info
+        basenames.setdefault(posixpath.basename(info.filename), []).append(info)
+    # 파일명이 하나뿐인 경우에만 파일명으로 찾을 수 있음 (여러 폴더에 같은 이름이면 경로로 지정)
+    for base, infos in basenames.items():
+        if len(infos) == 1:
+            members.setdefault(base, infos[0])
+    return members
+
+
+def _normalize(row):
+    normalized = {}
+    for key, value in row.items():
+        if key is None:
+            continue
+        key = COLUMN_ALIASES.get(key.strip().lower(), key.strip().lower())
+        normalized[key] = value.strip() if isinstance(value, str) else value
+    return normalized
+
+
+def _read_manifest(archive, members, manifest=None):
+    """manifest 행을 하나씩 반환 (CSV는 스트리밍으로 읽음)"""
+    if manifest is None:
+        for candidate in MANIFEST_NAMES:
+            if candidate in members:
+                name = members[candidate].filename
+                manifest = archive.open(members[candidate])
+                break
+        else:
+            raise ArchiveError('ZIP에 manifest.csv 또는 manifest.json이 없습니다.')
+    else:
+        name = getattr(manifest, 'name', '') or ''
+
+    if name.lower().endswith('.json'):
+        try:
+            rows = json.load(io.TextIOWrapper(manifest, encoding='utf-8-sig'))
+        except ValueError as e:
+            raise ArchiveError(f'manifest JSON을 읽을 수 없습니다: {e}')
+        if not isinstance(rows, list):
+            raise ArchiveError('manifest JSON은 행 객체의 배열이어야 합니다.')
+        for row in rows:
+            yield _normalize(row) if isinstance(row, dict) else {}
+        return
+
+    reader = csv.DictReader(io.TextIOWrapper(manifest, encoding='utf-8-sig', newline=''))
+    for row in reader:
+        yield _normalize(row)
+
+
+def _check_image(archive, info):
+    """ZIP 안의 이미지 파일 검증 (크기/확장자/헤더만, 픽셀은 디코딩하지 않음)"""
+    if info.file_size > MAX_IMAGE_SIZE:
+        return '이미지 파일 크기는 20MB 이하여야 합니다.'
+    if os.path.splitext(info.filename)[1].lower() not in ALLOWED_EXTENSIONS:
+        return f"허용된 이미지 형식: {', '.join(ALLOWED_EXTENSIONS)}"
+    try:
+        with archive.open(info) as f:
+            imaging.inspect_image(f)
+    except imaging.ImageTooLargeError:
+        return '이미지 해상도가 너무 큽니다.'
+    except Exception:
+        return '유효한 이미지 파일이 아닙니다.'
+    return None
+
+
+def _save_image(archive, info):
+    """ZIP의 이미지를 청크 단위로 카드 이미지 저장소에 저장하고 저장된 이름 반환"""
+    field = Card._meta.get_field('image')
+    with archive.open(info) as f:
+        content = File(f, name=posixpath.basename(info.filename))
+        content.size = info.file_size
+        return field.storage.save(field.generate_filename(None, content.name), content)
+
+
+def _import_batch(archive, members, batch, dry_run, report):
+    """manifest 행 묶음 검증/저장 (카드명 확인 쿼리 1번 + bulk_create 1번)"""
+    known_names = set(CardName.objects.filter(
+        name__in={row.get('name', '') for _, row in batch}
+    ).values_list('name', flat=True))
+
+    cards = []
+    entries = []
+    for number, row in batch:
+        entry = {'row': number, 'name': row.get('name', '')}
+        report.append(entry)
+
+        serializer = CardImportRowSerializer(data=row)
+        errors = {} if serializer.is_valid() else dict(serializer.errors)
+        data = serializer.validated_data if not errors else {}
+        if 'name' not in errors and data.get('name', row.get('name')) not in known_names:
+            errors['name'] = ['카드명 사전에 없는 카드명입니다.']
+        image_name = row.get('image', '')
+        info = members.get(image_name) or members.get(image_name.lstrip('/'))
+        if 'image' not in errors:
+            if info is None:
+                errors['image'] = [f'ZIP에 이미지 파일이 없습니다: {image_name}']
+            else:
+                message = _check_image(archive, info)
+                if message:
+                    errors['image'] = [message]
+        if errors:
+            entry.update(status='error', errors={key: [str(e) for e in value] for key, value in errors.items()})
+            continue
+
+        entry['status'] = 'valid' if dry_run else 'created'
+        if dry_run:
+            continue
+        cards.append(Card(
+            name=data['name'],
+            serial_number=data.get('serial_number') or None,
+            condition=data['condition'],
+            rarity=data['rarity'],
+            price=data['price'],
+            sale_status='available',
+            image=_save_image(archive, info),
+            image_status=Card.IMAGE_STATUS_PENDING,
+        ))
+        entries.append(entry)
+
+    if not cards:
+        return
+
+    try:
+        with transaction.atomic():
+            Card.objects.bulk_create(cards)
+            # 파생 이미지는 커밋 후 카드마다 작업으로 등록 (워커 여러 개가 병렬 처리)
+            enqueue_many_on_commit(
+                'optimize_card_image',
+                [({'card_id': card.pk}, f'card:{card.pk}') for card in cards],
+            )
+    except Exception as e:
+        logger.exception("카드 일괄 등록 배치 저장 실패")
+        # 저장해 둔 이미지의 참조 횟수를 되돌림
+        storage = Card._meta.get_field('image').storage
+        for card in cards:
+            storage.delete(card.image.name)
+        for entry in entries:
+            entry.update(status='error', errors={'non_field_errors': [f'저장 실패: {e}']})
+        return
+
+    for card, entry in zip(cards, entries):
+        entry['id'] = card.pk
+
+
+def import_cards(archive_file, manifest=None, batch_size=500, dry_run=False):
+    """이미지 ZIP과 manifest로 카드 일괄 등록, 행별 보고서 반환
+
+    archive_file: ZIP 파일 경로 또는 파일 객체 (업로드 파일 등 seek 가능해야 함)
+    manifest: manifest 파일 객체 (이름이 .json으로 끝나면 JSON, 그 외 CSV). None이면 ZIP 안에서 찾음
+    dry_run: 검증만 하고 저장하지 않음
+    반환값: {'created', 'valid', 'failed', 'rows': [{'row', 'name', 'status', 'id' | 'errors'}]}
+    """
+    try:
+        archive = zipfile.ZipFile(archive_file)
+    except (zipfile.BadZipFile, OSError) as e:
+        raise ArchiveError(f'ZIP 파일을 읽을 수 없습니다: {e}')
+
+    report = []
+    with archive:
+        members = _members(archive)
+        rows = enumerate(_read_manifest(archive, members, manifest), start=1)
+        while True:
+            batch = list(islice(rows, batch_size))
+            if not batch:
+                break
+            _import_batch(archive, members, batch, dry_run, report)
+
+    summary = {status: sum(1 for entry in report if entry['status'] == status) for status in ('created', 'valid', 'error')}
+    logger.info(f"카드 일괄 등록{' (검증만)' if dry_run else ''}: {summary}")
+    return {
+        'created': summary['created'],
+        'valid': summary['valid'],
+        'failed': summary['error'],
+        'rows': report,
+    }
@@ -0,0 +1,338 @@
+"""
+요청별 성능 계측 (PerformanceMiddleware)
+
+요청마다 다음을 측정하여 `Server-Timing` 헤더로 응답하고 뷰(URL 이름)별로 집계합니다.
+- DB: 쿼리 수와 시간 (연결마다 한 번 설치한 execute_wrapper가 현재 요청의 측정값에 기록)
+- 구간별 시간: timed('serialize'), timed('image') 등으로 표시한 코드 (직렬화, 이미지 검사/저장)
+- 전체 처리 시간
+
+같은 SQL이 한 요청에서 N_PLUS_ONE_THRESHOLD번 이상 실행되면 N+1 의심으로,
+SLOW_QUERY_MS보다 오래 걸린 쿼리는 느린 쿼리로 경고 로그를 남기고 집계합니다.
+
+집계는 프로세스 메모리에 모았다가 FLUSH_INTERVAL초마다 CACHES['default']에 원자적 incr로
+더하므로 요청당 캐시 접근이 없고, 운영(REDIS_URL)에서는 모든 워커의 합계가 됩니다.
+`GET /api/cards/metrics/`(관리자)에서 Prometheus 텍스트 형식으로 조회합니다.
+
+측정값은 ContextVar에 두므로 ASGI(비동기 뷰)에서도 동작합니다. 비동기 ORM은 여러 요청의 쿼리를
+같은 스레드/연결에서 실행하지만, 각 쿼리는 요청의 context에서 실행되어 해당 요청에 기록됩니다.
+"""
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+DEFAULTS = {
+    'ENABLED': True,
+    'SERVER_TIMING': True,          # Server-Timing 응답 헤더
+    'SLOW_QUERY_MS': 100,           # 이보다 오래 걸린 쿼리는 경고
+    'SLOW_REQUEST_MS': 1000,        # 이보다 오래 걸린 요청은 경고
+    'N_PLUS_ONE_THRESHOLD': 10,     # 한 요청에서 같은 SQL이 이 횟수 이상이면 N+1 의심
+    'FLUSH_INTERVAL': 10,           # 프로세스 집계를 공유 캐시에 반영하는 주기(초)
+}
+
+# 요청 처리 시간 히스토그램 구간(초)
+DURATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+KEYS_KEY = 'cards:metrics:keys'
+VALUE_KEY = 'cards:metrics:{}'
+
+_current = ContextVar('cards_request_metrics', default=None)
+
+
+def get_metrics_settings():
+    return {**DEFAULTS, **getattr(settings, 'PERFORMANCE_METRICS', {})}
+
+
+class RequestMetrics:
+    """요청 하나의 측정값"""
+    __slots__ = ('timings', 'queries', 'db_time', 'sql_counts', 'slow_queries', 'slow_seconds')
+
+    def __init__(self, slow_seconds=DEFAULTS['SLOW_QUERY_MS'] / 1000):
+        self.timings = {}
+        self.queries = 0
+        self.db_time = 0.0
+        self.sql_counts = {}
+        self.slow_queries = 0
+        self.slow_seconds = slow_seconds
+
+
+@contextmanager
+def timed(name):
+    """현재 요청의 name 구간 시간에 더함 (요청 밖, 예를 들어 워커에서는 아무것도 하지 않음)"""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.timings[name] = metrics.timings.get(name, 0.0) + time.perf_counter() - started
+
+
+def _record_query(execute, sql, params, many, context):
+    """connection.execute_wrapper: 현재 요청의 쿼리 수/시간과 SQL별 실행 횟수 기록 (요청 밖이면 그대로 실행)"""
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - started
+        metrics.queries += 1
+        metrics.db_time += elapsed
+        # 파라미터는 %s로 분리되어 있으므로 같은 SQL 문자열 = 같은 형태의 쿼리
+        metrics.sql_counts[sql] = metrics.sql_counts.get(sql, 0) + 1
+        if elapsed >= metrics.slow_seconds:
+            metrics.slow_queries += 1
+            logger.warning(f"느린 쿼리 {elapsed * 1000:.1f}ms: {sql[:300]}")
+
+
+def _install_recorder(connection, **kwargs):
+    if _record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_record_query)
+
+
+connection_created.connect(_install_recorder, dispatch_uid='cards.instrumentation.record_query')
+
+
+class _Aggregator:
+    """프로세스별 집계 (정수: 횟수 또는 마이크로초), 주기적으로 공유 캐시에 더함"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = {}
+        self.known_keys = set()
+        self.last_flush = time.monotonic()
+
+    def add(self, values, flush_interval):
+        with self.lock:
+            for key, value in values:
+                self.pending[key] = self.pending.get(key, 0) + value
+            due = time.monotonic() - self.last_flush >= flush_interval
+        if due:
+            self.flush()
+
+    def flush(self):
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.last_flush = time.monotonic()
+        if not pending:
+            return
+        try:
+            # 키 직렬화는 반영할 때만 (요청 처리 중에는 튜플 그대로 사용)
+            pending = {_serialize_key(name, labels): value for (name, labels), value in pending.items()}
+            for key, value in pending.items():
+                cache_key = VALUE_KEY.format(key)
+                try:
+                    cache.incr(cache_key, value)
+                except ValueError:
+                    if not cache.add(cache_key, value, timeout=None):
+                        cache.incr(cache_key, value)
+            new_keys = set(pending) - self.known_keys
+            if new_keys:
+                # 집계 키 목록 (다른 워커와 동시에 갱신되어 누락되어도 다음 반영 때 다시 추가됨)
+                registered = set(cache.get(KEYS_KEY) or ())
+                if not new_keys <= registered:
+                    cache.set(KEYS_KEY, sorted(registered | new_keys), timeout=None)
+                self.known_keys |= new_keys
+        except Exception as e:
+            logger.warning(f"성능 지표 반영 실패: {e}")
+
+
+aggregator = _Aggregator()
+
+
+def _key(name, **labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def _serialize_key(name, labels):
+    return json.dumps([name, labels], ensure_ascii=False, separators=(',', ':'))
+
+
+def _micros(seconds):
+    return int(seconds * 1_000_000)
+
+
+def record(view, method, status, metrics, total, n_plus_one=0, flush_interval=DEFAULTS['FLUSH_INTERVAL']):
+    """요청 하나의 측정값을 집계에 추가"""
+    labels = {'view': view, 'method': method}
+    values = [
+        (_key('cards_http_requests_total', status=str(status), **labels), 1),
+        (_key('cards_http_request_duration_seconds_sum', **labels), _micros(total)),
+        (_key('cards_db_queries_total', **labels), metrics.queries),
+        (_key('cards_db_query_duration_seconds_total', **labels), _micros(metrics.db_time)),
+    ]
+    for bound in DURATION_BUCKETS:
+        if total <= bound:
+            values.append((_key('cards_http_request_duration_seconds_bucket', le=str(bound), **labels), 1))
+            break
+    else:
+        values.append((_key('cards_http_request_duration_seconds_bucket', le='+Inf', **labels), 1))
+    for phase, seconds in metrics.timings.items():
+        values.append((_key('cards_phase_duration_seconds_total', phase=phase, **labels), _micros(seconds)))
+    if metrics.slow_queries:
+        values.append((_key('cards_slow_queries_total', **labels), metrics.slow_queries))
+    if n_plus_one:
+        values.append((_key('cards_n_plus_one_total', **labels), n_plus_one))
+    aggregator.add(values, flush_interval)
+
+
+def server_timing(metrics, total):
+    parts = [f'db;dur={metrics.db_time * 1000:.1f};desc="{metrics.queries} queries"']
+    parts.extend(f'{name};dur={seconds * 1000:.1f}' for name, seconds in metrics.timings.items())
+    parts.append(f'total;dur={total * 1000:.1f}')
+    return ', '.join(parts)
+
+
+def _view_name(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    return match.view_name or match._func_path
+
+
+class PerformanceMiddleware:
+    """요청별 DB/구간/전체 시간 측정 (MIDDLEWARE 맨 앞에 두어 다른 미들웨어 시간까지 포함)
+
+    WSGI/ASGI 모두 지원 (ASGI에서는 비동기로 동작하여 비동기 뷰가 스레드로 옮겨지지 않음)
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        # 미들웨어 로드 전에 열린 연결 (이후 연결은 connection_created에서 설치)
+        for connection in connections.all(initialized_only=True):
+            _install_recorder(connection)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        config = get_metrics_settings()
+        if not config['ENABLED']:
+            return self.get_response(request)
+
+        metrics = RequestMetrics(config['SLOW_QUERY_MS'] / 1000)
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, time.perf_counter() - started, config)
+
+    async def __acall__(self, request):
+        config = get_metrics_settings()
+        if not config['ENABLED']:
+            return await self.get_response(request)
+
+        metrics = RequestMetrics(config['SLOW_QUERY_MS'] / 1000)
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, metrics, time.perf_counter() - started, config)
+
+    def _finish(self, request, response, metrics, total, config):
+        view = _view_name(request)
+        n_plus_one = [
+            (sql, count) for sql, count in metrics.sql_counts.items()
+            if count >= config['N_PLUS_ONE_THRESHOLD']
+        ]
+        for sql, count in n_plus_one:
+            logger.warning(f"N+1 의심: {request.method} {view}에서 같은 쿼리 {count}회: {sql[:300]}")
+        if total * 1000 >= config['SLOW_REQUEST_MS']:
+            logger.warning(
+                f"느린 요청 {total * 1000:.0f}ms: {request.method} {request.path} "
+                f"(쿼리 {metrics.queries}개 {metrics.db_time * 1000:.0f}ms)"
+            )
+
+        record(
+            view, request.method, response.status_code, metrics, total,
+            n_plus_one=len(n_plus_one), flush_interval=config['FLUSH_INTERVAL'],
+        )
+        if config['SERVER_TIMING']:
+            response['Server-Timing'] = server_timing(metrics, total)
+        return response
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = (
+        f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+        for name, value in labels
+    )
+    return '{' + ','.join(escaped) + '}'
+
+
+def prometheus_text(extra=()):
+    """공유 캐시의 집계를 Prometheus 텍스트 형식으로
+
+    extra: 함께 출력할 (이름, 유형, 값, 라벨 dict) 목록 (응답 캐시, 작업 큐 등 조회 시점의 값)
+    """
+    aggregator.flush()
+    keys = cache.get(KEYS_KEY) or []
+    values = cache.get_many([VALUE_KEY.format(key) for key in keys])
+
+    series = {}
+    for key in keys:
+        value = values.get(VALUE_KEY.format(key))
+        if value is None:
+            continue
+        name, labels = json.loads(key)
+        series.setdefault(name, []).append((labels, value))
+
+    lines = []
+    histogram = 'cards_http_request_duration_seconds'
+    if f'{histogram}_bucket' in series:
+        lines.extend(_histogram_lines(histogram, series.pop(f'{histogram}_bucket'), series.pop(f'{histogram}_sum', [])))
+    for name in sorted(series):
+        lines.append(f'# TYPE {name} counter')
+        for labels, value in sorted(series[name]):
+            lines.append(f'{name}{_format_labels(labels)} {value / 1_000_000 if "_seconds" in name else value}')
+
+    previous = None
+    for name, kind, value, labels in extra:
+        if name != previous:
+            lines.append(f'# TYPE {name} {kind}')
+            previous = name
+        lines.append(f'{name}{_format_labels(sorted(labels.items()))} {value}')
+    return '\n'.join(lines) + '\n'
+
+
+def _histogram_lines(name, buckets, sums):
+    """구간별 개수를 누적(le 이하)으로 변환하여 _bucket/_sum/_count 출력"""
+    by_series = {}
+    for labels, value in buckets:
+        labels = dict(labels)
+        le = labels.pop('le')
+        by_series.setdefault(tuple(sorted(labels.items())), {})[le] = value
+    totals = {tuple(map(tuple, labels)): value for labels, value in sums}
+
+    lines = [f'# TYPE {name} histogram']
+    for labels, counts in sorted(by_series.items()):
+        cumulative = 0
+        for bound in [str(bound) for bound in DURATION_BUCKETS] + ['+Inf']:
+            cumulative += counts.get(bound, 0)
+            lines.append(f'{name}_bucket{_format_labels(list(labels) + [("le", bound)])} {cumulative}')
+        lines.append(f'{name}_sum{_format_labels(labels)} {totals.get(labels, 0) / 1_000_000}')
+        lines.append(f'{name}_count{_format_labels(labels)} {cumulative}')
+    return lines
@@ -0,0 +1,185 @@
+"""
+카드 재고 통계 (판매 상태 × 레어리티 × 상태별 카드 수와 가격 합계)
+
+InventoryStat에 조합별 카드 수/가격 합계를 저장해 두고, 카드가 바뀔 때 같은 트랜잭션 안에서
+변경분만 더합니다. `GET /api/cards/stats/`는 이 표(최대 3 × 7 × 4 = 84행)만 읽으므로 카드 수와
+관계없이 일정한 비용으로 응답합니다.
+
+변경분을 반영하는 경로 (모두 카드 변경과 같은 트랜잭션):
+- Card.save()/delete(): 카드 등록/수정/삭제 (변경 전 값은 행 잠금으로 다시 읽어 비교)
+- CardQuerySet.update()/bulk_create()/delete(): 일괄 수정(bulk_update()도 내부에서 update() 사용),
+  일괄 등록(import_cards), 관리자 화면의 선택 삭제 등
+- transitions.transition(): 판매 상태 변경 (mark_as_*)
+
+통계 행은 조합별 `UPDATE ... SET count = count + %s` 한 번으로 갱신하며(행이 없으면 만든 뒤 다시 갱신),
+여러 조합을 바꿀 때는 항상 같은 순서로 잠가 동시에 실행되는 변경끼리 교착 상태가 되지 않게 합니다.
+raw SQL 등 위 경로를 거치지 않은 변경으로 값이 어긋나면 `python manage.py rebuild_inventory_stats`로
+카드 표를 다시 집계합니다.
+"""
+import itertools
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Sum
+
+from .models import Card, InventoryStat
+
+KEY_FIELDS = ('sale_status', 'rarity', 'condition')
+FIELDS = KEY_FIELDS + ('price',)
+
+
+def affects(fields):
+    """update()/save(update_fields)의 필드 중 통계에 영향을 주는 필드가 있는지"""
+    return any(field in FIELDS for field in fields)
+
+
+def values_of(card):
+    """카드 인스턴스의 (sale_status, rarity, condition, price)"""
+    return tuple(Card._meta.get_field(field).to_python(getattr(card, field)) for field in FIELDS)
+
+
+def lock(queryset):
+    """queryset 카드의 현재 값을 행 잠금으로 읽음 → {id: (sale_status, rarity, condition, price)}"""
+    rows = queryset.select_for_update().order_by('pk').values_list('pk', *FIELDS)
+    return {row[0]: row[1:] for row in rows}
+
+
+def lock_ids(ids):
+    """id 목록의 카드 현재 값을 행 잠금으로 읽음 (lock()과 같은 형식)
+
+    SQLite 등 파라미터 개수 제한이 있는 DB에서는 나눠서 조회합니다.
+    """
+    ids = sorted(set(ids))
+    size = max(connection.ops.bulk_batch_size(['pk'], ids), 1)
+    current = {}
+    for start in range(0, len(ids), size):
+        current.update(lock(Card.objects.filter(pk__in=ids[start:start + size])))
+    return current
+
+
+def _is_expression(value):
+    return hasattr(value, 'resolve_expression')
+
+
+def record_update(before, values):
+    """update(**values) 전에 lock()으로 읽은 값과 변경 후 값의 차이를 반영
+
+    F() 등 식으로 바꾼 경우에만 변경 후 값을 다시 읽습니다.
+    """
+    if any(_is_expression(values.get(field)) for field in FIELDS):
+        after = lock_ids(list(before)).values()
+    else:
+        converted = {
+            field: Card._meta.get_field(field).to_python(values[field]) for field in FIELDS if field in values
+        }
+        after = [
+            tuple(converted.get(field, old) for field, old in zip(FIELDS, row)) for row in before.values()
+        ]
+    record(before=before.values(), after=after)
+
+
+def deltas(before=(), after=()):
+    """변경 전/후 카드 값 목록 → {(sale_status, rarity, condition): (카드 수 변화, 가격 합계 변화)}"""
+    changes = {}
+    for rows, sign in ((before, -1), (after, 1)):
+        for *key, price in rows:
+            count, total = changes.get(tuple(key), (0, 0))
+            changes[tuple(key)] = (count + sign, total + sign * (price or 0))
+    return {key: change for key, change in changes.items() if change != (0, 0)}
+
+
+def record(before=(), after=()):
+    """사라진 카드(before)와 새 카드(after)의 값을 통계에 반영 (카드를 바꾼 트랜잭션 안에서 호출)"""
+    apply(deltas(before, after))
+
+
+def apply(changes):
+    """{조합: (카드 수 변화, 가격 합계 변화)}를 통계 행에 더함 (카드를 바꾼 트랜잭션 안에서 호출)"""
+    # 조합 순서로 잠가 여러 조합을 바꾸는 트랜잭션끼리 교착 상태 방지
+    for key, (count, total) in sorted(changes.items()):
+        lookup = dict(zip(KEY_FIELDS, key))
+        update = {'count': F('count') + count, 'price_total': F('price_total') + total}
+        if InventoryStat.objects.filter(**lookup).update(**update):
+            continue
+        # 행이 없는 조합(보통은 마이그레이션이 모든 조합을 만들어 둠): 다른 트랜잭션이 먼저 만들었으면 그 행을 사용
+        InventoryStat.objects.bulk_create([InventoryStat(**lookup)], ignore_conflicts=True)
+        InventoryStat.objects.filter(**lookup).update(**update)
+
+
+def all_keys():
+    """가능한 모든 (sale_status, rarity, condition) 조합"""
+    return list(itertools.product(*(
+        [value for value, _ in Card._meta.get_field(field).choices] for field in KEY_FIELDS
+    )))
+
+
+def aggregate():
+    """카드 표 전체를 집계한 조합별 값 → {조합: (카드 수, 가격 합계)}"""
+    rows = Card.objects.order_by().values(*KEY_FIELDS).annotate(count=Count('id'), price_total=Sum('price'))
+    return {
+        tuple(row[field] for field in KEY_FIELDS): (row['count'], row['price_total'] or 0) for row in rows
+    }
+
+
+def rebuild(dry_run=False):
+    """카드 표를 다시 집계하여 통계와 다른 조합을 바로잡음, 달랐던 조합 목록 반환
+
+    반환값: [{'key': (sale_status, rarity, condition), 'stored': (카드 수, 가격 합계), 'actual': (...)}]
+    통계 행을 잠근 뒤 집계하므로 그동안 카드를 바꾼 트랜잭션은 통계 갱신 단계에서 기다렸다가
+    다시 계산한 값 위에 변경분을 더합니다.
+    """
+    with transaction.atomic():
+        stored = {
+            (row.sale_status, row.rarity, row.condition): row
+            for row in InventoryStat.objects.select_for_update().order_by(*KEY_FIELDS)
+        }
+        actual = aggregate()
+        drift = []
+        for key in sorted(set(stored) | set(actual) | set(all_keys())):
+            row = stored.get(key)
+            old = (row.count, row.price_total) if row is not None else (0, 0)
+            new = actual.get(key, (0, 0))
+            if old != new:
+                drift.append({'key': key, 'stored': old, 'actual': new})
+        if dry_run:
+            return drift
+        for item in drift:
+            count, total = item['actual']
+            lookup = dict(zip(KEY_FIELDS, item['key']))
+            if item['key'] in stored:
+                InventoryStat.objects.filter(**lookup).update(count=count, price_total=total)
+            else:
+                InventoryStat.objects.create(**lookup, count=count, price_total=total)
+        # 카드가 없는 조합도 행을 만들어 두어 카드 변경 시 UPDATE 한 번으로 갱신되게 함
+        InventoryStat.objects.bulk_create(
+            [InventoryStat(**dict(zip(KEY_FIELDS, key))) for key in all_keys() if key not in stored and key not in actual],
+            ignore_conflicts=True,
+        )
+    return drift
+
+
+def summary(lookups=None):
+    """통계 표의 합계/판매 상태별/레어리티별/상태별 값과 조합별 행 (카드가 있는 조합만, 가격은 원 단위 정수)
+
+    lookups: choice_lookups()의 결과 (예: {'sale_status': 'available', 'rarity__in': ['UR', 'SE']})
+    """
+    rows = InventoryStat.objects.filter(count__gt=0, **(lookups or {})).order_by(*KEY_FIELDS)
+    totals = {'count': 0, 'price_total': 0}
+    groups = {field: {} for field in KEY_FIELDS}
+    items = []
+    for row in rows:
+        count, price_total = row.count, int(row.price_total)
+        for group in [totals] + [groups[field].setdefault(getattr(row, field), {'count': 0, 'price_total': 0})
+                                 for field in KEY_FIELDS]:
+            group['count'] += count
+            group['price_total'] += price_total
+        items.append({
+            'sale_status': row.sale_status, 'rarity': row.rarity, 'condition': row.condition,
+            'count': count, 'price_total': price_total,
+        })
+    return {
+        **totals,
+        'by_sale_status': groups['sale_status'],
+        'by_rarity': groups['rarity'],
+        'by_condition': groups['condition'],
+        'rows': items,
+    }
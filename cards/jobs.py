@@ -0,0 +1,210 @@
+"""
+DB 기반 백그라운드 작업 큐
+
+웹 요청에서는 `enqueue()`로 작업만 등록하고, 실제 처리는
+`python manage.py run_jobs` 워커 프로세스가 수행합니다.
+작업은 `Job` 테이블에 저장되므로 서버가 재시작되어도 유실되지 않습니다.
+"""
+import logging
+import os
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Min
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# 작업 이름 -> (처리 함수, 최종 실패 시 호출할 함수)
+TASKS = {}
+
+
+def get_queue_setting(name, default):
+    """settings.JOB_QUEUE 값 조회"""
+    return getattr(settings, 'JOB_QUEUE', {}).get(name, default)
+
+
+def task(name, on_failure=None):
+    """작업 처리 함수 등록 데코레이터
+
+    처리 함수는 payload(dict)를 인자로 받습니다. 예외가 발생하면 재시도하며,
+    최대 시도 횟수를 넘기면 `on_failure(payload, error)`가 호출됩니다.
+    """
+    def decorator(func):
+        TASKS[name] = (func, on_failure)
+        return func
+    return decorator
+
+
+def enqueue(task_name, payload=None, key='', max_attempts=None, delay=0):
+    """작업 등록
+
+    `key`가 주어지면 같은 작업/키로 대기중이거나 실행중인 작업이 있을 때 새로 등록하지 않습니다.
+    """
+    if key:
+        existing = Job.objects.filter(
+            task=task_name,
+            key=key,
+            status__in=[Job.STATUS_QUEUED, Job.STATUS_RUNNING],
+        ).first()
+        if existing:
+            return existing
+
+    return Job.objects.create(
+        task=task_name,
+        key=key,
+        payload=payload or {},
+        max_attempts=max_attempts or get_queue_setting('MAX_ATTEMPTS', 3),
+        run_after=timezone.now() + timedelta(seconds=delay),
+    )
+
+
+def enqueue_on_commit(task_name, payload=None, **kwargs):
+    """현재 트랜잭션이 커밋된 후 작업 등록 (워커가 커밋 전 데이터를 읽지 않도록)"""
+    transaction.on_commit(lambda: enqueue(task_name, payload, **kwargs))
+
+
+def enqueue_many(task_name, payloads, max_attempts=None):
+    """여러 작업을 INSERT 한 번으로 등록 (새로 만든 카드처럼 중복 확인이 필요 없는 경우)
+
+    payloads: (payload, key) 목록
+    """
+    now = timezone.now()
+    max_attempts = max_attempts or get_queue_setting('MAX_ATTEMPTS', 3)
+    return Job.objects.bulk_create([
+        Job(task=task_name, key=key, payload=payload, max_attempts=max_attempts, run_after=now)
+        for payload, key in payloads
+    ])
+
+
+def enqueue_many_on_commit(task_name, payloads, **kwargs):
+    """현재 트랜잭션이 커밋된 후 여러 작업 등록"""
+    payloads = list(payloads)
+    transaction.on_commit(lambda: enqueue_many(task_name, payloads, **kwargs))
+
+
+def claim_next():
+    """실행 가능한 작업 하나를 점유하여 반환 (없으면 None)
+
+    PostgreSQL에서는 SELECT ... FOR UPDATE SKIP LOCKED로
+    여러 워커가 같은 작업을 동시에 가져가지 않도록 합니다.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        job = (
+            Job.objects.select_for_update(skip_locked=True)
+            .filter(status=Job.STATUS_QUEUED, run_after__lte=now)
+            .order_by('run_after', 'id')
+            .first()
+        )
+        if job is None:
+            return None
+        job.status = Job.STATUS_RUNNING
+        job.locked_at = now
+        job.attempts += 1
+        job.save(update_fields=['status', 'locked_at', 'attempts', 'updated_at'])
+    return job
+
+
+def run_job(job):
+    """점유한 작업 실행 및 결과 기록"""
+    handler = TASKS.get(job.task)
+    if handler is None:
+        job.status = Job.STATUS_FAILED
+        job.last_error = f'등록되지 않은 작업: {job.task}'
+        job.save(update_fields=['status', 'last_error', 'updated_at'])
+        logger.error(f"작업 {job.pk} 실패: 등록되지 않은 작업 {job.task}")
+        return False
+
+    func, on_failure = handler
+    try:
+        func(job.payload)
+    except Exception as e:
+        job.last_error = traceback.format_exc()
+        if job.attempts < job.max_attempts:
+            # 지수 백오프로 재시도 예약
+            backoff = get_queue_setting('RETRY_BACKOFF', 30) * (2 ** (job.attempts - 1))
+            job.status = Job.STATUS_QUEUED
+            job.run_after = timezone.now() + timedelta(seconds=backoff)
+            logger.warning(f"작업 {job.pk} ({job.task}) 실패, {backoff}초 후 재시도 ({job.attempts}/{job.max_attempts}): {e}")
+        else:
+            job.status = Job.STATUS_FAILED
+            logger.error(f"작업 {job.pk} ({job.task}) 최종 실패: {e}")
+            if on_failure:
+                try:
+                    on_failure(job.payload, e)
+                except Exception:
+                    logger.exception(f"작업 {job.pk} ({job.task}) 실패 처리 중 오류")
+        job.locked_at = None
+        job.save(update_fields=['status', 'run_after', 'locked_at', 'last_error', 'updated_at'])
+        return False
+
+    job.status = Job.STATUS_DONE
+    job.locked_at = None
+    job.last_error = ''
+    job.save(update_fields=['status', 'locked_at', 'last_error', 'updated_at'])
+    return True
+
+
+def requeue_stale_jobs(timeout=None):
+    """워커가 죽어서 실행중 상태로 남은 작업을 다시 대기 상태로 전환"""
+    timeout = timeout or get_queue_setting('STALE_TIMEOUT', 600)
+    cutoff = timezone.now() - timedelta(seconds=timeout)
+    return Job.objects.filter(status=Job.STATUS_RUNNING, locked_at__lt=cutoff).update(
+        status=Job.STATUS_QUEUED,
+        locked_at=None,
+        updated_at=timezone.now(),
+    )
+
+
+def run_worker(once=False, poll_interval=None):
+    """작업 처리 루프
+
+    once=True이면 현재 실행 가능한 작업을 모두 처리한 뒤 종료합니다.
+    반환값: 처리한 작업 수
+    """
+    poll_interval = poll_interval or get_queue_setting('POLL_INTERVAL', 1.0)
+    processed = 0
+    last_stale_check = 0
+    logger.info(f"작업 워커 시작 (pid={os.getpid()})")
+
+    while True:
+        if time.monotonic() - last_stale_check > 60:
+            requeued = requeue_stale_jobs()
+            if requeued:
+                logger.warning(f"중단된 작업 {requeued}개를 다시 대기열에 등록")
+            last_stale_check = time.monotonic()
+
+        job = claim_next()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        run_job(job)
+        processed += 1
+
+    return processed
+
+
+def queue_stats():
+    """작업 큐 현황 (상태별/작업별 개수, 가장 오래 대기중인 작업의 대기 시간)"""
+    by_status = {value: 0 for value, _ in Job.STATUS_CHOICES}
+    by_task = {}
+    for row in Job.objects.order_by().values('task', 'status').annotate(count=Count('id')):
+        by_status[row['status']] = by_status.get(row['status'], 0) + row['count']
+        by_task.setdefault(row['task'], {})[row['status']] = row['count']
+
+    oldest = Job.objects.filter(status=Job.STATUS_QUEUED).aggregate(oldest=Min('created_at'))['oldest']
+    return {
+        'depth': by_status[Job.STATUS_QUEUED] + by_status[Job.STATUS_RUNNING],
+        'by_status': by_status,
+        'by_task': by_task,
+        'oldest_queued_seconds': (timezone.now() - oldest).total_seconds() if oldest else 0,
+    }
@@ -0,0 +1,114 @@
+"""
+마이크로 벤치마크와 HTTP 부하 시나리오 실행, 결과 JSON 저장 및 기준 결과와 비교
+
+- 마이크로: serializer.*, optimize_card_image, name_search.autocomplete, card_search.db (1회당 중앙값)
+- 부하: 프로세스 안의 WSGI 서버에 list, filter, detail, autocomplete, upload를 동시에 요청 (p50/p95/p99, RPS)
+- 서버 비교(--servers): 워커 --workers개의 WSGI 서버와 ASGI 서버(uvicorn)에 조회 시나리오를
+  --server-concurrency개 동시 연결로 요청 (결과 이름 wsgi:list, asgi:list 등)
+
+데이터는 `python manage.py seed_cards 100k` 등으로 먼저 만들어 두세요.
+--compare로 기준 결과를 주면 --threshold(부하 시나리오는 --load-threshold) 비율 이상 느려진 항목을
+표시하고 실패로 종료합니다. 부하 시나리오는 실행마다 편차가 있으므로 같은 조건의 조용한 서버에서 비교하세요.
+
+사용 예:
+    python manage.py benchmark --output logs/bench-base.json
+    python manage.py benchmark --load-only --concurrency 16 --requests 1000
+    python manage.py benchmark --output logs/bench-new.json --compare logs/bench-base.json --threshold 0.15
+    python manage.py benchmark --servers --workers 4 --server-concurrency 64 --requests 2000
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cards import benchmarks
+
+
+class Command(BaseCommand):
+    help = '성능 벤치마크를 실행하고 결과를 JSON으로 저장/비교합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--micro-only', action='store_true', help='마이크로 벤치마크만 실행')
+        parser.add_argument('--load-only', action='store_true', help='부하 시나리오만 실행')
+        parser.add_argument('--rounds', type=int, default=5, help='마이크로 벤치마크 반복 횟수 (중앙값 사용)')
+        parser.add_argument('--requests', type=int, default=500, help='부하 시나리오별 요청 수 (p99는 1000 이상일 때만 비교)')
+        parser.add_argument('--concurrency', type=int, default=8, help='동시 요청 수')
+        parser.add_argument(
+            '--scenario', action='append', dest='scenarios',
+            choices=['list', 'filter', 'detail', 'autocomplete', 'upload'],
+            help='실행할 부하 시나리오 (여러 번 지정 가능, 생략 시 전체)',
+        )
+        parser.add_argument('--servers', action='store_true', help='마이크로/부하 대신 WSGI와 ASGI 서버 조회 처리량 비교')
+        parser.add_argument('--workers', type=int, default=4, help='서버 비교 시 WSGI 워커 스레드 수')
+        parser.add_argument('--server-concurrency', type=int, default=64, help='서버 비교 시 동시 연결 수')
+        parser.add_argument('--seed', type=int, default=0, help='난수 시드')
+        parser.add_argument('--output', help='결과를 저장할 JSON 파일 경로')
+        parser.add_argument('--compare', help='비교할 기준 결과 JSON 파일 경로')
+        parser.add_argument('--threshold', type=float, default=0.10, help='마이크로 벤치마크가 느려졌다고 판단할 비율 (0.10 = 10%%)')
+        parser.add_argument('--load-threshold', type=float, default=0.20, help='부하 시나리오가 느려졌다고 판단할 비율')
+
+    def handle(self, *args, **options):
+        if options['micro_only'] and options['load_only']:
+            raise CommandError('--micro-only와 --load-only는 함께 사용할 수 없습니다.')
+        if options['servers'] and (options['micro_only'] or options['load_only']):
+            raise CommandError('--servers는 --micro-only/--load-only와 함께 사용할 수 없습니다.')
+        baseline = None
+        if options['compare']:
+            try:
+                with open(options['compare'], encoding='utf-8') as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f'기준 결과를 읽을 수 없습니다: {e}')
+
+        log = lambda message: self.stdout.write(message)
+        results = {'environment': benchmarks.environment()}
+        env = results['environment']
+        self.stdout.write(f"{env['database']} / 카드 {env['cards']:,}장 / 카드명 {env['card_names']:,}개 / {env['commit']}")
+
+        if options['servers']:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"서버 비교 (시나리오별 {options['requests']}회, 동시 연결 {options['server_concurrency']}, "
+                f"WSGI 워커 {options['workers']})"
+            ))
+            results['servers'] = benchmarks.run_server_comparison(
+                requests=options['requests'], concurrency=options['server_concurrency'], workers=options['workers'],
+                scenarios=options['scenarios'], seed=options['seed'], log=log,
+            )
+            results['server_options'] = {
+                'requests': options['requests'], 'concurrency': options['server_concurrency'],
+                'workers': options['workers'],
+            }
+        elif not options['load_only']:
+            self.stdout.write(self.style.MIGRATE_HEADING('마이크로 벤치마크 (1회당 중앙값)'))
+            results['micro'] = benchmarks.run_micro(rounds=options['rounds'], seed=options['seed'], log=log)
+        if not options['micro_only'] and not options['servers']:
+            self.stdout.write(self.style.MIGRATE_HEADING(
+                f"부하 시나리오 (시나리오별 {options['requests']}회, 동시 {options['concurrency']})"
+            ))
+            results['load'] = benchmarks.run_load_scenarios(
+                requests=options['requests'], concurrency=options['concurrency'],
+                scenarios=options['scenarios'], seed=options['seed'], log=log,
+            )
+            results['load_options'] = {'requests': options['requests'], 'concurrency': options['concurrency']}
+
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as f:
+                json.dump(results, f, ensure_ascii=False, indent=2)
+            self.stdout.write(f"결과 저장: {options['output']}")
+
+        if baseline is None:
+            return
+        regressions = benchmarks.compare(
+            baseline, results, threshold=options['threshold'], load_threshold=options['load_threshold'],
+        )
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(
+                f"기준 결과({baseline.get('environment', {}).get('commit')}) 대비 "
+                f"느려진 항목 없음 (마이크로 {options['threshold']:.0%}, 부하 {options['load_threshold']:.0%} 기준)"
+            ))
+            return
+        for item in regressions:
+            self.stdout.write(self.style.ERROR(
+                f"{item['name']} {item['metric']}: {item['baseline']:.6g} → {item['current']:.6g} "
+                f"({item['change']:+.1%} 나빠짐)"
+            ))
+        raise CommandError(f'{len(regressions)}개 항목이 기준 결과보다 느려졌습니다.')
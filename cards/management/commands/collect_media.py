@@ -0,0 +1,43 @@
+"""
+참조가 끊긴 미디어 파일 정리 (cards/media_gc.py)
+
+카드가 참조하지 않는 이미지 파일(이전 일괄 삭제나 이미지 교체로 남은 파일, 중단된 업로드의 임시 파일)을
+찾아 삭제하고 확보한 용량을 출력합니다.
+
+사용 예:
+    python manage.py collect_media --dry-run      # 삭제 대상과 용량만 확인
+    python manage.py collect_media                # 삭제
+    python manage.py collect_media --min-age 86400
+"""
+from django.core.management.base import BaseCommand
+
+from cards.media_gc import collect
+
+
+class Command(BaseCommand):
+    help = '카드가 참조하지 않는 미디어 파일을 찾아 삭제하고 확보한 용량을 출력합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='삭제하지 않고 대상과 용량만 출력')
+        parser.add_argument('--batch-size', type=int, default=1000, help='한 번에 DB에서 확인할 파일 수')
+        parser.add_argument('--chunk-size', type=int, default=500, help='참조 확인 시 한 번에 읽을 카드 수')
+        parser.add_argument('--min-age', type=int, default=3600, help='이 시간(초)보다 최근에 수정된 파일은 건너뜀')
+
+    def handle(self, *args, **options):
+        stats = collect(
+            dry_run=options['dry_run'],
+            batch_size=options['batch_size'],
+            chunk_size=options['chunk_size'],
+            min_age=options['min_age'],
+            log=self.stdout.write,
+        )
+        megabytes = stats['orphaned_bytes'] / 1024 / 1024
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"[dry-run] 삭제 대상 {stats['orphaned']:,}개, {megabytes:.1f}MB 확보 가능"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(
+                f"삭제 {stats['deleted']:,}개, {stats['freed_bytes'] / 1024 / 1024:.1f}MB 확보"
+                + (f" (실패 {stats['errors']}개)" if stats['errors'] else '')
+            ))
@@ -0,0 +1,123 @@
+"""
+주요 카드 조회 쿼리의 실행 계획 확인
+
+각 쿼리의 EXPLAIN 결과를 출력하고, 기대한 인덱스를 사용하는지 확인합니다.
+인덱스 추가/변경 후나 데이터가 크게 늘어난 뒤 회귀 여부를 확인하는 용도입니다.
+
+사용 예:
+    python manage.py explain_card_queries                 # 전체 쿼리
+    python manage.py explain_card_queries search          # 이름에 search가 포함된 쿼리만
+    python manage.py explain_card_queries --no-seqscan    # (PostgreSQL) 행이 적어도 인덱스 사용 가능 여부 확인
+    python manage.py explain_card_queries --analyze       # 실제 실행 시간 포함
+"""
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Q
+from django.http import QueryDict
+from django.utils import timezone
+
+from cards.filters import filter_cards
+from cards.models import Card
+from cards.search import search_cards
+
+
+def _cursor_page():
+    """목록 keyset 페이지네이션의 다음 페이지 조회 (cards.pagination.KeysetPagination과 같은 조건)"""
+    now = timezone.now()
+    return Card.objects.filter(
+        Q(created_at__lte=now) & (Q(created_at__lt=now) | Q(created_at=now, id__lt=2 ** 31))
+    ).order_by('-created_at', '-id')[:21]
+
+
+def _filtered(params):
+    """목록 필터/정렬(cards.filters)을 적용한 첫 페이지 조회"""
+    def build():
+        queryset = filter_cards(Card.objects.all(), QueryDict(params))
+        return queryset.order_by(*(queryset.query.order_by or ('-created_at', '-id')))[:21]
+    return build
+
+
+# (이름, queryset 생성 함수, PostgreSQL에서 사용해야 하는 인덱스 중 하나)
+QUERIES = [
+    (
+        'list:cursor',
+        _cursor_page,
+        ['cards_card_created_id_idx'],
+    ),
+    (
+        'filter:available',
+        _filtered('sale_status=available'),
+        # 판매중 카드 비율이 높으면 최신순 인덱스를 따라가며 거르는 쪽이 더 빠름 (둘 다 정렬 없음)
+        ['cards_card_status_created_idx', 'cards_card_created_id_idx'],
+    ),
+    (
+        'filter:available-by-price',
+        _filtered('sale_status=available&ordering=price'),
+        ['cards_card_avail_price_idx'],
+    ),
+    (
+        'filter:available-rarity-under-price',
+        _filtered('sale_status=available&rarity=SE&max_price=20000&ordering=price'),
+        ['cards_card_avail_rarity_idx', 'cards_card_avail_price_idx'],
+    ),
+    (
+        'filter:sold',
+        _filtered('sale_status=sold'),
+        ['cards_card_status_created_idx'],
+    ),
+    (
+        'search:name',
+        lambda: search_cards(Card.objects.all(), '블루아이즈'),
+        ['cards_card_name_trgm'],
+    ),
+    (
+        'search:serial',
+        lambda: search_cards(Card.objects.all(), 'LOB-001'),
+        ['cards_card_serial_trgm'],
+    ),
+]
+
+
+class Command(BaseCommand):
+    help = '주요 카드 조회 쿼리의 실행 계획을 출력하고 기대한 인덱스를 사용하는지 확인합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('names', nargs='*', help='확인할 쿼리 이름(일부)')
+        parser.add_argument('--no-seqscan', action='store_true',
+                            help='(PostgreSQL) enable_seqscan=off로 실행하여 인덱스 사용 가능 여부만 확인')
+        parser.add_argument('--analyze', action='store_true', help='EXPLAIN ANALYZE로 실제 실행')
+
+    def handle(self, *args, **options):
+        is_postgresql = connection.vendor == 'postgresql'
+        queries = [q for q in QUERIES if not options['names'] or any(n in q[0] for n in options['names'])]
+        missing = 0
+
+        for name, build, expected in queries:
+            # SET LOCAL이 이 쿼리에만 적용되도록 트랜잭션 안에서 실행
+            with transaction.atomic():
+                if is_postgresql and options['no_seqscan']:
+                    with connection.cursor() as cursor:
+                        cursor.execute('SET LOCAL enable_seqscan = off')
+                plan = build().explain(analyze=options['analyze'])
+
+            self.stdout.write(self.style.MIGRATE_HEADING(f'== {name}'))
+            self.stdout.write(plan)
+            if not is_postgresql:
+                continue
+            used = [index for index in expected if index in plan]
+            if used:
+                self.stdout.write(self.style.SUCCESS(f'OK: {", ".join(used)} 사용'))
+            else:
+                missing += 1
+                self.stdout.write(self.style.WARNING(f'MISSING: {", ".join(expected)} 미사용'))
+            self.stdout.write('')
+
+        if not is_postgresql:
+            self.stdout.write(self.style.WARNING(
+                f'{connection.vendor} DB이므로 인덱스 사용 여부는 확인하지 않았습니다 (PostgreSQL 전용 인덱스).'
+            ))
+        elif missing:
+            self.stdout.write(self.style.WARNING(
+                f'{missing}개 쿼리가 기대한 인덱스를 사용하지 않습니다. '
+                f'데이터가 적으면 --no-seqscan으로 다시 확인하세요.'
+            ))
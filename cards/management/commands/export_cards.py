@@ -0,0 +1,62 @@
+"""
+카드 전체를 CSV/NDJSON 파일로 내보내기 (cards/exporter.py)
+
+서버 측 커서로 --chunk-size행씩 읽어 바로 파일에 쓰므로 카드 수와 관계없이 메모리 사용량이 일정합니다.
+필터는 목록 API(`GET /api/cards/`)의 쿼리 파라미터와 같습니다.
+
+사용 예:
+    python manage.py export_cards --output logs/cards.csv
+    python manage.py export_cards --format ndjson --gzip --output logs/cards.ndjson.gz
+    python manage.py export_cards --sale-status available --rarity UR,SE --ordering price > available.csv
+"""
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.exceptions import ValidationError
+
+from cards.exporter import FORMATS, CardExport
+from cards.filters import filter_cards
+from cards.models import Card
+from cards.search import search_cards
+
+FILTER_OPTIONS = ('sale_status', 'rarity', 'condition', 'min_price', 'max_price', 'ordering')
+
+
+class Command(BaseCommand):
+    help = '필터 조건에 맞는 카드 전체를 CSV 또는 NDJSON 파일로 내보냅니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--format', choices=list(FORMATS), default='csv', help='출력 형식 (기본값: csv)')
+        parser.add_argument('--output', help='저장할 파일 경로 (생략하면 표준 출력, .gz로 끝나면 gzip 압축)')
+        parser.add_argument('--gzip', action='store_true', help='gzip으로 압축')
+        parser.add_argument('--chunk-size', type=int, default=2000, help='DB에서 한 번에 읽을 카드 수')
+        parser.add_argument('--q', default='', help='카드명/시리얼 번호 검색어 (목록의 q)')
+        for name in FILTER_OPTIONS:
+            parser.add_argument(f"--{name.replace('_', '-')}", dest=name, default='', help=f'목록 필터 {name}과 같음')
+
+    def handle(self, *args, **options):
+        params = {name: options[name] for name in FILTER_OPTIONS if options[name]}
+        queryset = Card.objects.all()
+        if options['q'].strip():
+            queryset = search_cards(queryset, options['q'].strip()[:100])
+        try:
+            queryset = filter_cards(queryset, params)
+        except ValidationError as e:
+            raise CommandError(f'잘못된 필터: {e.detail}')
+
+        path = options['output']
+        gzip = options['gzip'] or bool(path and path.endswith('.gz'))
+        export = CardExport(queryset, options['format'], gzip=gzip, chunk_size=options['chunk_size'])
+        if path:
+            try:
+                with open(path, 'wb') as f:
+                    for chunk in export:
+                        f.write(chunk)
+            except OSError as e:
+                raise CommandError(f'파일을 쓸 수 없습니다: {e}')
+            self.stdout.write(self.style.SUCCESS(f'카드 {export.rows:,}장 내보냄: {path} ({export.bytes:,} bytes)'))
+        else:
+            for chunk in export:
+                sys.stdout.buffer.write(chunk)
+            sys.stdout.buffer.flush()
+            self.stderr.write(f'카드 {export.rows:,}장 내보냄 ({export.bytes:,} bytes)')
@@ -0,0 +1,56 @@
+"""
+이미지 ZIP + CSV/JSON manifest로 카드 일괄 등록
+
+manifest 열: name, serial_number(또는 serial), condition, rarity, price, image(ZIP 안의 파일 경로 또는 이름)
+파생 이미지는 작업 큐에 등록되므로 `python manage.py run_jobs` 워커(여러 개 가능)가 처리합니다.
+
+사용 예:
+    python manage.py import_cards collection.zip                          # ZIP 안의 manifest.csv/json 사용
+    python manage.py import_cards images.zip --manifest cards.csv
+    python manage.py import_cards collection.zip --dry-run                # 검증만
+    python manage.py import_cards collection.zip --report logs/import.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from cards.importer import ArchiveError, import_cards
+
+
+class Command(BaseCommand):
+    help = '이미지 ZIP과 CSV/JSON manifest로 카드를 일괄 등록합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('archive', help='이미지 ZIP 파일 경로')
+        parser.add_argument('--manifest', help='manifest 파일 경로 (.csv 또는 .json, 생략 시 ZIP 안에서 찾음)')
+        parser.add_argument('--batch-size', type=int, default=500, help='한 번에 bulk_create할 카드 수')
+        parser.add_argument('--dry-run', action='store_true', help='검증만 하고 저장하지 않음')
+        parser.add_argument('--report', help='행별 결과를 저장할 JSON 파일 경로')
+
+    def handle(self, *args, **options):
+        manifest = open(options['manifest'], 'rb') if options['manifest'] else None
+        try:
+            report = import_cards(
+                options['archive'], manifest=manifest,
+                batch_size=options['batch_size'], dry_run=options['dry_run'],
+            )
+        except (ArchiveError, OSError) as e:
+            raise CommandError(str(e))
+        finally:
+            if manifest:
+                manifest.close()
+
+        for entry in report['rows']:
+            if entry['status'] == 'error':
+                errors = '; '.join(f'{key}: {" ".join(messages)}' for key, messages in entry['errors'].items())
+                self.stdout.write(self.style.WARNING(f"{entry['row']}행 ({entry['name']}): {errors}"))
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8') as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+
+        if options['dry_run']:
+            summary = f"검증 통과 {report['valid']}개, 오류 {report['failed']}개 (저장하지 않음)"
+        else:
+            summary = f"등록 {report['created']}개, 오류 {report['failed']}개"
+        self.stdout.write(self.style.SUCCESS(summary) if not report['failed'] else self.style.WARNING(summary))
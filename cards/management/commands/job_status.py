@@ -0,0 +1,20 @@
+"""
+백그라운드 작업 큐 현황 출력
+"""
+from django.core.management.base import BaseCommand
+
+from cards.jobs import queue_stats
+
+
+class Command(BaseCommand):
+    help = '백그라운드 작업 큐의 대기열 길이와 상태별 작업 수를 출력합니다.'
+
+    def handle(self, *args, **options):
+        stats = queue_stats()
+        self.stdout.write(f"대기열 길이: {stats['depth']}개")
+        self.stdout.write(f"가장 오래된 대기 작업: {stats['oldest_queued_seconds']:.0f}초 전")
+        for status_name, count in stats['by_status'].items():
+            self.stdout.write(f"  {status_name}: {count}")
+        for task_name, counts in stats['by_task'].items():
+            summary = ', '.join(f'{k}={v}' for k, v in counts.items())
+            self.stdout.write(f"  [{task_name}] {summary}")
@@ -0,0 +1,114 @@
+"""
+카드명 .dat 파일을 DB(CardName)에 증분 반영
+
+파일과 DB의 카드명을 메모리에서 집합으로 비교하여 새 카드명만 bulk_create로 추가하고,
+--prune이면 파일에 없는 카드명을 삭제합니다. 파일의 카드명이 DB의 절반보다 적으면 스크래핑이
+중간에 실패한 파일로 보고 --force 없이는 아무것도 반영하지 않습니다. 모든 변경은 트랜잭션 하나로 처리되므로
+반영 중에도 기존 카드명이 그대로 조회되어 자동완성이 끊기지 않으며,
+카드명 사전 이력(CardNameRevision)도 한 건으로 기록됩니다.
+
+사용 예:
+    python manage.py load_card_names                                   # scripts/scraping/yugioh_card_names.dat
+    python manage.py load_card_names path/to/names.dat --prune         # 파일에 없는 카드명 삭제
+    python manage.py load_card_names path/to/names.dat --prune --force # 카드명이 크게 줄어도 삭제
+    python manage.py load_card_names --dry-run --show 20               # 변경 내용만 확인
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cards import name_dictionary
+from cards.models import CardName
+
+DEFAULT_DAT_FILE = settings.BASE_DIR / 'scripts' / 'scraping' / 'yugioh_card_names.dat'
+MAX_NAME_LENGTH = CardName._meta.get_field('name').max_length
+
+
+def read_names(path):
+    """.dat 파일의 카드명 목록 (빈 줄/중복 제외, 파일 순서 유지)"""
+    names = {}
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            name = line.strip()
+            if name:
+                names[name] = None
+    return list(names)
+
+
+def diff_names(names, prune=False, existing=None):
+    """(추가할 카드명, 삭제할 카드명, 변경 없는 카드명 수)
+
+    existing: DB의 카드명 집합 (없으면 조회)
+    """
+    if existing is None:
+        existing = set(CardName.objects.values_list('name', flat=True).iterator())
+    wanted = set(names)
+    added = [name for name in names if name not in existing]
+    removed = sorted(existing - wanted) if prune else []
+    return added, removed, len(wanted & existing)
+
+
+class Command(BaseCommand):
+    help = '카드명 .dat 파일과 DB를 비교하여 새 카드명만 추가합니다 (--prune: 없는 카드명 삭제).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', nargs='?', default=str(DEFAULT_DAT_FILE), help='카드명 파일 (한 줄에 하나)')
+        parser.add_argument('--prune', action='store_true', help='파일에 없는 카드명을 DB에서 삭제')
+        parser.add_argument(
+            '--force', action='store_true', help='파일의 카드명이 DB의 절반보다 적어도 --prune 삭제를 진행',
+        )
+        parser.add_argument('--dry-run', action='store_true', help='변경 내용만 출력하고 반영하지 않음')
+        parser.add_argument('--batch-size', type=int, default=5000, help='INSERT 한 번에 저장할 카드명 수')
+        parser.add_argument('--show', type=int, default=10, help='추가/삭제 카드명을 최대 몇 개까지 출력할지')
+
+    def handle(self, *args, **options):
+        started = time.monotonic()
+        try:
+            names = read_names(options['path'])
+        except OSError as e:
+            raise CommandError(f'카드명 파일을 읽을 수 없습니다: {e}')
+        if not names:
+            raise CommandError(f"카드명이 없습니다: {options['path']}")
+
+        too_long = [name for name in names if len(name) > MAX_NAME_LENGTH]
+        if too_long:
+            raise CommandError(f'{MAX_NAME_LENGTH}자를 넘는 카드명이 {len(too_long)}개 있습니다: {too_long[0]}')
+        if options['prune'] and not options['force'] and len(names) < CardName.objects.count() // 2:
+            # 스크래핑이 중간에 실패한 파일로 사전 대부분을 지우지 않도록
+            message = f'파일의 카드명({len(names)}개)이 DB의 절반보다 적습니다. 파일이 완전한지 확인하세요.'
+            if not options['dry_run']:
+                raise CommandError(f'{message} (그래도 삭제하려면 --force)')
+            self.stdout.write(self.style.WARNING(message))
+
+        if options['dry_run']:
+            added, removed, unchanged = diff_names(names, options['prune'])
+        else:
+            # 비교와 반영을 같은 트랜잭션에서 수행, 사전 이력은 끝날 때 한 건으로 기록
+            with name_dictionary.bulk_changes() as existing:
+                added, removed, unchanged = diff_names(names, options['prune'], existing)
+                if added:
+                    CardName.objects.bulk_create(
+                        [CardName(name=name) for name in added],
+                        batch_size=options['batch_size'], ignore_conflicts=True,
+                    )
+                for start in range(0, len(removed), options['batch_size']):
+                    CardName.objects.filter(name__in=removed[start:start + options['batch_size']]).delete()
+
+        self._report('추가', added, options['show'])
+        self._report('삭제', removed, options['show'])
+        elapsed = time.monotonic() - started
+        summary = (
+            f"파일 {len(names)}개: 추가 {len(added)}개, 삭제 {len(removed)}개, 변경 없음 {unchanged}개 "
+            f"({elapsed:.2f}초)"
+        )
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING(f'{summary} - 반영하지 않음 (--dry-run)'))
+        else:
+            self.stdout.write(self.style.SUCCESS(summary))
+            self.stdout.write(f'카드명 사전 버전: {name_dictionary.current_version()}')
+
+    def _report(self, label, names, limit):
+        if not names or limit <= 0:
+            return
+        self.stdout.write(f'{label}: ' + ', '.join(names[:limit]) + (f' 외 {len(names) - limit}개' if len(names) > limit else ''))
@@ -0,0 +1,167 @@
+"""
+카드 이미지 파생본 일괄 (재)생성
+
+여러 프로세스로 병렬 처리하며, 중단되더라도 체크포인트부터 이어서 실행합니다.
+
+사용 예:
+    python manage.py optimize_images                      # 파생 이미지가 없는 카드만 처리
+    python manage.py optimize_images --workers 8          # 프로세스 8개로 병렬 처리
+    python manage.py optimize_images --force              # 파이프라인 변경 후 전체 재생성
+    python manage.py optimize_images --force --since 2026-01-01
+    python manage.py optimize_images --restart            # 체크포인트 무시하고 처음부터
+"""
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from cards.models import Card
+from cards.tasks import generate_card_images
+
+DEFAULT_CHECKPOINT = settings.BASE_DIR / 'logs' / 'optimize_images.checkpoint.json'
+
+
+def _process_card(card_id):
+    """자식 프로세스에서 카드 한 장 처리. 반환값: (card_id, 원본 bytes, 오류 메시지)"""
+    card = Card.objects.filter(pk=card_id).first()
+    if card is None or not card.image:
+        return card_id, 0, None
+    try:
+        size = os.path.getsize(card.image.path)
+        generate_card_images(card)
+        return card_id, size, None
+    except Exception as e:
+        Card.objects.filter(pk=card_id).update(image_status=Card.IMAGE_STATUS_FAILED)
+        return card_id, 0, str(e)
+
+
+class Command(BaseCommand):
+    help = '카드 이미지 파생본(해상도/포맷별)을 병렬로 생성합니다. 중단 시 체크포인트부터 재개합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='프로세스 수 (기본값: CPU 코어 수)')
+        parser.add_argument('--chunk-size', type=int, default=200, help='한 번에 DB에서 읽고 체크포인트할 카드 수')
+        parser.add_argument('--force', action='store_true', help='이미 처리된 카드도 다시 생성')
+        parser.add_argument('--since', help='이 날짜(YYYY-MM-DD 또는 ISO 8601) 이후 등록된 카드만 처리')
+        parser.add_argument('--checkpoint', default=str(DEFAULT_CHECKPOINT), help='체크포인트 파일 경로')
+        parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 실행')
+
+    def handle(self, *args, **options):
+        since = self._parse_since(options['since'])
+        run_key = {'force': options['force'], 'since': options['since']}
+        checkpoint_path = options['checkpoint']
+
+        last_id = 0
+        if not options['restart']:
+            last_id = self._load_checkpoint(checkpoint_path, run_key)
+            if last_id:
+                self.stdout.write(f'체크포인트에서 재개: 카드 id {last_id} 이후부터')
+
+        queryset = Card.objects.exclude(image='').filter(pk__gt=last_id)
+        if not options['force']:
+            queryset = queryset.filter(Q(image_variants={}) | ~Q(image_status=Card.IMAGE_STATUS_DONE))
+        if since:
+            queryset = queryset.filter(created_at__gte=since)
+
+        total = queryset.count()
+        self.stdout.write(f'처리 대상: {total}개 (프로세스 {options["workers"]}개)')
+        if total == 0:
+            self._clear_checkpoint(checkpoint_path)
+            return
+
+        done = errors = 0
+        total_bytes = 0
+        started = time.monotonic()
+
+        # 자식 프로세스가 부모의 DB 연결을 물려받지 않도록 연결을 닫고,
+        # 쿼리를 실행하기 전에 워커 프로세스를 모두 fork 해둠
+        connections.close_all()
+        pool = ProcessPoolExecutor(
+            max_workers=max(1, options['workers']),
+            mp_context=multiprocessing.get_context('fork'),
+        )
+        pool.submit(os.getpid).result()
+
+        with pool:
+            for chunk in self._chunks(queryset, options['chunk_size']):
+                for card_id, size, error in pool.map(_process_card, chunk):
+                    if error:
+                        errors += 1
+                        self.stderr.write(f'  ✗ 카드 {card_id}: {error}')
+                    else:
+                        done += 1
+                        total_bytes += size
+
+                # 청크 단위로 완료된 마지막 id 기록 (재실행 시 그 다음부터 처리)
+                self._save_checkpoint(checkpoint_path, run_key, chunk[-1])
+
+                elapsed = max(time.monotonic() - started, 1e-6)
+                self.stdout.write(
+                    f'[{done + errors}/{total}] '
+                    f'{(done + errors) / elapsed:.1f} images/sec, '
+                    f'{total_bytes / elapsed / (1024 * 1024):.2f} MB/sec, '
+                    f'실패 {errors}개'
+                )
+
+        self._clear_checkpoint(checkpoint_path)
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'\n=== 완료 === 성공 {done}개, 실패 {errors}개, {elapsed:.1f}초'
+        ))
+
+    def _chunks(self, queryset, size):
+        """카드 id를 size개씩 pk 순서로 조회 (전체 목록을 메모리에 올리거나 커서를 오래 열어두지 않음)"""
+        last_pk = 0
+        while True:
+            chunk = list(
+                queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:size]
+            )
+            if not chunk:
+                return
+            yield chunk
+            last_pk = chunk[-1]
+
+    def _parse_since(self, value):
+        if not value:
+            return None
+        parsed = parse_datetime(value)
+        if parsed is None:
+            date = parse_date(value)
+            if date is None:
+                raise CommandError(f'--since 형식이 올바르지 않습니다: {value}')
+            parsed = datetime(date.year, date.month, date.day)
+        if timezone.is_naive(parsed):
+            parsed = timezone.make_aware(parsed)
+        return parsed
+
+    def _load_checkpoint(self, path, run_key):
+        try:
+            with open(path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return 0
+        if data.get('run') != run_key:
+            self.stdout.write('체크포인트의 실행 옵션이 달라 처음부터 실행합니다.')
+            return 0
+        return data.get('last_id', 0)
+
+    def _save_checkpoint(self, path, run_key, last_id):
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'run': run_key, 'last_id': last_id}, f)
+        os.replace(tmp_path, path)
+
+    def _clear_checkpoint(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,36 @@
+"""
+재고 통계 재계산 (cards/inventory_stats.py)
+
+카드 표를 판매 상태 × 레어리티 × 상태별로 다시 집계하여 InventoryStat과 다른 조합을 바로잡습니다.
+카드 변경은 모두 같은 트랜잭션에서 통계를 갱신하므로 보통은 달라진 조합이 없으며,
+DB를 직접 수정하거나 백업을 복원한 뒤에 실행합니다.
+
+사용 예:
+    python manage.py rebuild_inventory_stats --check   # 달라진 조합만 출력 (있으면 실패 코드로 종료)
+    python manage.py rebuild_inventory_stats           # 재계산
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from cards.inventory_stats import rebuild
+
+
+class Command(BaseCommand):
+    help = '카드 표를 다시 집계하여 재고 통계(판매 상태 × 레어리티 × 상태별 카드 수/가격 합계)를 바로잡습니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--check', action='store_true', help='고치지 않고 달라진 조합만 출력 (있으면 실패 코드로 종료)')
+
+    def handle(self, *args, **options):
+        drift = rebuild(dry_run=options['check'])
+        for item in drift:
+            (stored_count, stored_total), (count, total) = item['stored'], item['actual']
+            self.stdout.write(
+                f"{'/'.join(item['key'])}: 카드 {stored_count:,}장 → {count:,}장, "
+                f"가격 합계 {stored_total:,}원 → {total:,}원"
+            )
+        if not drift:
+            self.stdout.write(self.style.SUCCESS('재고 통계가 카드 표와 일치합니다.'))
+        elif options['check']:
+            raise CommandError(f'{len(drift)}개 조합의 재고 통계가 카드 표와 다릅니다.')
+        else:
+            self.stdout.write(self.style.SUCCESS(f'{len(drift)}개 조합의 재고 통계를 다시 계산했습니다.'))
@@ -0,0 +1,58 @@
+"""
+백그라운드 작업 워커 실행
+
+사용 예:
+    python manage.py run_jobs                 # 워커 1개, 계속 실행
+    python manage.py run_jobs --processes 4   # 워커 프로세스 4개
+    python manage.py run_jobs --once          # 대기중인 작업만 처리하고 종료
+"""
+import multiprocessing
+
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from cards import jobs
+
+
+def _worker_main(once, poll_interval):
+    """자식 프로세스 진입점"""
+    jobs.run_worker(once=once, poll_interval=poll_interval)
+
+
+class Command(BaseCommand):
+    help = '백그라운드 작업 큐(이미지 최적화 등) 워커를 실행합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--processes', type=int, default=1, help='워커 프로세스 수 (기본값: 1)')
+        parser.add_argument('--once', action='store_true', help='현재 대기중인 작업만 처리하고 종료')
+        parser.add_argument('--poll-interval', type=float, default=None, help='대기 작업이 없을 때 조회 간격(초)')
+
+    def handle(self, *args, **options):
+        processes = max(1, options['processes'])
+        once = options['once']
+        poll_interval = options['poll_interval']
+
+        if processes == 1:
+            processed = jobs.run_worker(once=once, poll_interval=poll_interval)
+            self.stdout.write(self.style.SUCCESS(f'처리한 작업: {processed}개'))
+            return
+
+        # fork 전에 DB 연결을 닫아 자식 프로세스가 연결을 공유하지 않도록 함
+        connections.close_all()
+        workers = [
+            multiprocessing.Process(target=_worker_main, args=(once, poll_interval), daemon=False)
+            for _ in range(processes)
+        ]
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f'워커 프로세스 {processes}개 시작')
+
+        try:
+            for worker in workers:
+                worker.join()
+        except KeyboardInterrupt:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.join()
+        self.stdout.write(self.style.SUCCESS('워커 종료'))
@@ -0,0 +1,54 @@
+"""
+성능 측정용 대량 카탈로그 생성
+
+실제 카드명 사전(scripts/scraping/yugioh_card_names.dat)의 이름과 합성 이미지로 카드를 만듭니다.
+합성 이미지와 파생 이미지는 --images장만 만들어 여러 카드가 공유하므로 1M장도 디스크를 거의 쓰지 않습니다.
+생성한 카드는 시리얼 번호가 BENCH-로 시작하며 --clear로 지웁니다. 운영 DB에서는 실행하지 마세요.
+
+사용 예:
+    python manage.py seed_cards 10k
+    python manage.py seed_cards 1m --images 50 --batch-size 10000
+    python manage.py seed_cards --clear
+"""
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from cards import benchmarks
+from cards.models import CardName
+
+
+class Command(BaseCommand):
+    help = '성능 측정용 카드를 대량으로 생성합니다 (예: 10k, 100k, 1m).'
+
+    def add_arguments(self, parser):
+        parser.add_argument('count', nargs='?', default='10k', help='생성할 카드 수 (10k, 100k, 1m 형식 가능)')
+        parser.add_argument('--images', type=int, default=20, help='카드들이 공유할 합성 이미지 수')
+        parser.add_argument('--batch-size', type=int, default=5000, help='INSERT 한 번에 저장할 카드 수')
+        parser.add_argument('--seed', type=int, default=0, help='난수 시드 (같으면 같은 데이터)')
+        parser.add_argument('--clear', action='store_true', help='생성했던 카드(BENCH-)를 삭제하고 종료')
+
+    def handle(self, *args, **options):
+        log = lambda message: self.stdout.write(message)
+        if options['clear']:
+            result = benchmarks.clear_seeded(batch_size=options['batch_size'], log=log)
+            self.stdout.write(self.style.SUCCESS(f"카드 {result['deleted']:,}장, 공유 파일 {result['files']}개 정리"))
+            return
+
+        try:
+            count = benchmarks.parse_count(options['count'])
+        except ValueError:
+            raise CommandError(f"카드 수를 해석할 수 없습니다: {options['count']}")
+
+        if not CardName.objects.exists():
+            # 카드명은 실제 사전 파일에서 (자동완성/검색 벤치마크도 실제 데이터로)
+            call_command('load_card_names', stdout=self.stdout)
+
+        try:
+            result = benchmarks.seed_catalogue(
+                count, images=options['images'], batch_size=options['batch_size'], seed=options['seed'], log=log,
+            )
+        except benchmarks.NoCardNamesError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"카드 {result['created']:,}장 생성 (합성 이미지 {result['images']}장, {result['seconds']}초)"
+        ))
@@ -0,0 +1,170 @@
+"""
+참조가 끊긴 미디어 파일 정리 (mark & sweep)
+
+1. 표시(mark): 카드를 chunk_size장씩 읽어 참조하는 파일의 `MediaBlob.referenced_at`을 시작 시각으로 갱신합니다.
+   MediaBlob 행이 없는 파일(해시 저장소 도입 이전 파일)은 행을 만들어 이후부터 참조 횟수로 관리합니다.
+2. 정리(sweep): MEDIA_ROOT 아래 카드 이미지 디렉터리를 `os.scandir`로 훑으며 batch_size개씩 MediaBlob을
+   조회하고, 시작 시각 이후 참조가 확인되지 않은 파일과 그 MediaBlob 행을 삭제합니다.
+
+카드 수/파일 수와 관계없이 메모리에는 chunk/batch 하나와 아직 훑지 않은 디렉터리 목록만 둡니다.
+실행 중에 저장된 파일은 저장할 때 referenced_at이 갱신되므로 지우지 않으며(삭제 직전 행 잠금 후 재확인),
+min_age초보다 최근에 수정된 파일(업로드 중인 임시 파일 등)은 건너뜁니다. 기존 파일과 내용이 같은 업로드는
+파일의 수정 시각을 갱신하므로(storage.py), 그 카드가 표시 단계 이후에 커밋되더라도 지우지 않습니다.
+
+`python manage.py collect_media` 또는 `collect_media` 작업으로 실행합니다.
+"""
+import logging
+import os
+from collections import Counter
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Card, MediaBlob
+
+logger = logging.getLogger(__name__)
+
+# MEDIA_ROOT 기준 정리 대상 디렉터리 (Card.image/image_optimized의 upload_to, 파생 이미지 포함)
+SCAN_DIRS = ('cards',)
+
+
+def _storage():
+    return Card._meta.get_field('image').storage
+
+
+def mark_referenced(started, chunk_size=500):
+    """모든 카드가 참조하는 파일의 referenced_at을 started로 갱신, (표시한 파일 수, 새로 등록한 파일 수) 반환"""
+    marked = adopted = 0
+    names = []
+    cards = Card.objects.order_by('pk').only('image', 'image_optimized', 'image_variants')
+    for index, card in enumerate(cards.iterator(chunk_size=chunk_size), start=1):
+        names.extend(card.file_names())
+        if index % chunk_size == 0:
+            counts = _mark(Counter(names), started)
+            marked, adopted = marked + counts[0], adopted + counts[1]
+            names = []
+    if names:
+        counts = _mark(Counter(names), started)
+        marked, adopted = marked + counts[0], adopted + counts[1]
+    return marked, adopted
+
+
+def _mark(counts, started):
+    storage = _storage()
+    existing = set(MediaBlob.objects.filter(name__in=counts).values_list('name', flat=True))
+    MediaBlob.objects.filter(name__in=existing).update(referenced_at=started)
+    missing = [
+        MediaBlob(name=name, size=_size(storage, name), refcount=count, referenced_at=started)
+        for name, count in counts.items() if name not in existing
+    ]
+    # 다른 프로세스가 같은 파일을 먼저 등록했으면 그 행(저장 시각이 referenced_at)을 그대로 사용
+    MediaBlob.objects.bulk_create(missing, ignore_conflicts=True)
+    return len(counts), len(missing)
+
+
+def _size(storage, name):
+    try:
+        return os.path.getsize(storage.path(name))
+    except OSError:
+        return 0
+
+
+def iter_files(root):
+    """root 아래 모든 파일의 os.DirEntry (하위 디렉터리는 경로만 스택에 보관)"""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        yield entry
+        except FileNotFoundError:
+            continue
+
+
+def _remove(storage, name, started, cutoff):
+    """행을 잠그고 그사이 다시 참조되지 않았는지 확인한 뒤 파일과 MediaBlob 삭제, 삭제했으면 True"""
+    path = storage.path(name)
+    with transaction.atomic():
+        blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+        if blob is not None and blob.referenced_at is not None and blob.referenced_at >= started:
+            return False
+        try:
+            # 훑은 뒤 같은 내용이 다시 업로드됨 (중복 제거 시 수정 시각 갱신)
+            if os.stat(path).st_mtime > cutoff:
+                return False
+        except FileNotFoundError:
+            return False
+        if blob is not None:
+            blob.delete()
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def collect(dry_run=False, batch_size=1000, chunk_size=500, min_age=3600, log=logger.info):
+    """참조가 끊긴 파일 정리, 결과 통계 dict 반환
+
+    dry_run=True이면 참조 확인(referenced_at 갱신)만 하고 파일은 지우지 않습니다.
+    """
+    started = timezone.now()
+    storage = _storage()
+    stats = {
+        'marked': 0, 'adopted': 0, 'scanned': 0, 'recent': 0,
+        'orphaned': 0, 'orphaned_bytes': 0, 'deleted': 0, 'freed_bytes': 0, 'errors': 0,
+    }
+    stats['marked'], stats['adopted'] = mark_referenced(started, chunk_size=chunk_size)
+    log(f"참조 중인 파일 {stats['marked']:,}개 확인 (새로 등록 {stats['adopted']:,}개)")
+
+    cutoff = started.timestamp() - min_age
+
+    def sweep(batch):
+        referenced = set(
+            MediaBlob.objects.filter(name__in=[name for name, _ in batch], referenced_at__gte=started)
+            .values_list('name', flat=True)
+        )
+        for name, size in batch:
+            if name in referenced:
+                continue
+            stats['orphaned'] += 1
+            stats['orphaned_bytes'] += size
+            if dry_run:
+                log(f"[dry-run] 삭제 대상: {name} ({size:,} bytes)")
+                continue
+            try:
+                if _remove(storage, name, started, cutoff):
+                    stats['deleted'] += 1
+                    stats['freed_bytes'] += size
+            except OSError as e:
+                stats['errors'] += 1
+                logger.warning(f"파일 삭제 실패: {name} ({e})")
+
+    batch = []
+    for directory in SCAN_DIRS:
+        for entry in iter_files(storage.path(directory)):
+            stats['scanned'] += 1
+            try:
+                stat = entry.stat(follow_symlinks=False)
+            except FileNotFoundError:
+                continue
+            if stat.st_mtime > cutoff:
+                stats['recent'] += 1
+                continue
+            name = os.path.relpath(entry.path, storage.location).replace(os.sep, '/')
+            batch.append((name, stat.st_size))
+            if len(batch) >= batch_size:
+                sweep(batch)
+                batch = []
+    if batch:
+        sweep(batch)
+
+    log(
+        f"파일 {stats['scanned']:,}개 중 참조가 끊긴 파일 {stats['orphaned']:,}개 "
+        f"({stats['orphaned_bytes']:,} bytes), 삭제 {stats['deleted']:,}개 ({stats['freed_bytes']:,} bytes 확보)"
+    )
+    return stats
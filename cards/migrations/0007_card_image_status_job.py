@@ -0,0 +1,49 @@
+# Generated by Django 6.0 on 2026-10-18 12:56
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def mark_existing_images_done(apps, schema_editor):
+    """이미 최적화 이미지가 있는 기존 카드는 처리 완료로 표시"""
+    Card = apps.get_model('cards', 'Card')
+    Card.objects.exclude(image_optimized='').exclude(image_optimized__isnull=True).update(image_status='done')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0006_cardname'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='image_status',
+            field=models.CharField(choices=[('pending', '대기중'), ('processing', '처리중'), ('done', '완료'), ('failed', '실패')], default='pending', max_length=10, verbose_name='이미지 처리 상태'),
+        ),
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('task', models.CharField(max_length=100, verbose_name='작업 종류')),
+                ('key', models.CharField(blank=True, default='', max_length=200, verbose_name='중복 방지 키')),
+                ('payload', models.JSONField(blank=True, default=dict, verbose_name='작업 데이터')),
+                ('status', models.CharField(choices=[('queued', '대기중'), ('running', '실행중'), ('done', '완료'), ('failed', '실패')], default='queued', max_length=10, verbose_name='상태')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('max_attempts', models.PositiveIntegerField(default=3, verbose_name='최대 시도 횟수')),
+                ('run_after', models.DateTimeField(default=django.utils.timezone.now, verbose_name='실행 예정 시각')),
+                ('locked_at', models.DateTimeField(blank=True, null=True, verbose_name='워커 점유 시각')),
+                ('last_error', models.TextField(blank=True, default='', verbose_name='마지막 오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '작업',
+                'verbose_name_plural': '작업들',
+                'ordering': ['run_after', 'id'],
+                'indexes': [models.Index(fields=['status', 'run_after'], name='cards_job_status_b222c5_idx'), models.Index(fields=['task', 'key'], name='cards_job_task_9e2cb4_idx')],
+            },
+        ),
+        migrations.RunPython(mark_existing_images_done, migrations.RunPython.noop),
+    ]
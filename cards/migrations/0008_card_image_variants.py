@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 13:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0007_card_image_status_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='card',
+            name='image_variants',
+            field=models.JSONField(blank=True, default=dict, verbose_name='파생 이미지'),
+        ),
+    ]
@@ -0,0 +1,32 @@
+from django.db import migrations
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """카드명/시리얼 검색용 pg_trgm GIN 인덱스 (PostgreSQL 이외의 DB에서는 생략)"""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS cards_card_name_trgm ON cards_card USING gin (name gin_trgm_ops)'
+    )
+    schema_editor.execute(
+        'CREATE INDEX IF NOT EXISTS cards_card_serial_trgm ON cards_card USING gin (serial_number gin_trgm_ops)'
+    )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('DROP INDEX IF EXISTS cards_card_name_trgm')
+    schema_editor.execute('DROP INDEX IF EXISTS cards_card_serial_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0009_mediablob'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
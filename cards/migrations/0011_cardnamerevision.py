@@ -0,0 +1,37 @@
+# Generated by Django 6.0 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+def create_initial_revision(apps, schema_editor):
+    """기존 카드명 전체를 첫 번째 사전 버전으로 기록"""
+    CardName = apps.get_model('cards', 'CardName')
+    CardNameRevision = apps.get_model('cards', 'CardNameRevision')
+    names = sorted(CardName.objects.values_list('name', flat=True))
+    if names:
+        CardNameRevision.objects.create(added=names, removed=[])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0010_card_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardNameRevision',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('added', models.JSONField(blank=True, default=list, verbose_name='추가된 카드명')),
+                ('removed', models.JSONField(blank=True, default=list, verbose_name='삭제된 카드명')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+            ],
+            options={
+                'verbose_name': '카드명 사전 버전',
+                'verbose_name_plural': '카드명 사전 버전들',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(create_initial_revision, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 17:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0011_cardnamerevision'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='card',
+            options={'ordering': ['-created_at', '-id'], 'verbose_name': '카드', 'verbose_name_plural': '카드들'},
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['created_at', 'id'], name='cards_card_created_id_idx'),
+        ),
+    ]
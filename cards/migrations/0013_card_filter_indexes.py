@@ -0,0 +1,25 @@
+# Generated by Django 6.0 on 2026-10-18 18:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0012_card_created_id_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(fields=['sale_status', 'created_at', 'id'], name='cards_card_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(condition=models.Q(('sale_status', 'available')), fields=['price', 'id'], name='cards_card_avail_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='card',
+            index=models.Index(condition=models.Q(('sale_status', 'available')), fields=['rarity', 'price', 'id'], name='cards_card_avail_rarity_idx'),
+        ),
+    ]
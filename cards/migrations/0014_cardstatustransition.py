@@ -0,0 +1,33 @@
+# Generated by Django 6.0 on 2026-10-18 13:22
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0013_card_filter_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CardStatusTransition',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('card_number', models.BigIntegerField(verbose_name='카드 ID')),
+                ('from_status', models.CharField(choices=[('available', '판매중'), ('reserved', '예약중'), ('sold', '판매완료')], max_length=10, verbose_name='이전 상태')),
+                ('to_status', models.CharField(choices=[('available', '판매중'), ('reserved', '예약중'), ('sold', '판매완료')], max_length=10, verbose_name='변경 상태')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='생성일')),
+                ('card', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='status_transitions', to='cards.card', verbose_name='카드')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL, verbose_name='변경한 사용자')),
+            ],
+            options={
+                'verbose_name': '판매 상태 변경 이력',
+                'verbose_name_plural': '판매 상태 변경 이력들',
+                'ordering': ['id'],
+            },
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 6.0 on 2026-10-18 16:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0014_cardstatustransition'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediablob',
+            name='referenced_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='마지막 참조 확인 시각'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 6.0 on 2026-10-18 18:40
+
+import itertools
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def populate_inventory_stats(apps, schema_editor):
+    """기존 카드를 판매 상태 × 레어리티 × 상태별로 집계하여 재고 통계 초기값 생성 (카드가 없는 조합은 0)"""
+    Card = apps.get_model('cards', 'Card')
+    InventoryStat = apps.get_model('cards', 'InventoryStat')
+    fields = ('sale_status', 'rarity', 'condition')
+    totals = {
+        tuple(row[field] for field in fields): (row['count'], row['price_total'] or 0)
+        for row in Card.objects.order_by().values(*fields).annotate(count=Count('id'), price_total=Sum('price'))
+    }
+    keys = list(itertools.product(*([value for value, _ in Card._meta.get_field(field).choices] for field in fields)))
+    # 선택지에 없는 값으로 저장된 카드가 있으면 그 조합도 포함
+    keys += [key for key in totals if key not in keys]
+    InventoryStat.objects.bulk_create([
+        InventoryStat(**dict(zip(fields, key)), count=totals.get(key, (0, 0))[0], price_total=totals.get(key, (0, 0))[1])
+        for key in keys
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cards', '0015_mediablob_referenced_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InventoryStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sale_status', models.CharField(choices=[('available', '판매중'), ('reserved', '예약중'), ('sold', '판매완료')], max_length=10, verbose_name='판매 상태')),
+                ('rarity', models.CharField(choices=[('N', '노멀(N)'), ('R', '레어(R)'), ('SR', '슈퍼 레어(SR)'), ('UR', '울트라 레어(UR)'), ('SE', '시크릿 레어(SE)'), ('UL', '얼티미트 레어(UL)'), ('HR', '홀로그래픽 레어(HR)')], max_length=2, verbose_name='레어리티')),
+                ('condition', models.CharField(choices=[('S', 'S급'), ('A', 'A급'), ('B', 'B급'), ('C', 'C급')], max_length=1, verbose_name='상태')),
+                ('count', models.BigIntegerField(default=0, verbose_name='카드 수')),
+                ('price_total', models.DecimalField(decimal_places=0, default=0, max_digits=20, verbose_name='가격 합계')),
+            ],
+            options={
+                'verbose_name': '재고 통계',
+                'verbose_name_plural': '재고 통계들',
+                'ordering': ['sale_status', 'rarity', 'condition'],
+                'constraints': [models.UniqueConstraint(fields=('sale_status', 'rarity', 'condition'), name='cards_inventorystat_key_uniq')],
+            },
+        ),
+        migrations.RunPython(populate_inventory_stats, migrations.RunPython.noop),
+    ]
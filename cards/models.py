@@ -1,11 +1,10 @@
-from django.db import models
-from django.db.models.signals import post_save
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
-from PIL import Image
-from io import BytesIO
-from django.core.files.base import ContentFile
-import os
+from django.utils import timezone
 import logging
+from collections import Counter
 
 logger = logging.getLogger(__name__)
 
@@ -27,6 +26,77 @@ class CardName(models.Model):
         return self.name
 
 
+class CardNameRevision(models.Model):
+    """카드명 사전 변경 이력 (id가 곧 사전 버전, 추가만 가능)
+
+    모든 변경 이력을 순서대로 적용하면 현재 카드명 목록이 되므로
+    클라이언트가 가진 버전 이후의 변경분만 계산해 보낼 수 있습니다.
+    """
+    added = models.JSONField(default=list, blank=True, verbose_name='추가된 카드명')
+    removed = models.JSONField(default=list, blank=True, verbose_name='삭제된 카드명')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    
+    class Meta:
+        verbose_name = '카드명 사전 버전'
+        verbose_name_plural = '카드명 사전 버전들'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"v{self.pk} (+{len(self.added)} / -{len(self.removed)})"
+
+
+class CardQuerySet(models.QuerySet):
+    """시그널이 발생하지 않는 일괄 변경도 목록/상세 응답 캐시를 무효화하고 재고 통계를 갱신"""
+    
+    def update(self, **kwargs):
+        from . import inventory_stats, response_cache
+        # auto_now는 save()에서만 적용되므로 직접 갱신 (목록/상세의 Last-Modified/ETag 계산에 사용)
+        kwargs.setdefault('updated_at', timezone.now())
+        if not inventory_stats.affects(kwargs):
+            updated = super().update(**kwargs)
+        else:
+            with transaction.atomic(using=self.db, savepoint=False):
+                before = inventory_stats.lock(self)
+                updated = super().update(**kwargs)
+                inventory_stats.record_update(before, kwargs)
+        if updated:
+            response_cache.invalidate_on_commit()
+        return updated
+    
+    def bulk_create(self, objs, *args, **kwargs):
+        from . import inventory_stats, response_cache
+        with transaction.atomic(using=self.db, savepoint=False):
+            created = super().bulk_create(objs, *args, **kwargs)
+            inventory_stats.record(after=[inventory_stats.values_of(card) for card in created])
+        if created:
+            response_cache.invalidate_on_commit()
+        return created
+    
+    def bulk_update(self, objs, *args, **kwargs):
+        # 재고 통계는 내부에서 호출하는 update()가 갱신
+        from . import response_cache
+        updated = super().bulk_update(objs, *args, **kwargs)
+        if updated:
+            response_cache.invalidate_on_commit()
+        return updated
+    
+    def delete(self):
+        """일괄 삭제(관리자 화면의 선택 삭제 등)도 카드 이미지 파일의 참조를 커밋 후 해제하고 재고 통계에서 제외"""
+        from . import inventory_stats
+        from .storage import release_on_commit
+        with transaction.atomic(using=self.db):
+            names = Counter()
+            removed = []
+            cards = self.select_for_update().only('image', 'image_optimized', 'image_variants', *inventory_stats.FIELDS)
+            for card in cards.iterator(chunk_size=2000):
+                names.update(card.file_names())
+                removed.append(inventory_stats.values_of(card))
+            deleted = super().delete()
+            inventory_stats.record(before=removed)
+            release_on_commit(names.elements())
+        return deleted
+
+
 class Card(models.Model):
     CONDITION_CHOICES = [
         ('S', 'S급'),
@@ -51,10 +121,35 @@ class Card(models.Model):
         ('sold', '판매완료'),
     ]
     
+    # 허용되는 판매 상태 변경 (현재 상태 → 변경 가능한 상태)
+    SALE_STATUS_TRANSITIONS = {
+        'available': {'reserved', 'sold'},
+        'reserved': {'available', 'sold'},
+        'sold': {'available'},
+    }
+    
+    IMAGE_STATUS_PENDING = 'pending'
+    IMAGE_STATUS_PROCESSING = 'processing'
+    IMAGE_STATUS_DONE = 'done'
+    IMAGE_STATUS_FAILED = 'failed'
+    IMAGE_STATUS_CHOICES = [
+        (IMAGE_STATUS_PENDING, '대기중'),
+        (IMAGE_STATUS_PROCESSING, '처리중'),
+        (IMAGE_STATUS_DONE, '완료'),
+        (IMAGE_STATUS_FAILED, '실패'),
+    ]
+    
     name = models.CharField(max_length=200, verbose_name='카드명')
     serial_number = models.CharField(max_length=50, verbose_name='카드 시리얼', blank=True, null=True)
     image = models.ImageField(upload_to='cards/', verbose_name='카드 이미지')
     image_optimized = models.ImageField(upload_to='cards/optimized/', verbose_name='최적화된 이미지', null=True, blank=True)
+    image_variants = models.JSONField(default=dict, blank=True, verbose_name='파생 이미지')
+    image_status = models.CharField(
+        max_length=10,
+        choices=IMAGE_STATUS_CHOICES,
+        default=IMAGE_STATUS_PENDING,
+        verbose_name='이미지 처리 상태'
+    )
     condition = models.CharField(
         max_length=1, 
         choices=CONDITION_CHOICES, 
@@ -80,128 +175,236 @@ class Card(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
     updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
     
+    objects = CardQuerySet.as_manager()
+    
     class Meta:
         verbose_name = '카드'
         verbose_name_plural = '카드들'
-        ordering = ['-created_at']
+        ordering = ['-created_at', '-id']
+        indexes = [
+            # 목록 keyset 페이지네이션: ORDER BY created_at DESC, id DESC + (created_at, id) < cursor
+            models.Index(fields=['created_at', 'id'], name='cards_card_created_id_idx'),
+            # 상태별 최신순 목록 (판매중 카드 목록, 판매완료/예약중 관리 화면)
+            models.Index(fields=['sale_status', 'created_at', 'id'], name='cards_card_status_created_idx'),
+            # 구매자 조회의 대부분은 판매중 카드이므로 가격 관련 조회는 판매중 카드만 담은 부분 인덱스 사용
+            # - 가격순 목록
+            models.Index(
+                fields=['price', 'id'],
+                condition=models.Q(sale_status='available'),
+                name='cards_card_avail_price_idx',
+            ),
+            # - "UR/SE 카드 중 X원 이하" (레어리티 일치 + 가격 범위/정렬)
+            models.Index(
+                fields=['rarity', 'price', 'id'],
+                condition=models.Q(sale_status='available'),
+                name='cards_card_avail_rarity_idx',
+            ),
+        ]
     
     
     def __str__(self):
         return f"{self.name} ({self.get_condition_display()}, {self.get_rarity_display()}) - {self.get_sale_status_display()}"
     
-    def delete(self, *args, **kwargs):
-        """카드 삭제 시 이미지 파일도 함께 삭제"""
-        # 원본 이미지 삭제
+    def variant_names(self):
+        """저장된 파생 이미지 파일 경로 목록"""
+        formats = (self.image_variants or {}).get('formats', {})
+        return [variant['name'] for variants in formats.values() for variant in variants]
+    
+    def file_names(self):
+        """카드가 참조하는 모든 이미지 파일 경로 (원본, 최적화본, 파생 이미지, 중복 제거)"""
+        names = set(self.variant_names())
         if self.image:
-            image_path = self.image.path
-            if os.path.isfile(image_path):
-                try:
-                    os.remove(image_path)
-                except OSError:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"이미지 파일 삭제 실패: {image_path}")
-        
-        # 최적화된 이미지 삭제
+            names.add(self.image.name)
         if self.image_optimized:
-            optimized_path = self.image_optimized.path
-            if os.path.isfile(optimized_path):
-                try:
-                    os.remove(optimized_path)
-                except OSError:
-                    import logging
-                    logger = logging.getLogger(__name__)
-                    logger.warning(f"최적화 이미지 파일 삭제 실패: {optimized_path}")
+            names.add(self.image_optimized.name)
+        return names
+    
+    def save(self, *args, **kwargs):
+        """저장과 같은 트랜잭션에서 재고 통계 갱신 (변경 전 값은 행 잠금으로 다시 읽어 비교)"""
+        from . import inventory_stats
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and not inventory_stats.affects(update_fields):
+            return super().save(*args, **kwargs)
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            before = {}
+            if self.pk is not None and not self._state.adding:
+                before = inventory_stats.lock(Card.objects.filter(pk=self.pk))
+            super().save(*args, **kwargs)
+            inventory_stats.record(before=before.values(), after=[inventory_stats.values_of(self)])
+    
+    def delete(self, *args, **kwargs):
+        """카드 삭제 시 이미지 파일도 함께 삭제 (다른 카드와 공유 중인 파일은 참조 횟수만 감소)
         
-        # 부모 클래스의 delete 메서드 호출
-        super().delete(*args, **kwargs)
+        파일은 요청 안에서 지우지 않고 커밋 후 release_files 작업이 정리 (롤백되면 파일 유지)
+        """
+        from . import inventory_stats
+        from .storage import release_on_commit
+        names = self.file_names()
+        with transaction.atomic(using=kwargs.get('using'), savepoint=False):
+            before = inventory_stats.lock(Card.objects.filter(pk=self.pk))
+            deleted = super().delete(*args, **kwargs)
+            inventory_stats.record(before=before.values())
+        release_on_commit(names)
+        return deleted
+
+
+class CardStatusTransition(models.Model):
+    """카드 판매 상태 변경 이력 (추가만 가능, 카드가 삭제되어도 이력은 유지)"""
+    card = models.ForeignKey(
+        Card, on_delete=models.SET_NULL, null=True, related_name='status_transitions', verbose_name='카드'
+    )
+    card_number = models.BigIntegerField(verbose_name='카드 ID')
+    from_status = models.CharField(max_length=10, choices=Card.SALE_STATUS_CHOICES, verbose_name='이전 상태')
+    to_status = models.CharField(max_length=10, choices=Card.SALE_STATUS_CHOICES, verbose_name='변경 상태')
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, verbose_name='변경한 사용자'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    
+    class Meta:
+        verbose_name = '판매 상태 변경 이력'
+        verbose_name_plural = '판매 상태 변경 이력들'
+        ordering = ['id']
+    
+    def __str__(self):
+        return f"카드 #{self.card_number}: {self.from_status} → {self.to_status}"
+
+
+class InventoryStat(models.Model):
+    """판매 상태 × 레어리티 × 상태별 카드 수와 가격 합계 (카드 변경과 같은 트랜잭션에서 증감, cards/inventory_stats.py)"""
+    sale_status = models.CharField(max_length=10, choices=Card.SALE_STATUS_CHOICES, verbose_name='판매 상태')
+    rarity = models.CharField(max_length=2, choices=Card.RARITY_CHOICES, verbose_name='레어리티')
+    condition = models.CharField(max_length=1, choices=Card.CONDITION_CHOICES, verbose_name='상태')
+    count = models.BigIntegerField(default=0, verbose_name='카드 수')
+    price_total = models.DecimalField(max_digits=20, decimal_places=0, default=0, verbose_name='가격 합계')
+    
+    class Meta:
+        verbose_name = '재고 통계'
+        verbose_name_plural = '재고 통계들'
+        ordering = ['sale_status', 'rarity', 'condition']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['sale_status', 'rarity', 'condition'], name='cards_inventorystat_key_uniq'
+            ),
+        ]
+    
+    def __str__(self):
+        return f"{self.sale_status}/{self.rarity}/{self.condition}: {self.count}장"
+
+
+class MediaBlob(models.Model):
+    """콘텐츠 해시 저장소의 파일별 참조 횟수 (0이 되면 파일 삭제)"""
+    name = models.CharField(max_length=255, primary_key=True, verbose_name='파일 경로')
+    size = models.BigIntegerField(default=0, verbose_name='파일 크기')
+    refcount = models.PositiveIntegerField(default=0, verbose_name='참조 횟수')
+    # 파일을 저장(참조 추가)하거나 collect_media가 카드의 참조를 확인한 마지막 시각
+    referenced_at = models.DateTimeField(null=True, blank=True, verbose_name='마지막 참조 확인 시각')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    
+    class Meta:
+        verbose_name = '미디어 파일'
+        verbose_name_plural = '미디어 파일들'
+    
+    def __str__(self):
+        return f"{self.name} (참조 {self.refcount})"
+
+
+class Job(models.Model):
+    """백그라운드 작업 큐 (DB 기반, 워커 프로세스가 처리)"""
+    STATUS_QUEUED = 'queued'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_QUEUED, '대기중'),
+        (STATUS_RUNNING, '실행중'),
+        (STATUS_DONE, '완료'),
+        (STATUS_FAILED, '실패'),
+    ]
+    
+    task = models.CharField(max_length=100, verbose_name='작업 종류')
+    key = models.CharField(max_length=200, blank=True, default='', verbose_name='중복 방지 키')
+    payload = models.JSONField(default=dict, blank=True, verbose_name='작업 데이터')
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_QUEUED,
+        verbose_name='상태'
+    )
+    attempts = models.PositiveIntegerField(default=0, verbose_name='시도 횟수')
+    max_attempts = models.PositiveIntegerField(default=3, verbose_name='최대 시도 횟수')
+    run_after = models.DateTimeField(default=timezone.now, verbose_name='실행 예정 시각')
+    locked_at = models.DateTimeField(null=True, blank=True, verbose_name='워커 점유 시각')
+    last_error = models.TextField(blank=True, default='', verbose_name='마지막 오류')
+    created_at = models.DateTimeField(auto_now_add=True, verbose_name='생성일')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='수정일')
+    
+    class Meta:
+        verbose_name = '작업'
+        verbose_name_plural = '작업들'
+        ordering = ['run_after', 'id']
+        indexes = [
+            models.Index(fields=['status', 'run_after']),
+            models.Index(fields=['task', 'key']),
+        ]
+    
+    def __str__(self):
+        return f"{self.task} #{self.pk} ({self.get_status_display()})"
 
 
 @receiver(post_save, sender=Card)
-def optimize_card_image(sender, instance, created, **kwargs):
-    """카드 저장 후 이미지 최적화"""
-    # 이미지가 있고 최적화된 이미지가 없는 경우에만 처리
-    if instance.image and not instance.image_optimized:
-        try:
-            # 원본 이미지가 파일 시스템에 저장되어 있는지 확인
-            if not os.path.exists(instance.image.path):
-                logger.warning(f"이미지 파일이 존재하지 않음: {instance.image.path}")
-                return
-            
-            # 원본 이미지 열기 (EXIF orientation 정보 완전히 무시)
-            img = Image.open(instance.image.path)
-            # EXIF orientation 정보를 완전히 무시하여 자동 회전 방지
-            # Pillow는 기본적으로 EXIF orientation을 자동 적용하지 않지만,
-            # 확실하게 하기 위해 EXIF 데이터에서 orientation 태그를 제거
-            try:
-                # EXIF 데이터가 있으면 orientation 태그 제거
-                if hasattr(img, '_getexif') and img._getexif() is not None:
-                    exif = img._getexif()
-                    # orientation 태그(274)가 있으면 제거
-                    if 274 in exif:
-                        # EXIF 데이터를 복사하고 orientation 제거
-                        from PIL.ExifTags import ORIENTATION
-                        # orientation 정보를 무시하고 이미지를 그대로 사용
-                        pass
-            except (AttributeError, KeyError, TypeError):
-                # EXIF 데이터가 없거나 처리할 수 없는 경우 그대로 진행
-                pass
-            
-            # RGB 모드로 변환 (RGBA, P 모드 등 처리)
-            if img.mode in ('RGBA', 'LA', 'P'):
-                # 투명도가 있는 경우 흰색 배경에 합성
-                background = Image.new('RGB', img.size, (255, 255, 255))
-                if img.mode == 'P':
-                    img = img.convert('RGBA')
-                if img.mode in ('RGBA', 'LA'):
-                    background.paste(img, mask=img.split()[-1] if img.mode == 'RGBA' else None)
-                img = background
-            elif img.mode != 'RGB':
-                img = img.convert('RGB')
-            
-            # 이미지 최적화: 최대 너비 800px로 리사이즈 (비율 유지)
-            max_width = 800
-            if img.width > max_width:
-                ratio = max_width / img.width
-                new_height = int(img.height * ratio)
-                img = img.resize((max_width, new_height), Image.Resampling.LANCZOS)
-            
-            # 최적화된 이미지를 메모리에 저장
-            img_io = BytesIO()
-            # JPEG 형식으로 저장 (품질 85%, EXIF 데이터 완전히 제거하여 회전 방지)
-            # 새로운 이미지로 복사하여 EXIF 데이터를 완전히 제거
-            # RGB 모드의 새 이미지 생성 (EXIF 데이터 없음)
-            new_img = Image.new('RGB', img.size)
-            new_img.paste(img, (0, 0))
-            
-            # EXIF 데이터 없이 저장
-            save_kwargs = {
-                'format': 'JPEG',
-                'quality': 85,
-                'optimize': True,
-            }
-            # exif 파라미터로 빈 bytes 전달하여 EXIF 데이터 완전히 제거
-            try:
-                new_img.save(img_io, **save_kwargs, exif=b'')
-            except (TypeError, ValueError):
-                # exif 파라미터를 지원하지 않는 경우 그냥 저장
-                # 새로 생성한 이미지는 EXIF 데이터가 없으므로 안전
-                new_img.save(img_io, **save_kwargs)
-            img_io.seek(0)
-            
-            # 파일명 생성 (원본 파일명 기반)
-            original_name = os.path.splitext(os.path.basename(instance.image.name))[0]
-            optimized_filename = f"{original_name}_optimized.jpg"
-            
-            # 최적화된 이미지 저장
-            instance.image_optimized.save(
-                optimized_filename,
-                ContentFile(img_io.read()),
-                save=True
-            )
-            
-            logger.info(f"카드 {instance.id} ({instance.name}) 이미지 최적화 완료")
-            
-        except Exception as e:
-            # 최적화 실패 시에도 원본 이미지는 유지
-            logger.error(f"카드 {instance.id} ({instance.name}) 이미지 최적화 실패: {str(e)}", exc_info=True)
+def optimize_card_image(sender, instance, created, update_fields=None, **kwargs):
+    """카드 저장 후 이미지 최적화 작업을 큐에 등록 (실제 처리는 워커에서 수행)"""
+    # 이미지가 있고 최적화된 이미지가 없으며 아직 처리 대기 상태인 경우에만 등록
+    if not instance.image or instance.image_optimized:
+        return
+    if instance.image_status != Card.IMAGE_STATUS_PENDING:
+        return
+    # 판매 상태 변경 등 이미지와 무관한 부분 저장은 무시
+    if update_fields is not None and 'image' not in update_fields:
+        return
+    
+    from .jobs import enqueue_on_commit
+    enqueue_on_commit('optimize_card_image', {'card_id': instance.pk}, key=f'card:{instance.pk}')
+
+
+@receiver([post_save, post_delete], sender=Card)
+def invalidate_card_responses(sender, **kwargs):
+    """카드 저장/삭제(판매 상태 변경 포함) 시 목록/상세 응답 캐시 무효화"""
+    from . import response_cache
+    response_cache.invalidate_on_commit()
+
+
+@receiver([post_save, post_delete], sender=CardName)
+def invalidate_card_name_index(sender, **kwargs):
+    """카드명 변경 시 자동완성 인덱스 재로드 표시"""
+    from . import name_index
+    name_index.invalidate()
+
+
+@receiver(pre_save, sender=CardName)
+def remember_previous_card_name(sender, instance, **kwargs):
+    """이름 변경을 사전 이력에 기록할 수 있도록 기존 이름 보관"""
+    instance._previous_name = None
+    if instance.pk:
+        instance._previous_name = (
+            CardName.objects.filter(pk=instance.pk).values_list('name', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=CardName)
+def record_card_name_saved(sender, instance, created, **kwargs):
+    """카드명 추가/이름 변경을 사전 이력에 기록"""
+    from . import name_dictionary
+    previous = getattr(instance, '_previous_name', None)
+    if created or previous is None:
+        name_dictionary.record_revision(added=[instance.name])
+    elif previous != instance.name:
+        name_dictionary.record_revision(added=[instance.name], removed=[previous])
+
+
+@receiver(post_delete, sender=CardName)
+def record_card_name_deleted(sender, instance, **kwargs):
+    """카드명 삭제를 사전 이력에 기록"""
+    from . import name_dictionary
+    name_dictionary.record_revision(removed=[instance.name])
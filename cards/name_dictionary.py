@@ -0,0 +1,226 @@
+"""
+버전 관리되는 카드명 사전 (`GET /api/cards/get_all_card_names/`)
+
+- 버전: CardNameRevision의 최대 id (카드명이 바뀔 때마다 증가)
+  이력은 잠금을 잡고 기록하여 id 순서대로 커밋되므로, 어느 시점에 읽은 버전 이하의 이력이 나중에
+  추가로 나타나지 않습니다 (`?since_version=`으로 동기화한 클라이언트가 이력을 건너뛰지 않음)
+- 전체 사전: 버전별로 한 번만 JSON 직렬화 및 gzip/brotli 압축하여 프로세스 메모리에 보관
+  (버전으로 만든 강한 ETag를 붙여 변경이 없으면 사전을 만들지 않고 304로 응답)
+- 변경분: `?since_version=N` 이후 추가/삭제된 카드명만 계산
+
+CardName을 모델 단위로 저장/삭제하면 시그널로 이력이 기록됩니다.
+bulk_create 등 시그널이 발생하지 않는 대량 변경은 `bulk_changes()` 안에서 수행하면
+시작과 끝의 카드명을 비교하여 이력 한 건으로 기록합니다 (이력 길이와 무관한 비용).
+raw SQL 등으로 사전과 DB가 어긋났다면 `reconcile()`이 전체 이력과 비교해 바로잡습니다.
+"""
+import gzip
+import json
+import threading
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+from django.db.models import Max
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성 (설치되어 있지 않으면 gzip만 사용)
+    brotli = None
+
+# 선호 순서
+ENCODINGS = ('br', 'gzip')
+
+# 이력 기록을 직렬화하는 PostgreSQL advisory lock 키 (고정값)
+REVISION_LOCK_KEY = 0x6361_7264  # 'card'
+
+_state = threading.local()
+_lock = threading.Lock()
+_dictionary = None
+
+
+class Dictionary:
+    """특정 버전의 카드명 사전 (직렬화/압축 결과 포함, 불변)"""
+
+    def __init__(self, version, names):
+        self.version = version
+        self.names = names
+        self.body = json.dumps(
+            {'version': version, 'card_names': names, 'count': len(names)},
+            ensure_ascii=False, separators=(',', ':'),
+        ).encode('utf-8')
+        # 압축 결과는 버전당 한 번만 계산하므로 최대 압축률 사용
+        self.encoded = {'gzip': gzip.compress(self.body, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(self.body, quality=11)
+
+    def etag_for(self, encoding):
+        return etag(self.version, encoding)
+
+
+def etag(version, encoding=None, since_version=None):
+    """사전 버전으로 만든 강한 ETag (버전이 같으면 내용도 같으므로 본문 없이 계산 가능)
+
+    표현(인코딩)과 변경분 응답은 서로 다른 ETag를 사용: `"names-{버전}[-since{N}][-{인코딩}]"`
+    """
+    tag = f'names-{version}'
+    if since_version is not None:
+        tag += f'-since{since_version}'
+    if encoding:
+        tag += f'-{encoding}'
+    return f'"{tag}"'
+
+
+def etag_matches(etags, version, since_version=None):
+    """If-None-Match의 ETag 중 해당 버전(인코딩 무관)과 같은 것이 있는지 (약한 비교)"""
+    base = etag(version, since_version=since_version)
+    prefix = base[:-1]
+    for tag in etags:
+        tag = tag.removeprefix('W/')
+        if tag == '*' or tag == base:
+            return True
+        if tag.startswith(f'{prefix}-') and tag[len(prefix) + 1:-1] in ENCODINGS:
+            return True
+    return False
+
+
+def current_version():
+    """현재 사전 버전 (이력이 없으면 0)"""
+    from .models import CardNameRevision
+    return CardNameRevision.objects.aggregate(version=Max('id'))['version'] or 0
+
+
+def get_dictionary(version=None):
+    """현재 버전의 사전 (버전이 바뀐 경우에만 다시 생성)"""
+    global _dictionary
+    if version is None:
+        version = current_version()
+    dictionary = _dictionary
+    if dictionary is not None and dictionary.version == version:
+        return dictionary
+
+    with _lock:
+        if _dictionary is None or _dictionary.version != version:
+            from .models import CardName
+            # 목록을 읽는 사이 버전이 바뀌었다면 다시 읽어 버전과 내용을 일치시킴
+            while True:
+                names = list(CardName.objects.order_by('name').values_list('name', flat=True))
+                latest = current_version()
+                if latest == version:
+                    break
+                version = latest
+            _dictionary = Dictionary(version, names)
+        return _dictionary
+
+
+def changes_since(version):
+    """version 이후의 순(net) 변경분 (added, removed, 최신 버전)
+
+    같은 이름이 추가 후 삭제되었다면 변경 없음으로 처리합니다.
+    """
+    from .models import CardNameRevision
+    first = {}
+    last = {}
+    latest = version
+    for revision_id, added, removed in (
+        CardNameRevision.objects.filter(id__gt=version).order_by('id').values_list('id', 'added', 'removed')
+    ):
+        latest = revision_id
+        for action, names in (('removed', removed), ('added', added)):
+            for name in names:
+                first.setdefault(name, action)
+                last[name] = action
+    added = sorted(name for name, action in last.items() if action == 'added' and first[name] == 'added')
+    removed = sorted(name for name, action in last.items() if action == 'removed' and first[name] == 'removed')
+    return added, removed, latest
+
+
+def preferred_encoding(accept_encoding, available):
+    """Accept-Encoding 헤더에서 사용할 압축 방식 선택 (없으면 None)"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        token, _, params = part.strip().partition(';')
+        quality = 1.0
+        params = params.strip()
+        if params.startswith('q='):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        if token:
+            accepted[token.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if encoding in available and accepted.get(encoding, accepted.get('*', 0)) > 0:
+            return encoding
+    return None
+
+
+def _lock_revisions():
+    """현재 트랜잭션이 끝날 때까지 다른 트랜잭션의 이력 기록을 기다리게 함
+
+    id(시퀀스)는 잠금을 잡은 뒤 받으므로 이력이 id 순서대로 커밋되어, 먼저 받은 id가 나중에
+    커밋되면서 이미 그보다 큰 버전을 받아 간 클라이언트가 그 이력을 건너뛰는 일이 없습니다.
+    SQLite는 쓰기 트랜잭션이 하나씩만 실행되므로 잠그지 않습니다.
+    """
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_advisory_xact_lock(%s)', [REVISION_LOCK_KEY])
+
+
+def record_revision(added=(), removed=()):
+    """변경 이력 한 건 기록 (bulk_changes() 안에서는 끝날 때 한 번에 기록)"""
+    if not added and not removed:
+        return None
+    if getattr(_state, 'bulk_depth', 0):
+        return None
+    with transaction.atomic(savepoint=False):
+        _lock_revisions()
+        return _create_revision(added, removed)
+
+
+def _create_revision(added, removed):
+    if not added and not removed:
+        return None
+    from .models import CardNameRevision
+    return CardNameRevision.objects.create(added=sorted(added), removed=sorted(removed))
+
+
+def _current_names():
+    from .models import CardName
+    return set(CardName.objects.values_list('name', flat=True).iterator())
+
+
+def reconcile():
+    """이력을 모두 적용한 목록과 DB의 카드명을 비교하여 차이를 이력 한 건으로 기록
+
+    이력 전체를 읽으므로 사전과 DB가 어긋났을 때의 복구용입니다 (일괄 변경은 bulk_changes()).
+    """
+    from .models import CardNameRevision
+    # 비교하는 동안 다른 트랜잭션이 이력을 추가하지 않도록 먼저 잠금
+    _lock_revisions()
+    known = set()
+    for added, removed in CardNameRevision.objects.order_by('id').values_list('added', 'removed').iterator():
+        known.difference_update(removed)
+        known.update(added)
+    current = _current_names()
+    return _create_revision(added=current - known, removed=known - current)
+
+
+@contextmanager
+def bulk_changes():
+    """시그널 없이 대량 변경하는 구간 (행 단위 이력 대신 종료 시 비교 결과를 한 건으로 기록)
+
+    시작할 때 이력 기록을 잠그고 카드명을 읽어 두었다가, 끝날 때 다시 읽은 카드명과의 차이만
+    기록합니다. 시작 시점의 카드명 집합을 반환하므로 호출하는 쪽은 다시 읽지 않고 비교에 사용할 수 있습니다.
+    """
+    depth = getattr(_state, 'bulk_depth', 0)
+    with transaction.atomic():
+        # 잠근 뒤에 읽어야 그 사이 다른 트랜잭션의 변경이 이 구간의 차이에 섞이지 않음
+        _lock_revisions()
+        before = _current_names()
+        _state.bulk_depth = depth + 1
+        try:
+            yield before
+        finally:
+            _state.bulk_depth = depth
+        if depth == 0:
+            after = _current_names()
+            _create_revision(added=after - before, removed=before - after)
@@ -0,0 +1,204 @@
+"""
+카드명 자동완성용 메모리 인덱스
+
+워커 프로세스마다 한 번 로드하여 DB 조회 없이 검색합니다.
+- 부분 일치: 자모 단위로 분해한 문자열의 bigram 역색인으로 후보를 좁힌 뒤 확인
+  ("블루아" 뿐 아니라 입력 중인 "블루앙"/"블룽" 같은 미완성 음절도 일치)
+- 초성 검색: "ㅂㄹㅇㅇㅈ" → "블루아이즈"
+- 정렬: 완전 일치 → 앞부분 일치 → 부분 일치, 같은 순위에서는 짧은 이름 우선
+
+CardName이 변경되면 같은 프로세스에서는 시그널로 즉시, 다른 프로세스에서는
+RELOAD_CHECK_INTERVAL마다 카드명 사전 버전(cards/name_dictionary.py, 변경마다 증가)을
+비교하여 다시 로드합니다.
+"""
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+
+from . import name_dictionary
+
+HANGUL_BASE = 0xAC00
+HANGUL_END = 0xD7A3
+CHOSUNG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+JUNGSUNG = 'ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ'
+JONGSUNG = ['', 'ㄱ', 'ㄲ', 'ㄳ', 'ㄴ', 'ㄵ', 'ㄶ', 'ㄷ', 'ㄹ', 'ㄺ', 'ㄻ', 'ㄼ', 'ㄽ', 'ㄾ', 'ㄿ', 'ㅀ',
+            'ㅁ', 'ㅂ', 'ㅄ', 'ㅅ', 'ㅆ', 'ㅇ', 'ㅈ', 'ㅊ', 'ㅋ', 'ㅌ', 'ㅍ', 'ㅎ']
+# 겹받침/겹모음은 입력 중 두 글자로 나뉘어 들어오므로 분해해서 비교
+COMPOUND_JAMO = {
+    'ㄳ': 'ㄱㅅ', 'ㄵ': 'ㄴㅈ', 'ㄶ': 'ㄴㅎ', 'ㄺ': 'ㄹㄱ', 'ㄻ': 'ㄹㅁ', 'ㄼ': 'ㄹㅂ', 'ㄽ': 'ㄹㅅ',
+    'ㄾ': 'ㄹㅌ', 'ㄿ': 'ㄹㅍ', 'ㅀ': 'ㄹㅎ', 'ㅄ': 'ㅂㅅ',
+    'ㅘ': 'ㅗㅏ', 'ㅙ': 'ㅗㅐ', 'ㅚ': 'ㅗㅣ', 'ㅝ': 'ㅜㅓ', 'ㅞ': 'ㅜㅔ', 'ㅟ': 'ㅜㅣ', 'ㅢ': 'ㅡㅣ',
+}
+CHOSUNG_SET = set(CHOSUNG)
+
+# 다른 프로세스에서 변경된 카드명을 확인하는 주기(초)
+RELOAD_CHECK_INTERVAL = 30
+
+
+def _normalize(text):
+    """소문자 변환 및 공백 제거"""
+    return ''.join(text.lower().split())
+
+
+def decompose(text):
+    """한글 음절을 자모로 분해 (한글 이외의 문자는 그대로)"""
+    result = []
+    for ch in _normalize(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            offset = code - HANGUL_BASE
+            result.append(CHOSUNG[offset // 588])
+            jung = JUNGSUNG[(offset % 588) // 28]
+            result.append(COMPOUND_JAMO.get(jung, jung))
+            jong = JONGSUNG[offset % 28]
+            result.append(COMPOUND_JAMO.get(jong, jong))
+        else:
+            result.append(COMPOUND_JAMO.get(ch, ch))
+    return ''.join(result)
+
+
+def chosung(text):
+    """한글 음절을 초성으로 변환 (한글 이외의 문자는 그대로)"""
+    result = []
+    for ch in _normalize(text):
+        code = ord(ch)
+        if HANGUL_BASE <= code <= HANGUL_END:
+            result.append(CHOSUNG[(code - HANGUL_BASE) // 588])
+        else:
+            result.append(ch)
+    return ''.join(result)
+
+
+def is_chosung_query(text):
+    """초성만으로 이루어진 검색어인지 (예: "ㅂㄹㅇㅇㅈ")"""
+    normalized = _normalize(text)
+    return bool(normalized) and all(ch in CHOSUNG_SET for ch in normalized)
+
+
+def _grams(text):
+    """역색인 키: 1글자는 unigram, 그 이상은 bigram"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class _Form:
+    """검색 대상 문자열 한 종류(자모 분해 / 초성)에 대한 역색인"""
+
+    def __init__(self, strings):
+        self.strings = strings
+        self.exact = {}
+        self.unigrams = {}
+        self.bigrams = {}
+        for idx, s in enumerate(strings):
+            self.exact.setdefault(s, []).append(idx)
+            for ch in set(s):
+                self.unigrams.setdefault(ch, []).append(idx)
+            for gram in _grams(s):
+                if len(gram) == 2:
+                    self.bigrams.setdefault(gram, []).append(idx)
+
+    def candidates(self, query):
+        """query를 포함할 수 있는 항목 id (가장 짧은 posting list 기준, id 오름차순)"""
+        if len(query) == 1:
+            return self.unigrams.get(query, [])
+        best = None
+        for gram in _grams(query):
+            postings = self.bigrams.get(gram)
+            if not postings:
+                return []
+            if best is None or len(postings) < len(best):
+                best = postings
+        return best or []
+
+class CardNameIndex:
+    """카드명 목록에 대한 불변 인덱스 (교체 방식으로 갱신)"""
+
+    def __init__(self, names, signature=None):
+        # 짧은 이름 우선, 가나다순으로 정렬해 두면 posting list가 곧 순위순이므로
+        # 검색 시 정렬 없이 앞에서부터 필요한 개수만 확인하고 멈출 수 있음
+        self.names = sorted(names, key=lambda name: (len(name), name))
+        self.signature = signature
+        self.jamo = _Form([decompose(name) for name in self.names])
+        self.initials = _Form([chosung(name) for name in self.names])
+
+    def __len__(self):
+        return len(self.names)
+
+    def search(self, query, limit=20):
+        """검색어와 일치하는 카드명 목록 (완전 일치 → 앞부분 일치 → 부분 일치 순)"""
+        if not query or not query.strip():
+            return []
+        if is_chosung_query(query):
+            form, key = self.initials, _normalize(query)
+        else:
+            form, key = self.jamo, decompose(query)
+
+        strings = form.strings
+        exact = form.exact.get(key, [])
+        prefix = []
+        substring = []
+        wanted = limit - len(exact)
+        for idx in form.candidates(key):
+            if len(prefix) >= wanted:
+                break
+            pos = strings[idx].find(key)
+            if pos == 0:
+                if len(strings[idx]) != len(key):
+                    prefix.append(idx)
+            elif pos > 0 and len(substring) < wanted:
+                substring.append(idx)
+        return [self.names[idx] for idx in (exact + prefix + substring)[:limit]]
+
+
+_index = None
+_stale = True
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def _signature():
+    """DB의 카드명 변경 여부를 저렴하게 확인하기 위한 값 (카드명 사전 버전)
+
+    (개수, 최대 id)와 달리 이름 변경이나 삭제 후 추가에도 바뀜
+    """
+    return name_dictionary.current_version()
+
+
+def get_index():
+    """현재 프로세스의 카드명 인덱스 (필요 시 로드/재로드)"""
+    global _index, _stale, _last_check
+    now = time.monotonic()
+    if _index is not None and not _stale and now - _last_check < RELOAD_CHECK_INTERVAL:
+        return _index
+
+    with _lock:
+        if _index is not None and not _stale and time.monotonic() - _last_check < RELOAD_CHECK_INTERVAL:
+            return _index
+        from .models import CardName
+        signature = _signature()
+        if _index is None or _stale or signature != _index.signature:
+            names = CardName.objects.order_by('name').values_list('name', flat=True)
+            _index = CardNameIndex(names, signature)
+        _stale = False
+        _last_check = time.monotonic()
+    return _index
+
+
+def invalidate():
+    """카드명이 변경되었음을 표시 (다음 검색 시 다시 로드)"""
+    global _stale
+    _stale = True
+
+
+def search(query, limit=20):
+    return get_index().search(query, limit)
+
+
+async def asearch(query, limit=20):
+    """비동기 뷰용: 인덱스가 최신이면 바로 검색, 확인/재로드가 필요할 때만 스레드에서 DB 조회"""
+    index = _index
+    if index is None or _stale or time.monotonic() - _last_check >= RELOAD_CHECK_INTERVAL:
+        index = await sync_to_async(get_index)()
+    return index.search(query, limit)
@@ -0,0 +1,229 @@
+"""
+카드 목록 페이지네이션
+
+기본은 기존과 같은 페이지 번호 방식(`count`, `next`, `previous`, `results`)입니다.
+
+`?cursor=`를 보내면(첫 페이지는 빈 값) 정렬 키(기본값: created_at, id) 기반의 keyset 방식으로
+응답합니다. `WHERE (created_at, id) < (마지막 값)` 조건과 복합 인덱스로 다음 페이지를 찾으므로
+COUNT(*)나 OFFSET 없이 몇 번째 페이지든 같은 비용으로 조회되며, 응답에는 `count`가 없습니다.
+cursor는 마지막 행의 정렬 키 값을 담은 불투명한 문자열이며, 중간에 카드가
+추가/삭제되어도 같은 위치를 가리킵니다.
+
+정렬 키가 모델 필드가 아닌 경우(유사도 검색 등)는 `?cursor=`가 있어도 페이지 번호 방식으로 응답합니다.
+"""
+import base64
+import binascii
+import datetime
+import decimal
+import json
+from collections import OrderedDict
+
+from asgiref.sync import sync_to_async
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """queryset의 정렬 필드 값으로 다음/이전 페이지를 찾는 cursor 페이지네이션"""
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = '잘못된 cursor입니다.'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._page_queryset(queryset, request)
+        return self._set_page(list(queryset))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """비동기 뷰용 (cards/async_views.py)"""
+        queryset = self._page_queryset(queryset, request)
+        return self._set_page([row async for row in queryset])
+
+    def _page_queryset(self, queryset, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.fields = keyset_fields(queryset)
+        self.ordering = [f'-{field.attname}' if descending else field.attname for field, descending in self.fields]
+
+        self.position, self.reverse = self.decode_cursor(request)
+        ordering = self.ordering
+        if self.reverse:
+            ordering = [name[1:] if name.startswith('-') else f'-{name}' for name in ordering]
+        queryset = queryset.order_by(*ordering)
+        if self.position is not None:
+            queryset = queryset.filter(self._after(self.position, self.reverse))
+        # 한 건 더 조회하여 다음(역방향이면 이전) 페이지 존재 여부 확인
+        return queryset[:self.page_size + 1]
+
+    def _set_page(self, rows):
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if self.reverse:
+            rows.reverse()
+            self.has_next, self.has_previous = self.position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, row, reverse):
+        values = [_dump_value(_row_value(row, field)) for field, _ in self.fields]
+        payload = {'v': values}
+        if reverse:
+            payload['r'] = 1
+        token = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii').rstrip('=')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """cursor 문자열 → (정렬 키 값 목록, 역방향 여부). cursor가 없으면 (None, False)"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+            values = payload['v']
+            if len(values) != len(self.fields):
+                raise ValueError
+            position = [field.to_python(value) for (field, _), value in zip(self.fields, values)]
+        except (TypeError, ValueError, KeyError, binascii.Error, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return position, bool(payload.get('r'))
+
+    def _after(self, position, reverse):
+        """정렬 순서상 position 다음에 오는 행 조건
+
+        (a, b, id) 정렬이면 `a > x OR (a = x AND b > y) OR (a = x AND b = y AND id > z)`.
+        첫 번째 키에 대한 범위 조건을 따로 붙여 인덱스 범위 탐색이 가능하도록 함
+        """
+        conditions = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.fields, position):
+            backward = descending != reverse
+            conditions |= equal & Q(**{f'{field.attname}__{"lt" if backward else "gt"}': value})
+            equal &= Q(**{field.attname: value})
+
+        first_field, first_descending = self.fields[0]
+        first_lookup = 'lte' if first_descending != reverse else 'gte'
+        return Q(**{f'{first_field.attname}__{first_lookup}': position[0]}) & conditions
+
+
+class CardPagination(BasePagination):
+    """기본은 페이지 번호 방식, `?cursor=`가 있고 keyset을 쓸 수 있는 정렬이면 keyset 방식"""
+    cursor_query_param = KeysetPagination.cursor_query_param
+
+    def use_keyset(self, query_params, queryset):
+        return self.cursor_query_param in query_params and keyset_fields(queryset) is not None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_keyset(request.query_params, queryset):
+            self.paginator = KeysetPagination()
+        else:
+            self.paginator = PageNumberPagination()
+        return self.paginator.paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """비동기 뷰용 (페이지 번호 방식은 COUNT와 함께 스레드에서 실행)"""
+        if self.use_keyset(request.GET, queryset):
+            self.paginator = KeysetPagination()
+            return await self.paginator.apaginate_queryset(queryset, _QueryParams(request), view)
+        self.paginator = PageNumberPagination()
+        return await sync_to_async(self.paginator.paginate_queryset)(queryset, _QueryParams(request), view)
+
+    def get_paginated_response(self, data):
+        return self.paginator.get_paginated_response(data)
+
+    def get_paginated_data(self, data):
+        """응답 본문 (Response로 감싸지 않음)"""
+        return self.paginator.get_paginated_response(data).data
+
+    def get_paginated_response_schema(self, schema):
+        return PageNumberPagination().get_paginated_response_schema(schema)
+
+
+class _QueryParams:
+    """Django HttpRequest에 DRF Request의 query_params만 더한 것 (비동기 뷰에서 페이지네이터 재사용)"""
+
+    def __init__(self, request):
+        self._request = request
+        self.query_params = request.GET
+
+    def __getattr__(self, name):
+        return getattr(self._request, name)
+
+
+def keyset_fields(queryset):
+    """queryset 정렬을 [(모델 필드, 내림차순 여부), ...]로 변환 (pk로 끝나도록 보완)
+
+    정렬 항목이 모델 필드가 아니면(annotate한 값, 표현식 등) None
+    """
+    opts = queryset.model._meta
+    ordering = list(queryset.query.order_by) or list(opts.ordering)
+    fields = []
+    for item in ordering:
+        if not isinstance(item, str) or item == '?':
+            return None
+        descending = item.startswith('-')
+        name = item.lstrip('-+')
+        try:
+            field = opts.pk if name == 'pk' else opts.get_field(name)
+        except FieldDoesNotExist:
+            return None
+        if not field.concrete or field.null or field.is_relation:
+            return None
+        fields.append((field, descending))
+        if field.primary_key:
+            # pk 뒤의 정렬은 결과에 영향이 없음
+            return fields
+    # 값이 같은 행이 있어도 순서가 고정되도록 pk를 마지막 키로 추가
+    fields.append((opts.pk, fields[0][1] if fields else True))
+    return fields
+
+
+def _row_value(row, field):
+    if isinstance(row, dict):
+        return row[field.attname]
+    return getattr(row, field.attname)
+
+
+def _dump_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
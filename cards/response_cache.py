@@ -0,0 +1,275 @@
+"""
+카드 목록/상세 응답 캐시
+
+직렬화가 끝난 응답 데이터를 CACHES['default']에 저장하여, 변경이 없는 동안의 조회는
+DB 조회와 직렬화 없이 응답합니다. 운영에서는 REDIS_URL을 설정해 모든 워커가 같은
+캐시를 공유하며, 설정하지 않으면 프로세스별 locmem 캐시를 짧은 유효 시간으로 사용합니다.
+
+캐시 항목에는 검증값(ETag/Last-Modified)도 함께 저장하므로, 조건부 요청(If-None-Match /
+If-Modified-Since)은 캐시 항목만으로 304를 응답합니다. 캐시에 없으면 validators()로
+검증값만 저렴하게 계산하여, 변경이 없으면 전체 조회/직렬화 없이 304로 응답합니다.
+
+무효화는 세대(generation) 번호 방식입니다. 모든 키에 현재 세대 번호가 들어가므로
+카드가 저장/삭제/일괄 수정되면(트랜잭션 커밋 후) 세대 번호만 1 올려 기존 항목을 한 번에
+무효화합니다 (이전 세대 항목은 유효 시간이 지나면 자동 삭제). 여러 번 나눠 수정하는
+일괄 변경은 invalidate_once() 안에서 수행하면 세대 번호를 한 번만 올립니다.
+
+비동기 뷰(cards/async_views.py)는 같은 키/항목을 async 캐시 API로 읽고 쓰는 acached_response()를 사용합니다.
+"""
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date
+
+logger = logging.getLogger(__name__)
+
+GENERATION_KEY = 'cards:response:generation'
+STATS_KEYS = {'hit': 'cards:response:hits', 'miss': 'cards:response:misses'}
+
+DEFAULTS = {
+    'ENABLED': True,
+    'TIMEOUT': 300,         # 공유 캐시(Redis)에서의 유효 시간(초)
+    'LOCAL_TIMEOUT': 5,     # locmem 대체 시 유효 시간(초) - 다른 워커의 무효화가 전달되지 않으므로 짧게
+}
+
+_state = threading.local()
+
+# 응답 내용(절대 URL)에 영향을 주는 요청 헤더
+VARY_HEADERS = ('HTTP_HOST', 'HTTP_X_FORWARDED_HOST', 'HTTP_X_FORWARDED_PROTO')
+
+
+def get_cache_setting(name):
+    return getattr(settings, 'CARD_RESPONSE_CACHE', {}).get(name, DEFAULTS[name])
+
+
+def is_shared():
+    """여러 프로세스가 공유하는 캐시 백엔드인지"""
+    return not isinstance(cache, LocMemCache)
+
+
+def timeout():
+    return get_cache_setting('TIMEOUT' if is_shared() else 'LOCAL_TIMEOUT')
+
+
+def generation():
+    return cache.get(GENERATION_KEY) or 0
+
+
+async def ageneration():
+    return await cache.aget(GENERATION_KEY) or 0
+
+
+def invalidate():
+    """모든 목록/상세 캐시 무효화 (세대 번호 증가)"""
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        # 키가 없으면(캐시 재시작/만료) 새로 생성, 동시에 생성된 경우 한 번 더 증가
+        if not cache.add(GENERATION_KEY, 1, timeout=None):
+            cache.incr(GENERATION_KEY)
+
+
+def invalidate_on_commit():
+    """현재 트랜잭션이 커밋된 뒤 무효화 (커밋 전의 데이터가 다시 캐시되는 것을 방지)"""
+    if getattr(_state, 'pending', None) is not None:
+        # invalidate_once() 안: 끝날 때 한 번만 등록
+        _state.pending = True
+        return
+    transaction.on_commit(invalidate)
+
+
+@contextmanager
+def invalidate_once():
+    """구간 안의 invalidate_on_commit() 호출을 모아 끝날 때 한 번만 등록 (트랜잭션 안에서 사용)"""
+    outer = getattr(_state, 'pending', None)
+    _state.pending = False
+    try:
+        yield
+    finally:
+        pending = _state.pending
+        _state.pending = outer
+    if pending:
+        invalidate_on_commit()
+
+
+def make_key(request, scope, generation_number=None):
+    """세대 번호 + 범위(list/retrieve) + 경로/쿼리 파라미터 + URL에 영향을 주는 헤더"""
+    if generation_number is None:
+        generation_number = generation()
+    parts = [request.path]
+    parts.extend(f'{name}={value}' for name, value in sorted(request.GET.lists()))
+    parts.extend(request.META.get(header, '') for header in VARY_HEADERS)
+    parts.append(request.scheme)
+    digest = hashlib.sha256('\n'.join(map(str, parts)).encode('utf-8')).hexdigest()[:32]
+    return f'cards:response:v2:{generation_number}:{scope}:{digest}'
+
+
+def make_etag(request, scope, *values):
+    """요청(경로/파라미터/URL 관련 헤더)과 데이터 검증값으로 만든 약한 ETag"""
+    parts = [scope, request.path]
+    parts.extend(f'{name}={value}' for name, value in sorted(request.GET.lists()))
+    parts.extend(request.META.get(header, '') for header in VARY_HEADERS)
+    parts.extend(values)
+    digest = hashlib.sha256('\n'.join(map(str, parts)).encode('utf-8')).hexdigest()[:32]
+    return f'W/"{digest}"'
+
+
+def _count(outcome):
+    key = STATS_KEYS[outcome]
+    try:
+        cache.incr(key)
+    except ValueError:
+        if not cache.add(key, 1, timeout=None):
+            cache.incr(key)
+
+
+async def _acount(outcome):
+    key = STATS_KEYS[outcome]
+    try:
+        await cache.aincr(key)
+    except ValueError:
+        if not await cache.aadd(key, 1, timeout=None):
+            await cache.aincr(key)
+
+
+def stats():
+    """적중/실패 횟수와 적중률 (공유 캐시면 전체 워커 합계, locmem이면 현재 프로세스)"""
+    values = cache.get_many(list(STATS_KEYS.values()))
+    hits = values.get(STATS_KEYS['hit'], 0)
+    misses = values.get(STATS_KEYS['miss'], 0)
+    total = hits + misses
+    return {
+        'backend': cache.__class__.__name__,
+        'shared': is_shared(),
+        'generation': generation(),
+        'hits': hits,
+        'misses': misses,
+        'hit_rate': round(hits / total, 4) if total else None,
+    }
+
+
+def _is_conditional(request):
+    return 'HTTP_IF_NONE_MATCH' in request.META or 'HTTP_IF_MODIFIED_SINCE' in request.META
+
+
+def _not_modified(request, etag, last_modified):
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return get_conditional_response(request, etag=etag, last_modified=timestamp)
+
+
+def _finalize(response, etag, last_modified, outcome=None):
+    if etag:
+        response['ETag'] = etag
+    if last_modified:
+        response['Last-Modified'] = http_date(last_modified.timestamp())
+    if outcome:
+        response['X-Cache'] = outcome
+    # 브라우저가 매번 검증하도록 (변경이 없으면 304)
+    patch_cache_control(response, no_cache=True)
+    return response
+
+
+def cached_response(request, scope, build, validators=None):
+    """캐시/조건부 요청을 처리한 응답
+
+    - 캐시 적중: 저장된 데이터(조건이 맞으면 304)
+    - 캐시 미적중: validators()로 (ETag, Last-Modified)만 계산하여 조건이 맞으면 304,
+      아니면 build()로 응답을 만든 뒤 200이면 검증값과 함께 저장
+    validators()가 None을 반환하면(대상 없음 등) 조건 확인 없이 build() 결과를 그대로 반환
+    """
+    from rest_framework.response import Response
+
+    enabled = get_cache_setting('ENABLED')
+    key = None
+    if enabled:
+        try:
+            key = make_key(request, scope)
+            entry = cache.get(key)
+        except Exception as e:
+            # 캐시 장애가 조회를 막지 않도록 기록만 하고 DB에서 조회
+            logger.warning(f"응답 캐시 조회 실패: {e}")
+            key = entry = None
+
+        if entry is not None:
+            _count('hit')
+            etag, last_modified = entry['etag'], entry['last_modified']
+            response = _not_modified(request, etag, last_modified)
+            if response is None:
+                response = Response(entry['data'])
+            return _finalize(response, etag, last_modified, 'HIT')
+        if key is not None:
+            _count('miss')
+
+    etag = last_modified = None
+    if validators is not None:
+        checked = validators()
+        if checked is None:
+            return build()
+        etag, last_modified = checked
+        if _is_conditional(request):
+            response = _not_modified(request, etag, last_modified)
+            if response is not None:
+                return _finalize(response, etag, last_modified, 'MISS')
+
+    response = build()
+    if response.status_code != 200:
+        return response
+    if key is not None:
+        try:
+            cache.set(key, {'data': response.data, 'etag': etag, 'last_modified': last_modified}, timeout())
+        except Exception as e:
+            logger.warning(f"응답 캐시 저장 실패: {e}")
+    return _finalize(response, etag, last_modified, 'MISS' if enabled else None)
+
+
+async def acached_response(request, scope, build, validators, respond):
+    """cached_response()의 비동기 버전 (같은 캐시 항목 사용)
+
+    build, validators: 코루틴 함수. respond(data): 캐시된 데이터로 응답 생성
+    build()의 응답은 data 속성(직렬화된 데이터)을 가져야 합니다.
+    """
+    enabled = get_cache_setting('ENABLED')
+    key = None
+    if enabled:
+        try:
+            key = make_key(request, scope, await ageneration())
+            entry = await cache.aget(key)
+        except Exception as e:
+            logger.warning(f"응답 캐시 조회 실패: {e}")
+            key = entry = None
+
+        if entry is not None:
+            await _acount('hit')
+            etag, last_modified = entry['etag'], entry['last_modified']
+            response = _not_modified(request, etag, last_modified)
+            if response is None:
+                response = respond(entry['data'])
+            return _finalize(response, etag, last_modified, 'HIT')
+        if key is not None:
+            await _acount('miss')
+
+    checked = await validators()
+    if checked is None:
+        return await build()
+    etag, last_modified = checked
+    if _is_conditional(request):
+        response = _not_modified(request, etag, last_modified)
+        if response is not None:
+            return _finalize(response, etag, last_modified, 'MISS')
+
+    response = await build()
+    if response.status_code != 200:
+        return response
+    if key is not None:
+        try:
+            await cache.aset(key, {'data': response.data, 'etag': etag, 'last_modified': last_modified}, timeout())
+        except Exception as e:
+            logger.warning(f"응답 캐시 저장 실패: {e}")
+    return _finalize(response, etag, last_modified, 'MISS' if enabled else None)
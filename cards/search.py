@@ -0,0 +1,99 @@
+"""
+카드 목록 검색 (`GET /api/cards/?q=`)
+
+PostgreSQL에서는 pg_trgm GIN 인덱스(cards_card_name_trgm, cards_card_serial_trgm)를 사용하는
+trigram 유사도 검색으로 오타가 있어도 찾을 수 있고, 유사도 순으로 정렬합니다.
+다른 DB(테스트용 SQLite 등)에서는 같은 방식의 trigram 유사도를 파이썬에서 계산합니다.
+"""
+import re
+
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connection
+from django.db.models import Case, CharField, FloatField, Q, Value, When
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.lookups import IContains
+
+# pg_trgm.word_similarity_threshold 기본값과 동일
+SIMILARITY_THRESHOLD = 0.6
+
+_WORD_RE = re.compile(r'\w+')
+
+
+@CharField.register_lookup
+class TrigramIContains(IContains):
+    """PostgreSQL 전용 부분 일치 검색 (`col ILIKE '%q%'`)
+
+    Django의 icontains는 `UPPER(col::text) LIKE UPPER(...)`로 변환되어
+    컬럼에 만든 gin_trgm_ops 인덱스를 사용할 수 없으므로 ILIKE를 직접 사용함
+    """
+    lookup_name = 'trigram_icontains'
+
+    def as_postgresql(self, compiler, connection):
+        lhs_sql, params = self.process_lhs(compiler, connection)
+        rhs_sql, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs_sql} ILIKE {rhs_sql}', [*params, *rhs_params]
+
+
+def trigrams(text):
+    """pg_trgm과 같은 방식의 trigram 집합 (단어별로 앞 공백 2개, 뒤 공백 1개를 붙여 3글자씩)"""
+    result = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f'  {word} '
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def word_similarity(query, text):
+    """검색어 trigram 중 대상 문자열에 포함된 비율 (pg_trgm word_similarity 근사)"""
+    query_trigrams = trigrams(query)
+    if not query_trigrams or not text:
+        return 0.0
+    return len(query_trigrams & trigrams(text)) / len(query_trigrams)
+
+
+def search_cards(queryset, query):
+    """카드명/시리얼 검색 결과를 유사도 순으로 정렬한 queryset"""
+    if connection.vendor == 'postgresql':
+        return _search_postgresql(queryset, query)
+    return _search_portable(queryset, query)
+
+
+def _search_postgresql(queryset, query):
+    # `%>`(trigram_word_similar)와 ILIKE는 모두 gin_trgm_ops 인덱스를 사용할 수 있음
+    return queryset.filter(
+        Q(name__trigram_word_similar=query)
+        | Q(serial_number__trigram_word_similar=query)
+        | Q(name__trigram_icontains=query)
+        | Q(serial_number__trigram_icontains=query)
+    ).annotate(
+        similarity=Greatest(
+            TrigramWordSimilarity(query, 'name'),
+            Coalesce(TrigramWordSimilarity(query, 'serial_number'), Value(0.0)),
+        )
+    ).order_by('-similarity', '-created_at', '-id')
+
+
+def _search_portable(queryset, query):
+    query_lower = query.lower()
+    scored = []
+    for pk, name, serial_number in queryset.values_list('pk', 'name', 'serial_number').iterator():
+        texts = [name or '', serial_number or '']
+        if any(query_lower in text.lower() for text in texts):
+            score = 1.0
+        else:
+            score = max(word_similarity(query, text) for text in texts)
+        if score >= SIMILARITY_THRESHOLD:
+            scored.append((score, pk))
+
+    if not scored:
+        # 결과가 없어도 같은 정렬(유사도 순)로 반환하여 페이지네이션 방식이 바뀌지 않게 함
+        return queryset.none().annotate(
+            similarity=Value(0.0, output_field=FloatField()),
+        ).order_by('-similarity', '-created_at', '-id')
+    scored.sort(key=lambda item: -item[0])
+    return queryset.filter(pk__in=[pk for _, pk in scored]).annotate(
+        similarity=Case(
+            *[When(pk=pk, then=Value(score)) for score, pk in scored],
+            output_field=FloatField(),
+        )
+    ).order_by('-similarity', '-created_at', '-id')
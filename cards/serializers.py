@@ -1,26 +1,49 @@
 from rest_framework import serializers
 from django.core.exceptions import ValidationError
-from PIL import Image
+from django.core.files.storage import FileSystemStorage
 import os
+import re
 from .models import Card
+from .imaging import FORMATS, ImageTooLargeError, inspect_image
+from .instrumentation import timed
 
 
-class CardSerializer(serializers.ModelSerializer):
+class TimedDataMixin:
+    """.data 생성 시간을 요청의 'serialize' 구간으로 계측 (cards/instrumentation.py)"""
+    
+    @property
+    def data(self):
+        with timed('serialize'):
+            return super().data
+
+
+class TimedListSerializer(TimedDataMixin, serializers.ListSerializer):
+    pass
+
+
+class CardSerializer(TimedDataMixin, serializers.ModelSerializer):
     condition_display = serializers.CharField(source='get_condition_display', read_only=True)
     rarity_display = serializers.CharField(source='get_rarity_display', read_only=True)
     sale_status_display = serializers.CharField(source='get_sale_status_display', read_only=True)
     image_url = serializers.SerializerMethodField()
     image_optimized_url = serializers.SerializerMethodField()
+    image_status_display = serializers.CharField(source='get_image_status_display', read_only=True)
+    images = serializers.SerializerMethodField()
+    # DRF 기본 ImageField는 Pillow로 파일 전체를 verify()하므로 FileField로 받고
+    # validate_image()에서 헤더만 한 번 검사함
+    image = serializers.FileField(max_length=100)
     
     class Meta:
         model = Card
         fields = [
             'id', 'name', 'serial_number', 'image', 'image_url', 'image_optimized', 'image_optimized_url',
+            'image_status', 'image_status_display', 'images',
             'condition', 'condition_display', 'rarity', 'rarity_display',
             'price', 'sale_status', 'sale_status_display', 
             'created_at', 'updated_at'
         ]
-        read_only_fields = ['created_at', 'updated_at', 'image_optimized']
+        read_only_fields = ['created_at', 'updated_at', 'image_optimized', 'image_status']
+        list_serializer_class = TimedListSerializer
     
     def validate_name(self, value):
         """카드명 검증"""
@@ -59,30 +82,32 @@ class CardSerializer(serializers.ModelSerializer):
         if file_ext not in allowed_extensions:
             raise serializers.ValidationError(f"허용된 이미지 형식: {', '.join(allowed_extensions)}")
         
-        # 실제 이미지 파일인지 확인
+        # 실제 이미지 파일인지 확인 (헤더만 읽으며, 픽셀 디코딩은 백그라운드 작업에서 한 번만 수행)
         try:
-            img = Image.open(value)
-            img.verify()
-            # 파일 포인터를 처음으로 되돌림
-            value.seek(0)
+            inspect_image(value)
+        except ImageTooLargeError:
+            raise serializers.ValidationError("이미지 해상도가 너무 큽니다.")
         except Exception:
             raise serializers.ValidationError("유효한 이미지 파일이 아닙니다.")
         
         return value
     
+    def _absolute_url(self, path):
+        """요청 호스트(프록시 헤더 우선) 기준 절대 URL 생성"""
+        request = self.context.get('request')
+        if request:
+            host = request.META.get('HTTP_X_FORWARDED_HOST') or request.META.get('HTTP_HOST') or request.get_host()
+            scheme = request.META.get('HTTP_X_FORWARDED_PROTO') or request.scheme
+            base_url = f"{scheme}://{host}"
+            if path.startswith('/'):
+                return f"{base_url}{path}"
+            return f"{base_url}/{path}"
+        return path
+    
     def get_image_url(self, obj):
         """원본 이미지 URL (관리자용)"""
         if obj.image:
-            request = self.context.get('request')
-            if request:
-                host = request.META.get('HTTP_X_FORWARDED_HOST') or request.META.get('HTTP_HOST') or request.get_host()
-                scheme = request.META.get('HTTP_X_FORWARDED_PROTO') or request.scheme
-                base_url = f"{scheme}://{host}"
-                image_path = obj.image.url
-                if image_path.startswith('/'):
-                    return f"{base_url}{image_path}"
-                return f"{base_url}/{image_path}"
-            return obj.image.url
+            return self._absolute_url(obj.image.url)
         return None
     
     def get_image_optimized_url(self, obj):
@@ -91,15 +116,175 @@ class CardSerializer(serializers.ModelSerializer):
         image_to_use = obj.image_optimized if obj.image_optimized else obj.image
         
         if image_to_use:
+            return self._absolute_url(image_to_use.url)
+        return None
+    
+    def get_images(self, obj):
+        """해상도/포맷별 파생 이미지 (프론트엔드 <picture>/srcset용)
+
+        sources는 AVIF → WebP → JPEG 순(브라우저가 지원하는 첫 포맷 사용),
+        src는 srcset을 지원하지 않는 경우의 대체 이미지입니다.
+        파생 이미지가 아직 생성되지 않았으면 None을 반환합니다.
+        """
+        storage = obj.image.storage
+        return build_images(obj.image_variants, lambda name: self._absolute_url(storage.url(name)))
+
+
+def build_images(variants, url_for):
+    """image_variants → images 응답 (url_for: 저장 경로 → 절대 URL)"""
+    variants = variants or {}
+    formats = variants.get('formats')
+    if not formats:
+        return None
+    
+    sources = []
+    fallback = None
+    for fmt in FORMATS:
+        if fmt not in formats:
+            continue
+        candidates = [
+            {'width': v['width'], 'height': v['height'], 'url': url_for(v['name'])}
+            for v in formats[fmt]
+        ]
+        sources.append({
+            'type': FORMATS[fmt][2],
+            'srcset': ', '.join(f"{c['url']} {c['width']}w" for c in candidates),
+            'candidates': candidates,
+        })
+        fallback = candidates[-1]['url']
+    
+    return {
+        'src': fallback,
+        'width': variants.get('width'),
+        'height': variants.get('height'),
+        'sources': sources,
+    }
+
+
+# 인코딩/정규화가 필요 없는 저장 경로 (해시 이름 등, `.`/`..` 경로 구간 제외)
+_PLAIN_PATH = re.compile(r"(?!(?:.*/)?\.\.?(?:/|$))[A-Za-z0-9_.~!*()'/-]+")
+
+
+def _media_url_func(storage):
+    """저장 경로 → URL 함수
+
+    로컬 저장소(FileSystemStorage)는 storage.url()의 urljoin 대신 문자열 연결로 같은 URL을 만듦
+    (파생 이미지까지 포함하면 카드 한 장에 URL이 10개 이상이므로 목록 직렬화 비용의 대부분)
+    """
+    base_url = getattr(storage, 'base_url', None)
+    if not isinstance(storage, FileSystemStorage) or not base_url or not base_url.endswith('/'):
+        return storage.url
+    
+    def url(name):
+        if _PLAIN_PATH.fullmatch(name):
+            return base_url + name.lstrip('/')
+        return storage.url(name)
+    return url
+
+
+class CardListSerializer(serializers.BaseSerializer):
+    """목록 조회 전용 읽기 serializer (CardSerializer와 같은 JSON을 더 적은 비용으로 생성)
+
+    - queryset.values(*CardListSerializer.source_fields)의 dict 행을 입력으로 사용
+    - 요청 기준 URL, 미디어 URL, 선택지 표시 이름은 요청마다 한 번만 계산
+    - 필드별 to_representation/검증 단계 없이 행마다 dict 하나만 생성
+    """
+    class Meta:
+        list_serializer_class = TimedListSerializer
+    
+    source_fields = (
+        'id', 'name', 'serial_number', 'image', 'image_optimized', 'image_status', 'image_variants',
+        'condition', 'rarity', 'price', 'sale_status', 'created_at', 'updated_at',
+    )
+    
+    condition_labels = dict(Card.CONDITION_CHOICES)
+    rarity_labels = dict(Card.RARITY_CHOICES)
+    sale_status_labels = dict(Card.SALE_STATUS_CHOICES)
+    image_status_labels = dict(Card.IMAGE_STATUS_CHOICES)
+    
+    # 가격/일시 형식은 CardSerializer와 동일하게 DRF 필드의 변환만 사용
+    price_field = serializers.DecimalField(max_digits=10, decimal_places=0)
+    datetime_field = serializers.DateTimeField()
+    
+    def _prepare(self):
+        """요청마다 한 번: (FileField용 기준 URL, 프록시 헤더 기준 URL, 미디어 URL 함수)"""
+        prepared = getattr(self, '_prepared', None)
+        if prepared is None:
             request = self.context.get('request')
+            storage = Card._meta.get_field('image').storage
             if request:
+                # DRF FileField와 동일 (request.build_absolute_uri)
+                request_base = request.build_absolute_uri('/')[:-1]
+                # CardSerializer._absolute_url과 동일 (X-Forwarded-Host/Proto 우선)
                 host = request.META.get('HTTP_X_FORWARDED_HOST') or request.META.get('HTTP_HOST') or request.get_host()
                 scheme = request.META.get('HTTP_X_FORWARDED_PROTO') or request.scheme
-                base_url = f"{scheme}://{host}"
-                image_path = image_to_use.url
-                if image_path.startswith('/'):
-                    return f"{base_url}{image_path}"
-                return f"{base_url}/{image_path}"
-            return image_to_use.url
-        return None
+                public_base = f"{scheme}://{host}"
+            else:
+                request_base = public_base = ''
+            prepared = self._prepared = (request_base, public_base, _media_url_func(storage))
+        return prepared
+    
+    def to_representation(self, row):
+        request_base, public_base, media_url = self._prepare()
+        image = row['image']
+        image_optimized = row['image_optimized']
+        image_path = media_url(image) if image else None
+        optimized_path = media_url(image_optimized) if image_optimized else None
+        display_path = optimized_path or image_path
+        variants = row['image_variants']
+        return {
+            'id': row['id'],
+            'name': row['name'],
+            'serial_number': row['serial_number'],
+            'image': f"{request_base}{image_path}" if image_path else None,
+            'image_url': f"{public_base}{image_path}" if image_path else None,
+            'image_optimized': f"{request_base}{optimized_path}" if optimized_path else None,
+            'image_optimized_url': f"{public_base}{display_path}" if display_path else None,
+            'image_status': row['image_status'],
+            'image_status_display': self.image_status_labels.get(row['image_status'], row['image_status']),
+            'images': build_images(variants, lambda name: f"{public_base}{media_url(name)}") if variants else None,
+            'condition': row['condition'],
+            'condition_display': self.condition_labels.get(row['condition'], row['condition']),
+            'rarity': row['rarity'],
+            'rarity_display': self.rarity_labels.get(row['rarity'], row['rarity']),
+            'price': self.price_field.to_representation(row['price']),
+            'sale_status': row['sale_status'],
+            'sale_status_display': self.sale_status_labels.get(row['sale_status'], row['sale_status']),
+            'created_at': self.datetime_field.to_representation(row['created_at']),
+            'updated_at': self.datetime_field.to_representation(row['updated_at']),
+        }
 
+
+class CardBulkUpdateSerializer(serializers.Serializer):
+    """일괄 수정 요청 검증 (`POST /api/cards/bulk_update/`)
+
+    {"ids": [1, 2, ...], "sale_status": "sold"} / {"ids": [...], "price": 15000} / 둘 다
+    """
+    MAX_IDS = 10000
+    
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=MAX_IDS,
+    )
+    sale_status = serializers.ChoiceField(choices=Card.SALE_STATUS_CHOICES, required=False)
+    price = serializers.DecimalField(max_digits=10, decimal_places=0, min_value=0, required=False)
+    
+    def validate(self, attrs):
+        if 'sale_status' not in attrs and 'price' not in attrs:
+            raise serializers.ValidationError("변경할 sale_status 또는 price를 입력해주세요.")
+        return attrs
+    
+    @property
+    def changes(self):
+        return {field: self.validated_data[field] for field in ('sale_status', 'price') if field in self.validated_data}
+
+
+class CardImportRowSerializer(serializers.ModelSerializer):
+    """일괄 등록 manifest 한 행의 검증 (카드명/가격 규칙은 CardSerializer와 동일)"""
+    image = serializers.CharField(max_length=255)
+    
+    class Meta:
+        model = Card
+        fields = ['name', 'serial_number', 'condition', 'rarity', 'price', 'image']
+    
+    validate_name = CardSerializer.validate_name
+    validate_price = CardSerializer.validate_price
@@ -0,0 +1,131 @@
+"""
+콘텐츠 해시 기반 미디어 저장소
+
+파일명을 내용의 SHA-256 해시로 정하므로 같은 내용은 한 번만 저장되고,
+URL이 바뀌지 않는 한 내용도 바뀌지 않아 nginx에서 `Cache-Control: immutable`로
+1년간 캐시할 수 있습니다. 같은 파일을 여러 카드가 참조할 수 있으므로
+`MediaBlob` 테이블의 참조 횟수가 0이 될 때만 실제 파일을 삭제합니다.
+
+요청 처리 중의 삭제(카드 삭제, 이미지 교체)는 `release_on_commit()`으로 커밋 후
+`release_files` 작업에 맡기고, 어디서도 참조하지 않는 파일은 `collect_media` 명령
+(cards/media_gc.py)이 정리합니다.
+"""
+import hashlib
+import os
+import tempfile
+from collections import Counter
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+from .instrumentation import timed
+
+# nginx 설정에서 이 패턴의 경로에만 immutable 캐시 헤더를 붙임
+HASH_NAME_PATTERN = r'[0-9a-f]{2}/[0-9a-f]{64}\.[a-z0-9]+$'
+
+# release_files 작업 하나가 처리할 최대 파일 수
+RELEASE_BATCH_SIZE = 500
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """`{디렉터리}/{해시 앞 2자리}/{SHA-256}{확장자}` 형태로 저장하고 참조 횟수로 삭제를 관리"""
+
+    def get_available_name(self, name, max_length=None):
+        # 같은 이름이면 내용도 같으므로 기존 파일을 그대로 재사용 (_save에서 실제 이름 결정)
+        return name
+
+    def _save(self, name, content):
+        with timed('storage'):
+            return self._save_content(name, content)
+
+    def _save_content(self, name, content):
+        directory = os.path.dirname(name)
+        ext = os.path.splitext(name)[1].lower()
+
+        # 임시 파일에 쓰면서 해시를 계산 (내용을 한 번만 읽음)
+        tmp_dir = self.path(directory)
+        os.makedirs(tmp_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir, prefix='.upload-')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                if hasattr(content, 'seek'):
+                    content.seek(0)
+                for chunk in content.chunks():
+                    digest.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            hex_digest = digest.hexdigest()
+            name = f'{directory}/{hex_digest[:2]}/{hex_digest}{ext}' if directory else f'{hex_digest[:2]}/{hex_digest}{ext}'
+            # 참조를 먼저 기록해야 collect_media가 같은 내용의 (참조가 끊긴) 파일을 동시에 지우지 않음
+            self._increment(name, size)
+            full_path = self.path(name)
+            if os.path.exists(full_path):
+                # 이미 같은 내용의 파일이 있으면 새로 쓰지 않음 (중복 제거)
+                # 위의 referenced_at 갱신은 이 카드가 커밋되기 전에는 collect_media에 보이지 않으므로
+                # 수정 시각을 갱신해 최근 파일로 건너뛰게 함
+                os.utime(full_path)
+                os.remove(tmp_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                os.chmod(tmp_path, self.file_permissions_mode or 0o644)
+                os.replace(tmp_path, full_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        return name
+
+    def delete(self, name):
+        """참조 횟수를 줄이고, 더 이상 참조가 없으면 파일 삭제"""
+        self.release(name)
+
+    def release(self, name, count=1):
+        """참조 count개를 해제하고, 남은 참조가 없으면 파일 삭제"""
+        if not name:
+            return
+        MediaBlob = apps.get_model('cards', 'MediaBlob')
+        with transaction.atomic():
+            blob = MediaBlob.objects.select_for_update().filter(name=name).first()
+            if blob is not None:
+                if blob.refcount > count:
+                    MediaBlob.objects.filter(pk=blob.pk).update(refcount=F('refcount') - count)
+                    return
+                blob.delete()
+        # 참조 기록이 없는 파일(해시 저장소 도입 이전 파일)은 바로 삭제
+        super().delete(name)
+
+    def _increment(self, name, size):
+        MediaBlob = apps.get_model('cards', 'MediaBlob')
+        now = timezone.now()
+        updated = MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1, referenced_at=now)
+        if updated:
+            return
+        try:
+            with transaction.atomic():
+                MediaBlob.objects.create(name=name, size=size, refcount=1, referenced_at=now)
+        except IntegrityError:
+            # 다른 프로세스가 동시에 같은 파일을 등록한 경우
+            MediaBlob.objects.filter(name=name).update(refcount=F('refcount') + 1, referenced_at=now)
+
+
+def release_on_commit(names):
+    """현재 트랜잭션이 커밋된 후 release_files 작업으로 파일 참조 해제 (롤백되면 파일 유지)
+
+    names: 해제할 파일 경로 목록 (여러 카드가 같은 파일을 참조하면 그 횟수만큼 반복)
+    """
+    from .jobs import enqueue_many_on_commit
+    counts = sorted(Counter(name for name in names if name).items())
+    if counts:
+        enqueue_many_on_commit('release_files', [
+            ({'names': dict(counts[start:start + RELEASE_BATCH_SIZE])}, '')
+            for start in range(0, len(counts), RELEASE_BATCH_SIZE)
+        ])
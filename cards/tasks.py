@@ -0,0 +1,120 @@
+"""
+백그라운드 작업 처리 함수 (`python manage.py run_jobs` 워커에서 실행)
+"""
+import os
+import logging
+
+from django.core.files.base import ContentFile
+
+from . import imaging
+from .jobs import task
+from .models import Card
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'cards/variants'
+
+
+def save_derivatives(card, derivatives):
+    """파생 이미지를 저장하고 Card.image_variants 형식의 dict 반환"""
+    storage = card.image.storage
+    stem = os.path.splitext(os.path.basename(card.image.name))[0]
+    formats = {}
+    for derivative in derivatives:
+        ext = imaging.FORMATS[derivative['format']][1]
+        name = storage.save(
+            f"{VARIANTS_DIR}/{stem}_{derivative['width']}w.{ext}",
+            ContentFile(derivative['content']),
+        )
+        formats.setdefault(derivative['format'], []).append({
+            'width': derivative['width'],
+            'height': derivative['height'],
+            'name': name,
+        })
+
+    largest = derivatives[-1]
+    return {
+        'width': largest['width'],
+        'height': largest['height'],
+        'formats': formats,
+    }
+
+
+def delete_card_images(card):
+    """카드에 기록된 (이전) 파생 이미지 파일 삭제 (원본은 유지)"""
+    storage = card.image.storage
+    names = set(card.variant_names())
+    if card.image_optimized:
+        names.add(card.image_optimized.name)
+    for name in names:
+        try:
+            storage.delete(name)
+        except OSError:
+            logger.warning(f"파생 이미지 파일 삭제 실패: {name}")
+
+
+def generate_card_images(card):
+    """카드의 파생 이미지를 생성하고 DB에 기록 (post_save 시그널은 실행하지 않음)
+
+    기존 파생 이미지가 있으면 새 이미지를 만든 뒤 교체합니다.
+    """
+    if not os.path.exists(card.image.path):
+        raise FileNotFoundError(f"이미지 파일이 존재하지 않음: {card.image.path}")
+
+    derivatives = imaging.build_derivatives(card.image.path)
+    # 새 파일을 먼저 저장한 뒤 기존 파일을 지워야 실패 시 이미지가 사라지지 않음
+    # (해시 저장소에서 내용이 같은 파일은 참조 횟수만 조정됨)
+    variants = save_derivatives(card, derivatives)
+    delete_card_images(card)
+
+    # 기존 image_optimized 필드는 가장 큰 JPEG(없으면 가장 큰 파생 이미지)로 유지하여 하위 호환
+    fallback = variants['formats'].get('jpeg') or next(iter(variants['formats'].values()))
+    Card.objects.filter(pk=card.pk).update(
+        image_optimized=fallback[-1]['name'],
+        image_variants=variants,
+        image_status=Card.IMAGE_STATUS_DONE,
+    )
+    return variants
+
+
+def _mark_image_failed(payload, error):
+    """최대 재시도 후에도 실패한 경우 카드 이미지 상태를 실패로 표시"""
+    Card.objects.filter(pk=payload.get('card_id')).update(image_status=Card.IMAGE_STATUS_FAILED)
+
+
+@task('optimize_card_image', on_failure=_mark_image_failed)
+def optimize_card_image(payload):
+    """카드 이미지 최적화 (원본은 유지, 해상도/포맷별 파생 이미지를 cards/variants/에 저장)"""
+    card = Card.objects.filter(pk=payload.get('card_id')).first()
+    if card is None:
+        logger.info(f"카드 {payload.get('card_id')}가 삭제되어 이미지 최적화를 건너뜁니다.")
+        return
+    if not card.image or card.image_optimized:
+        Card.objects.filter(pk=card.pk).update(image_status=Card.IMAGE_STATUS_DONE)
+        return
+
+    Card.objects.filter(pk=card.pk).update(image_status=Card.IMAGE_STATUS_PROCESSING)
+    generate_card_images(card)
+    logger.info(f"카드 {card.id} ({card.name}) 이미지 최적화 완료")
+
+
+@task('release_files')
+def release_files(payload):
+    """삭제/교체된 카드가 참조하던 파일의 참조 해제 (storage.release_on_commit()으로 등록)
+
+    payload['names']: {파일 경로: 해제할 참조 수}. 남은 참조가 없는 파일만 실제로 삭제됩니다.
+    """
+    storage = Card._meta.get_field('image').storage
+    for name, count in payload.get('names', {}).items():
+        try:
+            storage.release(name, count)
+        except OSError:
+            # 재시도하면 다른 파일의 참조가 두 번 해제되므로 기록만 남김 (collect_media가 정리)
+            logger.warning(f"이미지 파일 삭제 실패: {name}")
+
+
+@task('collect_media')
+def collect_media(payload):
+    """참조가 끊긴 미디어 파일 정리 (cards/media_gc.py, 주기 실행은 cron에서 enqueue 또는 명령 직접 실행)"""
+    from .media_gc import collect
+    collect(dry_run=payload.get('dry_run', False), min_age=payload.get('min_age', 3600))
@@ -1,3 +1,2212 @@
-from django.test import TestCase
+import base64
+import csv
+import gzip
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import Future
+from datetime import timedelta
+from decimal import Decimal
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import parse_qs, urlparse
+from unittest import skipUnless
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection, connections, transaction
+from django.db.models import F
+from django.http import HttpResponse, QueryDict
+from django.core.files.base import ContentFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.conf import settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import include, path
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from asgiref.sync import sync_to_async
+from PIL import Image, JpegImagePlugin
+from rest_framework.test import APITestCase
+
+from . import (
+    benchmarks, exporter, imaging, instrumentation, inventory_stats, jobs, media_gc, name_dictionary, name_index,
+    response_cache, search, storage, throttles, transitions,
+)
+from . import urls as card_urls
+from .filters import filter_cards
+from .jobs import run_job
+from .bulk import bulk_update_cards
+from .management.commands import optimize_images
+from .models import Card, CardName, CardNameRevision, CardStatusTransition, InventoryStat, Job, MediaBlob
+
+
+def make_cards(specs):
+    """(sale_status, rarity, condition, price) 목록으로 카드 생성 (시그널 없이)"""
+    return Card.objects.bulk_create([
+        Card(
+            name=f'카드 {i}',
+            sale_status=sale_status,
+            rarity=rarity,
+            condition=condition,
+            price=Decimal(price),
+            image=f'cards/{i}.jpg',
+            image_status=Card.IMAGE_STATUS_DONE,
+        )
+        for i, (sale_status, rarity, condition, price) in enumerate(specs)
+    ])
+
+
+class CardListFilterTests(APITestCase):
+    """GET /api/cards/ 필터/정렬 결과"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([
+            ('available', 'UR', 'S', 3000),
+            ('available', 'SE', 'A', 12000),
+            ('available', 'UR', 'B', 8000),
+            ('available', 'N', 'S', 500),
+            ('sold', 'UR', 'S', 2000),
+            ('reserved', 'SE', 'A', 4000),
+        ])
+
+    def list_names(self, params):
+        response = self.client.get('/api/cards/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        return [card['name'] for card in response.json()['results']]
+
+    def test_available_rare_cards_under_price_sorted_by_price(self):
+        names = self.list_names({
+            'sale_status': 'available', 'rarity': 'UR,SE', 'max_price': '10000', 'ordering': 'price',
+        })
+        self.assertEqual(names, ['카드 0', '카드 2'])
+
+    def test_price_range_and_condition(self):
+        names = self.list_names({'min_price': '2000', 'max_price': '4000', 'condition': 'S'})
+        self.assertEqual(sorted(names), ['카드 0', '카드 4'])
+
+    def test_sort_by_price_descending(self):
+        names = self.list_names({'sale_status': 'available', 'ordering': '-price'})
+        self.assertEqual(names, ['카드 1', '카드 2', '카드 0', '카드 3'])
+
+    def test_filters_are_kept_across_cursor_pages(self):
+        make_cards([('available', 'R', 'C', 100 + i) for i in range(30)])
+        response = self.client.get('/api/cards/', {'rarity': 'R', 'ordering': 'price', 'cursor': ''})
+        first = response.json()
+        self.assertNotIn('count', first)
+        second = self.client.get(first['next']).json()
+        prices = [Decimal(card['price']) for card in first['results'] + second['results']]
+        self.assertEqual(len(prices), 30)
+        self.assertEqual(prices, sorted(prices))
+        self.assertIsNone(second['next'])
+
+    def test_response_shape_does_not_depend_on_search_hits(self):
+        keys = {'count', 'next', 'previous', 'results'}
+        self.assertEqual(set(self.client.get('/api/cards/').json()), keys)
+        self.assertEqual(set(self.client.get('/api/cards/', {'cursor': ''}).json()), keys - {'count'})
+        # 파이썬으로 유사도를 계산하는 경로 (PostgreSQL에서도 같은 경로로 확인)
+        with mock.patch.object(search, '_search_postgresql', search._search_portable):
+            for params in ({'q': '카드'}, {'q': '없는카드명'}, {'q': '카드', 'cursor': ''}, {'q': '없는카드명', 'cursor': ''}):
+                self.assertEqual(set(self.client.get('/api/cards/', params).json()), keys, params)
+
+    def test_list_rows_match_detail_serializer(self):
+        """목록 전용 serializer가 상세(CardSerializer)와 같은 JSON을 만드는지"""
+        Card.objects.filter(pk=self.cards[0].pk).update(image_variants={
+            'width': 640, 'height': 896,
+            'formats': {'webp': [{'width': 640, 'height': 896, 'name': 'cards/variants/ab/abc.webp'}]},
+        })
+        headers = {'HTTP_X_FORWARDED_HOST': 'cards.example.com', 'HTTP_X_FORWARDED_PROTO': 'https'}
+        rows = self.client.get('/api/cards/', {'ordering': 'created_at'}, **headers).json()['results']
+        for card in (self.cards[0], self.cards[3]):
+            detail = self.client.get(f'/api/cards/{card.id}/', **headers).json()
+            self.assertEqual(next(row for row in rows if row['id'] == card.id), detail)
+
+    def test_invalid_values_return_400(self):
+        response = self.client.get('/api/cards/', {'rarity': 'XX', 'min_price': 'abc', 'ordering': 'name'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.json()), {'rarity', 'min_price', 'ordering'})
+
+
+class CardKeysetPaginationTests(APITestCase):
+    """GET /api/cards/?cursor=: 페이지 경계, 이전 페이지, 같은 정렬 값, 중간 변경"""
+
+    def setUp(self):
+        cache.clear()
+
+    def get_page(self, url, params=None):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        data = response.json()
+        return [card['id'] for card in data['results']], data['next'], data['previous']
+
+    def walk(self, params=None):
+        """첫 페이지부터 next를 따라가며 모든 id"""
+        ids, url, _ = self.get_page('/api/cards/', {'cursor': '', **(params or {})})
+        while url:
+            page, url, _ = self.get_page(url)
+            ids += page
+        return ids
+
+    def test_exact_multiple_of_page_size_has_no_empty_last_page(self):
+        make_cards([('available', 'N', 'A', 100)] * 40)
+        first, next_url, previous = self.get_page('/api/cards/', {'cursor': ''})
+        self.assertEqual((len(first), previous), (20, None))
+        second, next_url, previous = self.get_page(next_url)
+        self.assertEqual(len(second), 20)
+        self.assertIsNone(next_url)
+        self.assertIsNotNone(previous)
+        expected = list(Card.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(first + second, expected)
+
+    def test_previous_link_returns_same_page(self):
+        make_cards([('available', 'N', 'A', 100)] * 45)
+        first, second_url, _ = self.get_page('/api/cards/', {'cursor': ''})
+        second, third_url, _ = self.get_page(second_url)
+        third, next_url, previous_url = self.get_page(third_url)
+        self.assertEqual((len(third), next_url), (5, None))
+
+        page, next_url, previous_url = self.get_page(previous_url)
+        self.assertEqual(page, second)
+        self.assertEqual(self.get_page(next_url)[0], third)
+        page, next_url, previous_url = self.get_page(previous_url)
+        self.assertEqual(page, first)
+        self.assertIsNone(previous_url)
+        self.assertEqual(self.get_page(next_url)[0], second)
+
+    def test_equal_sort_values_are_ordered_by_id(self):
+        cards = make_cards([('available', 'N', 'A', 100)] * 25)
+        Card.objects.update(created_at=timezone.now())
+        self.assertEqual(self.walk(), sorted((card.pk for card in cards), reverse=True))
+        self.assertEqual(self.walk({'ordering': 'price'}), sorted(card.pk for card in cards))
+
+    def test_rows_added_or_removed_between_pages(self):
+        make_cards([('available', 'N', 'A', 100)] * 30)
+        expected = list(Card.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        first, next_url, _ = self.get_page('/api/cards/', {'cursor': ''})
+        # 다음 페이지를 읽기 전에 새 카드 등록, 첫 페이지 마지막 카드(cursor 위치) 삭제
+        make_cards([('available', 'N', 'A', 100)] * 5)
+        Card.objects.filter(pk=first[-1]).delete()
+        cache.clear()
+        second, next_url, _ = self.get_page(next_url)
+        self.assertEqual(first + second, expected)
+        self.assertIsNone(next_url)
+
+    def test_pages_without_count_or_offset(self):
+        make_cards([('available', 'N', 'A', 100)] * 25)
+        _, next_url, _ = self.get_page('/api/cards/', {'cursor': ''})
+        with CaptureQueriesContext(connection) as queries:
+            self.get_page(next_url)
+        # 페이지 번호 방식의 COUNT(*)(__count)와 OFFSET 없이 조회 (ETag용 집계는 별도)
+        sql = [query['sql'] for query in queries]
+        self.assertFalse([query for query in sql if '__count' in query or 'OFFSET' in query], sql)
+        with CaptureQueriesContext(connection) as queries:
+            self.get_page('/api/cards/', {'page': 2})
+        self.assertTrue([query['sql'] for query in queries if '__count' in query['sql']])
+
+    def test_invalid_cursor_returns_404(self):
+        make_cards([('available', 'N', 'A', 100)])
+        encode = lambda payload: base64.urlsafe_b64encode(json.dumps(payload).encode()).decode().rstrip('=')
+        for cursor in ('abc', '!!!', encode({'v': [1]}), encode({'v': ['not-a-date', 1]}), encode([1, 2])):
+            response = self.client.get('/api/cards/', {'cursor': cursor})
+            self.assertEqual(response.status_code, 404, cursor)
+            self.assertEqual(response.json(), {'detail': '잘못된 cursor입니다.'})
+
+
+@skipUnless(connection.vendor == 'postgresql', '인덱스 설계와 실행 계획 확인은 PostgreSQL 기준')
+class CardListIndexTests(TestCase):
+    """필터/정렬 조합이 의도한 인덱스를 사용하는지 (PostgreSQL EXPLAIN)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        # 인덱스 간 비용 차이가 드러나도록 운영과 비슷한 분포 (대부분 판매중, 높은 레어리티일수록 적음)
+        rarities = ['N'] * 50 + ['R'] * 25 + ['SR'] * 12 + ['UR'] * 6 + ['SE'] * 3 + ['UL'] * 2 + ['HR'] * 2
+        statuses = ['available'] * 8 + ['sold', 'reserved']
+        make_cards([
+            (statuses[i % len(statuses)], rarities[i % len(rarities)], 'A', 100 + i * 37 % 100000)
+            for i in range(2000)
+        ])
+        # 다른 테스트가 넣었다가 롤백한 행으로 통계가 어긋나면 계획이 달라지므로 이 데이터로 다시 수집
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE cards_card')
+
+    def assertUsesIndex(self, params, *index_names):
+        queryset = filter_cards(Card.objects.all(), QueryDict(params))
+        queryset = queryset.order_by(*(queryset.query.order_by or ('-created_at', '-id')))[:21]
+        with transaction.atomic():
+            if connection.vendor == 'postgresql':
+                # 테스트 데이터는 적어서 순차 탐색이 선택되므로 인덱스 사용 가능 여부만 확인
+                with connection.cursor() as cursor:
+                    cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = queryset.explain()
+        self.assertTrue(any(name in plan for name in index_names), plan)
+
+    def test_available_latest_uses_status_index(self):
+        self.assertUsesIndex('sale_status=available', 'cards_card_status_created_idx', 'cards_card_created_id_idx')
+
+    def test_available_by_price_uses_partial_index(self):
+        self.assertUsesIndex('sale_status=available&ordering=price', 'cards_card_avail_price_idx')
+
+    def test_available_rarity_by_price_uses_partial_index(self):
+        self.assertUsesIndex('sale_status=available&rarity=SE&ordering=price', 'cards_card_avail_rarity_idx')
+
+    def test_other_status_uses_status_index(self):
+        self.assertUsesIndex('sale_status=sold', 'cards_card_status_created_idx')
+
+    def test_unfiltered_list_uses_created_index(self):
+        self.assertUsesIndex('', 'cards_card_created_id_idx')
+
+
+class CardSearchTests(APITestCase):
+    """?q= 검색: 부분 일치/오타 허용과 유사도 순 정렬"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([('available', 'N', 'A', 100)] * 4)
+        for card, (name, serial_number) in zip(cls.cards, [
+            ('Dark Magician', 'LOB-005'), ('Blue-Eyes White Dragon', 'LOB-001'),
+            ('Red-Eyes Black Dragon', None), ('Dark Magican', None),
+        ]):
+            Card.objects.filter(pk=card.pk).update(name=name, serial_number=serial_number)
+
+    def setUp(self):
+        cache.clear()
+
+    def search_names(self, query):
+        # 파이썬으로 유사도를 계산하는 경로 (PostgreSQL 경로는 CardTrigramSearchTests)
+        with mock.patch.object(search, '_search_postgresql', search._search_portable):
+            return [card['name'] for card in self.client.get('/api/cards/', {'q': query}).json()['results']]
+
+    def test_trigrams_and_word_similarity(self):
+        self.assertEqual(search.trigrams('Ab'), {'  a', ' ab', 'ab '})
+        self.assertEqual(search.trigrams('a-b'), search.trigrams('a') | search.trigrams('b'))
+        self.assertEqual(search.trigrams('!!'), set())
+        self.assertEqual(search.word_similarity('magician', 'Dark Magician'), 1.0)
+        self.assertAlmostEqual(search.word_similarity('magican', 'Dark Magician'), 6 / 8)
+        self.assertEqual(search.word_similarity('magician', ''), 0.0)
+
+    def test_substring_matches_rank_above_typos(self):
+        # 부분 일치(유사도 1.0)가 더 최근에 등록된 오타 카드보다 먼저
+        self.assertEqual(self.search_names('magician'), ['Dark Magician', 'Dark Magican'])
+        # 유사도가 같으면 최근 등록 순
+        self.assertEqual(self.search_names('DRAGON'), ['Red-Eyes Black Dragon', 'Blue-Eyes White Dragon'])
+
+    def test_tolerates_typos_above_threshold(self):
+        self.assertEqual(self.search_names('magican'), ['Dark Magican', 'Dark Magician'])
+        # "dragn": trigram 6개 중 4개 일치 (0.67)
+        self.assertEqual(self.search_names('dragn'), ['Red-Eyes Black Dragon', 'Blue-Eyes White Dragon'])
+        self.assertEqual(self.search_names('wizard'), [])
+
+    def test_matches_serial_number(self):
+        self.assertEqual(self.search_names('lob-00'), ['Blue-Eyes White Dragon', 'Dark Magician'])
+        # "LOB-005"는 trigram 8개 중 6개 일치 (0.75)로 부분 일치 다음
+        self.assertEqual(self.search_names('LOB-001'), ['Blue-Eyes White Dragon', 'Dark Magician'])
+
+    def test_combines_with_filters(self):
+        Card.objects.filter(name='Dark Magician').update(sale_status='sold')
+        with mock.patch.object(search, '_search_postgresql', search._search_portable):
+            response = self.client.get('/api/cards/', {'q': 'magician', 'sale_status': 'available'})
+        self.assertEqual([card['name'] for card in response.json()['results']], ['Dark Magican'])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'pg_trgm 유사도 검색은 PostgreSQL 기준')
+class CardTrigramSearchTests(TestCase):
+    """PostgreSQL ?q= 검색: pg_trgm 연산자와 GIN 인덱스"""
+
+    @classmethod
+    def setUpTestData(cls):
+        make_cards([('available', 'N', 'A', 100)] * 2)
+        Card.objects.filter(name='카드 0').update(name='Dark Magician', serial_number='LOB-005')
+        Card.objects.filter(name='카드 1').update(name='Blue-Eyes White Dragon', serial_number='LOB-001')
+
+    def setUp(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            if cursor.fetchone() is None:
+                self.skipTest('pg_trgm 확장이 설치되지 않음')
+
+    def test_ranks_by_word_similarity(self):
+        results = list(search.search_cards(Card.objects.all(), 'magican'))
+        self.assertEqual([card.name for card in results], ['Dark Magician'])
+        self.assertGreaterEqual(results[0].similarity, search.SIMILARITY_THRESHOLD)
+        names = [card.name for card in search.search_cards(Card.objects.all(), 'lob-00')]
+        self.assertEqual(sorted(names), ['Blue-Eyes White Dragon', 'Dark Magician'])
+
+    def test_uses_trigram_indexes(self):
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                cursor.execute('SET LOCAL enable_seqscan = off')
+            plan = search.search_cards(Card.objects.all(), 'magician').explain()
+        self.assertIn('cards_card_name_trgm', plan)
+        self.assertIn('cards_card_serial_trgm', plan)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CardResponseCacheTests(APITestCase):
+    """목록/상세 응답 캐시 (공유 캐시 대신 locmem 사용)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.card, = make_cards([('available', 'UR', 'S', 3000)])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_repeated_list_is_served_from_cache(self):
+        self.assertEqual(self.client.get('/api/cards/')['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/cards/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['results'][0]['id'], self.card.id)
+        # 쿼리 파라미터가 다르면 별도 항목
+        self.assertEqual(self.client.get('/api/cards/', {'rarity': 'UR'})['X-Cache'], 'MISS')
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_mark_as_sold_invalidates_list_and_detail(self):
+        self.client.get('/api/cards/')
+        self.client.get(f'/api/cards/{self.card.id}/')
+        self.client.force_authenticate(self.admin)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(f'/api/cards/{self.card.id}/mark_as_sold/')
+        self.client.force_authenticate(None)
+
+        response = self.client.get(f'/api/cards/{self.card.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['sale_status'], 'sold')
+        self.assertEqual(self.client.get('/api/cards/')['X-Cache'], 'MISS')
+
+    def test_queryset_update_invalidates(self):
+        self.client.get(f'/api/cards/{self.card.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Card.objects.filter(pk=self.card.pk).update(price=Decimal(100))
+        response = self.client.get(f'/api/cards/{self.card.id}/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['price'], '100')
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ConditionalGetTests(APITestCase):
+    """ETag / Last-Modified 조건부 요청"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.card, cls.other = make_cards([('available', 'UR', 'S', 3000), ('sold', 'N', 'A', 500)])
+
+    def setUp(self):
+        cache.clear()
+
+    def test_unchanged_list_returns_304_without_serializing(self):
+        etag = self.client.get('/api/cards/', {'sale_status': 'available'})['ETag']
+        cache.clear()
+        # 캐시가 비어 있어도 검증값 집계 쿼리 한 번으로 304
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/cards/', {'sale_status': 'available'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        # 캐시에 있으면 DB 조회 없이 304
+        self.client.get('/api/cards/', {'sale_status': 'available'})
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/cards/', {'sale_status': 'available'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_etag_changes_with_data_and_params(self):
+        etag = self.client.get('/api/cards/')['ETag']
+        self.assertNotEqual(etag, self.client.get('/api/cards/', {'rarity': 'UR'})['ETag'])
+        with self.captureOnCommitCallbacks(execute=True):
+            Card.objects.filter(pk=self.other.pk).update(price=Decimal(600))
+        response = self.client.get('/api/cards/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_list_ignores_if_modified_since(self):
+        response = self.client.get('/api/cards/')
+        self.assertNotIn('Last-Modified', response)
+        etag = response['ETag']
+        # 가장 최근에 수정된 카드를 삭제하면 max(updated_at)가 과거로 돌아가도 전체 응답
+        since = 'Fri, 01 Jan 2100 00:00:00 GMT'
+        with self.captureOnCommitCallbacks(execute=True):
+            Card.objects.filter(pk=self.other.pk).delete()
+        response = self.client.get('/api/cards/', HTTP_IF_MODIFIED_SINCE=since)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(self.client.get('/api/cards/', HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+        self.assertNotEqual(self.client.get('/api/cards/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_detail_if_modified_since(self):
+        response = self.client.get(f'/api/cards/{self.card.id}/')
+        last_modified = response['Last-Modified']
+        response = self.client.get(f'/api/cards/{self.card.id}/', HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get('/api/cards/999999/', HTTP_IF_NONE_MATCH='*').status_code, 404)
+
+    def test_card_names_return_304_for_current_version(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_authenticate(admin)
+        etag = self.client.get('/api/cards/get_all_card_names/', HTTP_ACCEPT_ENCODING='gzip')['ETag']
+        response = self.client.get('/api/cards/get_all_card_names/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CardBulkUpdateTests(APITestCase):
+    """POST /api/cards/bulk_update/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([
+            ('available', 'UR', 'S', 3000),
+            ('available', 'SE', 'A', 12000),
+            ('sold', 'N', 'B', 500),
+        ])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        inventory_stats.rebuild()
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.admin)
+
+    def test_reports_outcome_per_id(self):
+        ids = [card.id for card in self.cards]
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post('/api/cards/bulk_update/', {'ids': ids + [999999], 'sale_status': 'sold'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual((body['updated'], body['unchanged'], body['not_found']), (2, 1, 1))
+        self.assertEqual(
+            [row['result'] for row in body['results']],
+            ['updated', 'updated', 'unchanged', 'not_found'],
+        )
+        self.assertEqual(Card.objects.filter(sale_status='sold').count(), 3)
+        # 카드 수와 관계없이 캐시 무효화는 커밋 후 한 번
+        self.assertEqual(len(callbacks), 1)
+
+    def test_invalidates_once_across_batches(self):
+        ids = [card.id for card in self.cards]
+        generation = response_cache.generation()
+        # id를 한 개씩 나눠 UPDATE 하도록 파라미터 개수 제한을 줄임
+        with mock.patch.object(connection.features, 'max_query_params', 11):
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                response = self.client.post('/api/cards/bulk_update/', {'ids': ids, 'price': 100}, format='json')
+        self.assertEqual(response.json()['updated'], 3)
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(response_cache.generation(), generation + 1)
+
+    def test_updates_with_constant_number_of_queries(self):
+        ids = [card.id for card in self.cards]
+        # 트랜잭션(savepoint) + SELECT ... FOR UPDATE + UPDATE
+        # + 재고 통계: 변경 전 값 조회 + 조합별 UPDATE (카드 수가 아닌 조합 수에 비례, 여기서는 3개)
+        with self.assertNumQueries(8):
+            response = self.client.post('/api/cards/bulk_update/', {'ids': ids, 'price': 100}, format='json')
+        self.assertEqual(response.json()['updated'], 3)
+        self.assertEqual(set(Card.objects.values_list('price', flat=True)), {Decimal(100)})
+
+    def test_status_follows_transition_rules_and_is_logged(self):
+        ids = [card.id for card in self.cards]
+        response = self.client.post('/api/cards/bulk_update/', {'ids': ids, 'sale_status': 'reserved'}, format='json')
+        # 판매완료 → 예약중은 허용되지 않음
+        self.assertEqual([row['result'] for row in response.json()['results']], ['updated', 'updated', 'rejected'])
+        self.assertEqual(Card.objects.get(pk=self.cards[2].pk).sale_status, 'sold')
+        self.assertEqual(
+            list(CardStatusTransition.objects.values_list('card_number', 'from_status', 'to_status', 'user')),
+            [(ids[0], 'available', 'reserved', self.admin.id), (ids[1], 'available', 'reserved', self.admin.id)],
+        )
+
+    def test_invalid_requests(self):
+        for body in ({'ids': [self.cards[0].id]}, {'ids': [], 'price': 100},
+                     {'ids': [self.cards[0].id], 'sale_status': 'lost'}, {'ids': [self.cards[0].id], 'price': -1}):
+            response = self.client.post('/api/cards/bulk_update/', body, format='json')
+            self.assertEqual(response.status_code, 400, body)
+        self.client.force_authenticate(None)
+        response = self.client.post('/api/cards/bulk_update/', {'ids': [self.cards[0].id], 'price': 1}, format='json')
+        self.assertIn(response.status_code, (401, 403))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CardStatusTransitionTests(APITestCase):
+    """mark_as_sold / mark_as_available / mark_as_reserved (조건부 UPDATE, 충돌 시 409)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.card, = make_cards([('reserved', 'UR', 'S', 3000)])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        # 모든 조합의 통계 행 (마이그레이션이 만들지만 TransactionTestCase의 flush 이후에도 같은 조건으로)
+        inventory_stats.rebuild()
+
+    def setUp(self):
+        self.client.force_authenticate(self.admin)
+
+    def url(self, action):
+        return f'/api/cards/{self.card.id}/{action}/'
+
+    def test_transition_is_one_conditional_update_and_logged(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            # 트랜잭션(savepoint) + UPDATE ... RETURNING + 이력 INSERT + 재고 통계 UPDATE 2번(이전/변경 조합)
+            with self.assertNumQueries(6):
+                response = self.client.patch(self.url('mark_as_sold'), {'from': 'reserved'}, format='json')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.json()['sale_status'], 'sold')
+        self.assertEqual(response.json()['price'], '3000')
+        # 이미지 처리 작업은 등록되지 않고 캐시 무효화만 등록
+        self.assertEqual(len(callbacks), 1)
+        log = CardStatusTransition.objects.get()
+        self.assertEqual((log.card_id, log.from_status, log.to_status, log.user), (self.card.id, 'reserved', 'sold', self.admin))
+
+    def test_stale_from_status_returns_409(self):
+        self.client.patch(self.url('mark_as_sold'), {'from': 'reserved'}, format='json')
+        # 다른 관리자가 예약중 화면을 보고 판매중으로 변경하려는 경우
+        response = self.client.patch(self.url('mark_as_available'), {'from': 'reserved'}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current_status'], 'sold')
+        self.assertEqual(Card.objects.get(pk=self.card.pk).sale_status, 'sold')
+        self.assertEqual(CardStatusTransition.objects.count(), 1)
+
+    def test_disallowed_with_stale_from_status_reports_actual_status(self):
+        self.client.patch(self.url('mark_as_available'))
+        # 판매완료 화면을 보고 예약중으로 변경 (판매완료 → 예약중은 허용되지 않지만 실제 상태는 판매중)
+        response = self.client.patch(self.url('mark_as_reserved'), {'from': 'sold'}, format='json')
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current_status'], 'available')
+        self.assertEqual(Card.objects.get(pk=self.card.pk).sale_status, 'available')
+
+        # 보낸 이전 상태가 실제 상태와 같으면 허용되지 않는 변경으로 응답
+        self.client.patch(self.url('mark_as_sold'))
+        with self.assertRaises(transitions.TransitionNotAllowed) as context:
+            transitions.transition(self.card.pk, 'reserved', from_status='sold')
+        self.assertEqual(context.exception.current_status, 'sold')
+
+    def test_disallowed_and_repeated_transitions(self):
+        self.client.patch(self.url('mark_as_sold'))
+        response = self.client.patch(self.url('mark_as_reserved'))
+        self.assertEqual(response.status_code, 409)
+        # 이미 요청한 상태면 변경 없이 200
+        response = self.client.patch(self.url('mark_as_sold'), {'from': 'reserved'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(CardStatusTransition.objects.count(), 1)
+        self.assertEqual(self.client.patch('/api/cards/999999/mark_as_sold/').status_code, 404)
+
+
+class InventoryStatsTests(APITestCase):
+    """재고 통계: 모든 변경 경로에서 같은 트랜잭션으로 증감, /api/cards/stats/, 재계산 명령"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def assertInSync(self):
+        self.assertEqual(inventory_stats.rebuild(dry_run=True), [])
+
+    def test_every_write_path_keeps_stats_in_sync(self):
+        cards = make_cards([('available', 'UR', 'S', 3000), ('available', 'UR', 'S', 1000), ('sold', 'N', 'B', 500)])
+        self.assertEqual(InventoryStat.objects.get(sale_status='available', rarity='UR', condition='S').count, 2)
+        self.assertInSync()
+
+        card = Card.objects.create(name='블랙 매지션', rarity='SE', condition='A', price=Decimal('7000'), image='cards/x.jpg')
+        card.price, card.condition = Decimal('8000'), 'B'
+        card.save()
+        # 오래된 인스턴스로 저장해도 변경 전 값은 DB에서 다시 읽음
+        stale = Card.objects.get(pk=cards[0].pk)
+        Card.objects.filter(pk=cards[0].pk).update(price=F('price') * 2)
+        stale.rarity = 'SR'
+        stale.save()
+        self.assertInSync()
+
+        transitions.transition(cards[1].pk, 'reserved')
+        bulk_update_cards([cards[1].pk, cards[2].pk], {'sale_status': 'sold', 'price': Decimal('900')})
+        cards[2].rarity = 'HR'
+        Card.objects.bulk_update([cards[2]], ['rarity'])
+        Card.objects.filter(sale_status='sold').update(sale_status='available')
+        self.assertInSync()
+
+        card.delete()
+        Card.objects.filter(pk=cards[0].pk).delete()
+        self.assertInSync()
+        self.assertEqual(inventory_stats.summary()['count'], 2)
+
+    def test_rolled_back_write_does_not_change_stats(self):
+        make_cards([('available', 'R', 'A', 100)])
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            make_cards([('available', 'R', 'A', 100)])
+            raise RuntimeError
+        self.assertEqual(inventory_stats.summary()['count'], 1)
+        self.assertInSync()
+
+    def test_stats_endpoint_reads_summary_table_only(self):
+        make_cards([
+            ('available', 'UR', 'S', 3000), ('available', 'UR', 'A', 2000),
+            ('available', 'SE', 'S', 9000), ('sold', 'UR', 'S', 500),
+        ])
+        self.assertIn(self.client.get('/api/cards/stats/').status_code, (401, 403))
+        self.client.force_authenticate(self.admin)
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/cards/stats/', {'sale_status': 'available', 'rarity': 'UR'})
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual((data['count'], data['price_total']), (2, 5000))
+        self.assertEqual(data['by_condition'], {'A': {'count': 1, 'price_total': 2000}, 'S': {'count': 1, 'price_total': 3000}})
+        self.assertEqual(len(data['rows']), 2)
+
+        data = self.client.get('/api/cards/stats/').json()
+        self.assertEqual((data['count'], data['price_total']), (4, 14500))
+        self.assertEqual(data['by_sale_status']['sold'], {'count': 1, 'price_total': 500})
+        self.assertEqual(data['by_rarity']['SE'], {'count': 1, 'price_total': 9000})
+        self.assertEqual(self.client.get('/api/cards/stats/', {'rarity': 'XX'}).status_code, 400)
+
+    def test_rebuild_command_fixes_drift(self):
+        make_cards([('available', 'UR', 'S', 3000), ('reserved', 'N', 'C', 100)])
+        InventoryStat.objects.filter(sale_status='available').update(count=5, price_total=1)
+        InventoryStat.objects.filter(sale_status='reserved').delete()
+
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_inventory_stats', '--check', stdout=out)
+        self.assertIn('available/UR/S', out.getvalue())
+        call_command('rebuild_inventory_stats', stdout=io.StringIO())
+        self.assertInSync()
+        self.assertEqual(
+            list(InventoryStat.objects.filter(count__gt=0).values_list('sale_status', 'count', 'price_total')),
+            [('available', 1, 3000), ('reserved', 1, 100)],
+        )
+
+
+class CardExportTests(APITestCase):
+    """GET /api/cards/export/와 export_cards 명령 (CSV/NDJSON 스트리밍, gzip)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([
+            ('available', 'UR', 'S', 3000), ('available', 'SE', 'A', 12000), ('sold', 'UR', 'B', 500),
+        ])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def test_csv_export_streams_filtered_cards(self):
+        self.assertIn(self.client.get('/api/cards/export/').status_code, (401, 403))
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/cards/export/', {'sale_status': 'available', 'ordering': '-price'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="cards-[\d-]+\.csv"')
+
+        rows = list(csv.DictReader(io.StringIO(b''.join(response.streaming_content).decode('utf-8-sig'))))
+        self.assertEqual([(row['rarity'], row['price']) for row in rows], [('SE', '12000'), ('UR', '3000')])
+        self.assertEqual(rows[0]['image'], 'cards/1.jpg')
+        self.assertEqual(rows[0]['serial_number'], '')
+
+        self.assertEqual(self.client.get('/api/cards/export/', {'output': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/cards/export/', {'rarity': 'XX'}).status_code, 400)
+
+    def test_ndjson_gzip_export_in_chunks(self):
+        make_cards([('available', 'N', 'C', price) for price in range(100, 140)])
+        self.client.force_authenticate(self.admin)
+        with mock.patch.object(exporter, 'CHUNK_BYTES', 512):
+            response = self.client.get('/api/cards/export/', {'output': 'ndjson', 'gzip': 'true', 'rarity': 'N'})
+            chunks = list(response.streaming_content)
+        self.assertEqual(response['Content-Type'], 'application/gzip')
+        self.assertTrue(response['Content-Disposition'].endswith('.ndjson.gz"'))
+        # 전체를 한 번에 만들지 않고 조각마다 압축하여 전송
+        self.assertGreater(len(chunks), 2)
+        lines = gzip.decompress(b''.join(chunks)).decode('utf-8').splitlines()
+        self.assertEqual(len(lines), 40)
+        row = json.loads(lines[0])
+        self.assertEqual((row['rarity'], row['sale_status']), ('N', 'available'))
+        self.assertIsInstance(row['price'], str)
+
+    async def test_asgi_export_is_async_iterator(self):
+        await self.async_client.aforce_login(self.admin)
+        response = await self.async_client.get('/api/cards/export/', {'output': 'ndjson'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_async)
+        content = b''.join([chunk async for chunk in response.streaming_content])
+        self.assertEqual(len(content.decode('utf-8').splitlines()), 3)
+
+    def test_export_command(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        path = os.path.join(directory, 'cards.csv.gz')
+        out = io.StringIO()
+        call_command('export_cards', '--output', path, '--rarity', 'UR', '--ordering', 'price', stdout=out)
+        self.assertIn('카드 2장', out.getvalue())
+        with gzip.open(path, 'rt', encoding='utf-8-sig') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['price'] for row in rows], ['500', '3000'])
+
+        with self.assertRaises(CommandError):
+            call_command('export_cards', '--condition', 'Z', stdout=io.StringIO())
+
+
+def make_archive(rows, images, manifest='manifest.csv'):
+    """이미지와 CSV manifest를 담은 ZIP (images: 파일명 → bytes)"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        for name, content in images.items():
+            archive.writestr(name, content)
+        if manifest:
+            text = io.StringIO()
+            writer = csv.DictWriter(text, fieldnames=['name', 'serial', 'condition', 'rarity', 'price', 'image'])
+            writer.writeheader()
+            writer.writerows(rows)
+            archive.writestr(manifest, text.getvalue())
+    return buffer.getvalue()
+
+
+def make_image(color):
+    buffer = io.BytesIO()
+    Image.new('RGB', (40, 56), color).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CardBulkImportTests(APITestCase):
+    """POST /api/cards/bulk_import/ (이미지 ZIP + manifest)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        CardName.objects.bulk_create([CardName(name='블루아이즈 화이트 드래곤'), CardName(name='블랙 매지션')])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.client.force_authenticate(self.admin)
+
+    def upload(self, archive, **data):
+        return self.client.post('/api/cards/bulk_import/', {
+            'archive': SimpleUploadedFile('cards.zip', archive, content_type='application/zip'), **data,
+        }, format='multipart')
+
+    def test_imports_valid_rows_and_reports_errors(self):
+        rows = [
+            {'name': '블루아이즈 화이트 드래곤', 'serial': 'LOB-001', 'condition': 'S', 'rarity': 'UR', 'price': '30000', 'image': 'images/blue.jpg'},
+            {'name': '블랙 매지션', 'serial': '', 'condition': 'A', 'rarity': 'SE', 'price': '12000', 'image': 'dark.jpg'},
+            {'name': '없는 카드', 'serial': '', 'condition': 'A', 'rarity': 'N', 'price': '100', 'image': 'dark.jpg'},
+            {'name': '블랙 매지션', 'serial': '', 'condition': 'Z', 'rarity': 'N', 'price': '-1', 'image': 'missing.jpg'},
+            {'name': '블랙 매지션', 'serial': '', 'condition': 'B', 'rarity': 'N', 'price': '100', 'image': 'notes.jpg'},
+        ]
+        archive = make_archive(rows, {
+            'images/blue.jpg': make_image('blue'), 'images/dark.jpg': make_image('purple'), 'notes.jpg': b'not an image',
+        })
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.upload(archive)
+        self.assertEqual(response.status_code, 201, response.content)
+        body = response.json()
+        self.assertEqual((body['created'], body['failed']), (2, 3))
+        self.assertEqual([entry['status'] for entry in body['rows']], ['created', 'created', 'error', 'error', 'error'])
+        self.assertEqual(set(body['rows'][2]['errors']), {'name'})
+        self.assertEqual(set(body['rows'][3]['errors']), {'condition', 'price', 'image'})
+        self.assertEqual(set(body['rows'][4]['errors']), {'image'})
+
+        card = Card.objects.get(pk=body['rows'][0]['id'])
+        self.assertEqual((card.serial_number, card.sale_status, card.image_status), ('LOB-001', 'available', 'pending'))
+        self.assertTrue(card.image.storage.exists(card.image.name))
+        # 파생 이미지 작업은 카드마다 하나씩 (INSERT 한 번)
+        self.assertEqual(
+            sorted(Job.objects.filter(task='optimize_card_image').values_list('key', flat=True)),
+            sorted(f"card:{entry['id']}" for entry in body['rows'][:2]),
+        )
+
+    def test_dry_run_and_separate_json_manifest(self):
+        archive = make_archive([], {'blue.jpg': make_image('blue')}, manifest=None)
+        manifest = SimpleUploadedFile('cards.json', (
+            '[{"name": "블루아이즈 화이트 드래곤", "condition": "S", "rarity": "UR", "price": 30000, "image": "blue.jpg"}]'
+        ).encode('utf-8'))
+        response = self.upload(archive, manifest=manifest, dry_run='true')
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual((response.json()['valid'], response.json()['failed']), (1, 0))
+        self.assertFalse(Card.objects.exists())
+
+    def test_missing_manifest_or_invalid_archive(self):
+        self.assertEqual(self.upload(make_archive([], {}, manifest=None)).status_code, 400)
+        self.assertEqual(self.upload(b'not a zip').status_code, 400)
+
+
+@override_settings(JOB_QUEUE={**settings.JOB_QUEUE, 'MAX_ATTEMPTS': 3, 'RETRY_BACKOFF': 10})
+class JobQueueTests(TestCase):
+    """DB 작업 큐: 재시도, 지수 백오프, 최종 실패 처리"""
+
+    def setUp(self):
+        self.failures = []
+        self.calls = 0
+
+        def flaky(payload):
+            self.calls += 1
+            if self.calls <= payload['fail_times']:
+                raise RuntimeError(f'실패 {self.calls}')
+
+        jobs.task('test_flaky', on_failure=lambda payload, error: self.failures.append((payload, str(error))))(flaky)
+        self.addCleanup(jobs.TASKS.pop, 'test_flaky')
+
+    def run_next(self):
+        """실행 예정 시각을 지난 것으로 보고 다음 작업 하나 실행"""
+        Job.objects.filter(status=Job.STATUS_QUEUED).update(run_after=timezone.now() - timedelta(seconds=1))
+        job = jobs.claim_next()
+        return job, jobs.run_job(job)
+
+    def test_retries_with_exponential_backoff_then_calls_on_failure(self):
+        jobs.enqueue('test_flaky', {'fail_times': 5})
+        for attempt, backoff in ((1, 10), (2, 20)):
+            before = timezone.now()
+            job, ok = self.run_next()
+            self.assertFalse(ok)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (Job.STATUS_QUEUED, attempt))
+            self.assertIsNone(job.locked_at)
+            self.assertIn('RuntimeError', job.last_error)
+            self.assertGreaterEqual(job.run_after, before + timedelta(seconds=backoff))
+            self.assertLess(job.run_after, before + timedelta(seconds=backoff + 5))
+            # 백오프 시간이 지나기 전에는 다시 가져가지 않음
+            self.assertIsNone(jobs.claim_next())
+            self.assertEqual(self.failures, [])
+
+        job, ok = self.run_next()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (Job.STATUS_FAILED, 3))
+        self.assertEqual(self.failures, [({'fail_times': 5}, '실패 3')])
+        self.assertIsNone(jobs.claim_next())
+
+    def test_succeeds_on_retry(self):
+        jobs.enqueue('test_flaky', {'fail_times': 1})
+        self.assertFalse(self.run_next()[1])
+        job, ok = self.run_next()
+        self.assertTrue(ok)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.last_error), (Job.STATUS_DONE, 2, ''))
+        self.assertEqual(self.failures, [])
+
+    def test_key_deduplicates_pending_jobs_and_stale_jobs_are_requeued(self):
+        first = jobs.enqueue('test_flaky', {'fail_times': 0}, key='card:1')
+        self.assertEqual(jobs.enqueue('test_flaky', {'fail_times': 0}, key='card:1'), first)
+        self.assertEqual(jobs.claim_next(), first)
+        # 실행중인 작업도 중복 등록하지 않음
+        self.assertEqual(jobs.enqueue('test_flaky', {'fail_times': 0}, key='card:1'), first)
+
+        # 워커가 죽어 실행중으로 남은 작업은 다시 대기 상태로
+        Job.objects.filter(pk=first.pk).update(locked_at=timezone.now() - timedelta(seconds=700))
+        self.assertEqual(jobs.requeue_stale_jobs(timeout=600), 1)
+        self.assertEqual(Job.objects.get(pk=first.pk).status, Job.STATUS_QUEUED)
+        self.assertEqual(jobs.run_worker(once=True), 1)
+        self.assertEqual(Job.objects.get(pk=first.pk).status, Job.STATUS_DONE)
+
+    def test_unknown_task_fails_without_retry(self):
+        jobs.enqueue('no_such_task')
+        job, ok = self.run_next()
+        self.assertFalse(ok)
+        job.refresh_from_db()
+        self.assertEqual(job.status, Job.STATUS_FAILED)
+
+    def test_image_job_marks_card_failed_after_last_attempt(self):
+        card, = make_cards([('available', 'N', 'A', 100)])
+        Card.objects.filter(pk=card.pk).update(image_status=Card.IMAGE_STATUS_PENDING)
+        # 원본 파일이 없는 카드: 재시도 후 최종 실패하면 이미지 상태를 실패로 표시
+        jobs.enqueue('optimize_card_image', {'card_id': card.pk}, max_attempts=2)
+        for _ in range(2):
+            self.assertFalse(self.run_next()[1])
+        self.assertEqual(Card.objects.get(pk=card.pk).image_status, Card.IMAGE_STATUS_FAILED)
+
+
+def make_sized_image(width, height, image_format='JPEG', color='blue'):
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), color).save(buffer, image_format)
+    return buffer.getvalue()
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    IMAGE_DERIVATIVES={'WIDTHS': [100, 200], 'FORMATS': ['webp', 'jpeg'], 'QUALITY': {'webp': 80, 'jpeg': 80}},
+)
+class CardImageDerivativeTests(APITestCase):
+    """해상도/포맷별 파생 이미지 생성과 images(srcset) 응답"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def test_target_widths(self):
+        self.assertEqual(imaging.target_widths(1000, [200, 400, 800]), [200, 400, 800])
+        self.assertEqual(imaging.target_widths(800, [800, 200, 400]), [200, 400, 800])
+        # 원본이 최대 너비보다 작으면 원본 크기 버전 포함, 더 작으면 원본 크기만
+        self.assertEqual(imaging.target_widths(500, [200, 400, 800]), [200, 400, 500])
+        self.assertEqual(imaging.target_widths(150, [200, 400, 800]), [150])
+
+    def test_build_derivatives(self):
+        derivatives = imaging.build_derivatives(
+            io.BytesIO(make_sized_image(1000, 1400, 'PNG')), widths=[200, 400], formats=['webp', 'jpeg'],
+        )
+        self.assertEqual(
+            [(item['format'], item['width'], item['height']) for item in derivatives],
+            [('webp', 200, 280), ('jpeg', 200, 280), ('webp', 400, 560), ('jpeg', 400, 560)],
+        )
+        for item in derivatives:
+            with Image.open(io.BytesIO(item['content'])) as img:
+                self.assertEqual((img.format, img.size), (imaging.FORMATS[item['format']][0], (item['width'], item['height'])))
+
+    def test_job_stores_variants_and_api_returns_srcset(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            card = Card.objects.create(
+                name='블랙 매지션', condition='A', price=Decimal(1000),
+                image=SimpleUploadedFile('card.jpg', make_sized_image(400, 560)),
+            )
+        self.assertEqual(jobs.run_worker(once=True), 1)
+        card.refresh_from_db()
+        self.assertEqual(card.image_status, Card.IMAGE_STATUS_DONE)
+        self.assertEqual((card.image_variants['width'], card.image_variants['height']), (200, 280))
+        formats = card.image_variants['formats']
+        self.assertEqual(sorted(formats), ['jpeg', 'webp'])
+        self.assertEqual([(v['width'], v['height']) for v in formats['jpeg']], [(100, 140), (200, 280)])
+        # 기존 image_optimized는 가장 큰 JPEG
+        self.assertEqual(card.image_optimized.name, formats['jpeg'][-1]['name'])
+
+        images = self.client.get(f'/api/cards/{card.id}/').json()['images']
+        url = lambda name: f'http://testserver{settings.MEDIA_URL}{name}'
+        self.assertEqual((images['width'], images['height']), (200, 280))
+        self.assertEqual(images['src'], url(formats['jpeg'][-1]['name']))
+        # 브라우저가 지원하는 첫 포맷을 쓰도록 WebP → JPEG 순
+        self.assertEqual([source['type'] for source in images['sources']], ['image/webp', 'image/jpeg'])
+        for source, fmt in zip(images['sources'], ('webp', 'jpeg')):
+            self.assertEqual(
+                source['srcset'], ', '.join(f"{url(v['name'])} {v['width']}w" for v in formats[fmt]),
+            )
+            self.assertEqual(
+                source['candidates'],
+                [{'width': v['width'], 'height': v['height'], 'url': url(v['name'])} for v in formats[fmt]],
+            )
+        # 파생 이미지가 아직 없으면 images는 None
+        with self.captureOnCommitCallbacks(execute=True):
+            Card.objects.filter(pk=card.pk).update(image_variants={})
+        self.assertIsNone(self.client.get(f'/api/cards/{card.id}/').json()['images'])
+
+
+class ImageDecodeLimitTests(APITestCase):
+    """decompression bomb 방지(IMAGE_MAX_PIXELS)와 JPEG draft 축소 디코딩"""
+
+    def test_rejects_images_over_max_pixels_before_decoding(self):
+        content = make_sized_image(100, 100)
+        with override_settings(IMAGE_MAX_PIXELS=100 * 100):
+            self.assertEqual(imaging.inspect_image(io.BytesIO(content))['width'], 100)
+        with override_settings(IMAGE_MAX_PIXELS=100 * 100 - 1):
+            with self.assertRaises(imaging.ImageTooLargeError):
+                imaging.inspect_image(io.BytesIO(content))
+            with mock.patch.object(Image.Image, 'load') as load, self.assertRaises(imaging.ImageTooLargeError):
+                imaging.build_derivatives(io.BytesIO(content), widths=[50], formats=['jpeg'])
+            load.assert_not_called()
+
+    @override_settings(IMAGE_MAX_PIXELS=100 * 100 - 1)
+    def test_upload_over_max_pixels_returns_400(self):
+        self.client.force_authenticate(User.objects.create_superuser('admin', 'admin@example.com', 'password'))
+        response = self.client.post('/api/cards/', {
+            'name': '블랙 매지션', 'condition': 'A', 'price': '1000',
+            'image': SimpleUploadedFile('card.jpg', make_sized_image(100, 100)),
+        }, format='multipart')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['image'], ['이미지 해상도가 너무 큽니다.'])
+        self.assertFalse(Card.objects.exists())
+
+    def test_jpeg_is_decoded_at_reduced_scale(self):
+        draft = JpegImagePlugin.JpegImageFile.draft
+        with mock.patch.object(JpegImagePlugin.JpegImageFile, 'draft', autospec=True, side_effect=draft) as spy:
+            derivatives = imaging.build_derivatives(
+                io.BytesIO(make_sized_image(1600, 2240)), widths=[200], formats=['jpeg'],
+            )
+        spy.assert_called_once_with(mock.ANY, 'RGB', (200, 280))
+        self.assertEqual([(item['width'], item['height']) for item in derivatives], [(200, 280)])
+
+        # 원본이 가장 큰 파생 이미지보다 작거나 같으면 축소하지 않음
+        with mock.patch.object(JpegImagePlugin.JpegImageFile, 'draft', autospec=True, side_effect=draft) as spy:
+            imaging.build_derivatives(io.BytesIO(make_sized_image(200, 280)), widths=[200], formats=['jpeg'])
+        spy.assert_not_called()
+
+    def test_png_is_not_drafted(self):
+        with mock.patch.object(Image.Image, 'draft') as spy:
+            derivatives = imaging.build_derivatives(
+                io.BytesIO(make_sized_image(800, 1120, 'PNG')), widths=[200], formats=['jpeg'],
+            )
+        spy.assert_not_called()
+        self.assertEqual([(item['width'], item['height']) for item in derivatives], [(200, 280)])
+
+
+class InlineExecutor:
+    """ProcessPoolExecutor 대신 같은 프로세스에서 실행 (테스트 트랜잭션의 데이터는 자식 프로세스에서 보이지 않음)"""
+
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+    def map(self, fn, iterable):
+        return [fn(item) for item in iterable]
+
+
+class OptimizeImagesCommandTests(TestCase):
+    """optimize_images: 대상 선택(--force/--since), 체크포인트 재개"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.checkpoint = os.path.join(media_root, 'checkpoint.json')
+
+        self.cards = make_cards([('available', 'N', 'A', 100)] * 4)
+        for card in self.cards:
+            path = Path(media_root) / card.image.name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(b'x' * 10)
+        # 두 번째 카드는 이미 처리됨
+        Card.objects.filter(pk=self.cards[1].pk).update(image_variants={'width': 200, 'height': 280, 'formats': {}})
+        self.ids = [card.pk for card in self.cards]
+
+        self.processed = []
+        patchers = [
+            mock.patch.object(optimize_images, 'ProcessPoolExecutor', InlineExecutor),
+            # 자식 프로세스를 만들지 않으므로 테스트 트랜잭션의 연결을 닫지 않음
+            mock.patch.object(optimize_images.connections, 'close_all'),
+            mock.patch.object(optimize_images, 'generate_card_images', lambda card: self.processed.append(card.pk)),
+        ]
+        for patcher in patchers:
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('optimize_images', '--workers', '1', '--chunk-size', '2', '--checkpoint', self.checkpoint,
+                     *args, stdout=out, stderr=io.StringIO())
+        return out.getvalue()
+
+    def test_skips_processed_cards_unless_forced(self):
+        self.run_command()
+        self.assertEqual(self.processed, [self.ids[0], self.ids[2], self.ids[3]])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+        self.processed.clear()
+        self.run_command('--force')
+        self.assertEqual(self.processed, self.ids)
+
+    def test_since_limits_to_recent_cards(self):
+        Card.objects.filter(pk__in=self.ids[:2]).update(created_at=timezone.now() - timedelta(days=30))
+        since = (timezone.now() - timedelta(days=1)).date().isoformat()
+        self.run_command('--force', '--since', since)
+        self.assertEqual(self.processed, self.ids[2:])
+        with self.assertRaises(CommandError):
+            self.run_command('--since', 'yesterday')
+
+    def test_resumes_from_checkpoint_of_same_run(self):
+        def interrupt(card):
+            if card.pk == self.ids[2]:
+                raise KeyboardInterrupt
+            self.processed.append(card.pk)
+
+        with mock.patch.object(optimize_images, 'generate_card_images', interrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                self.run_command('--force')
+        # 첫 청크(카드 2장)까지 완료로 기록
+        with open(self.checkpoint, encoding='utf-8') as f:
+            self.assertEqual(json.load(f), {'run': {'force': True, 'since': None}, 'last_id': self.ids[1]})
+
+        self.processed.clear()
+        output = self.run_command('--force')
+        self.assertIn('체크포인트에서 재개', output)
+        self.assertEqual(self.processed, self.ids[2:])
+        self.assertFalse(os.path.exists(self.checkpoint))
+
+    def test_checkpoint_of_other_options_or_restart_starts_over(self):
+        with open(self.checkpoint, 'w', encoding='utf-8') as f:
+            json.dump({'run': {'force': False, 'since': None}, 'last_id': self.ids[1]}, f)
+        output = self.run_command('--force')
+        self.assertIn('처음부터 실행', output)
+        self.assertEqual(self.processed, self.ids)
+
+        self.processed.clear()
+        with open(self.checkpoint, 'w', encoding='utf-8') as f:
+            json.dump({'run': {'force': True, 'since': None}, 'last_id': self.ids[1]}, f)
+        self.run_command('--force', '--restart')
+        self.assertEqual(self.processed, self.ids)
+
+    def test_failed_card_is_marked_and_reported(self):
+        os.remove(Path(settings.MEDIA_ROOT) / self.cards[3].image.name)
+        self.run_command()
+        self.assertEqual(self.processed, [self.ids[0], self.ids[2]])
+        self.assertEqual(Card.objects.get(pk=self.ids[3]).image_status, Card.IMAGE_STATUS_FAILED)
+
+
+class ContentAddressedStorageTests(TestCase):
+    """해시 이름 저장, 같은 내용 중복 제거와 참조 횟수"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = Path(media_root)
+        self.storage = storage.ContentAddressedStorage()
+
+    def test_names_files_by_content_hash(self):
+        content = make_image('blue')
+        digest = hashlib.sha256(content).hexdigest()
+        name = self.storage.save('cards/사진 (1).JPG', ContentFile(content))
+        self.assertEqual(name, f'cards/{digest[:2]}/{digest}.jpg')
+        self.assertRegex(name, storage.HASH_NAME_PATTERN)
+        self.assertEqual((self.media_root / name).read_bytes(), content)
+        self.assertTrue(self.storage.url(name).endswith(f'{digest}.jpg'))
+        # 임시 파일이 남지 않음
+        self.assertEqual(list((self.media_root / 'cards').glob('.upload-*')), [])
+
+    def test_same_content_is_stored_once_and_deleted_with_last_reference(self):
+        content = make_image('blue')
+        first = self.storage.save('cards/a.jpg', ContentFile(content))
+        second = self.storage.save('cards/b.jpg', ContentFile(content))
+        other = self.storage.save('cards/c.jpg', ContentFile(make_image('red')))
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(
+            dict(MediaBlob.objects.values_list('name', 'refcount')), {first: 2, other: 1},
+        )
+        self.assertEqual(MediaBlob.objects.get(name=first).size, len(content))
+
+        self.storage.delete(first)
+        self.assertTrue(self.storage.exists(first))
+        self.assertEqual(MediaBlob.objects.get(name=first).refcount, 1)
+        self.storage.delete(first)
+        self.assertFalse(self.storage.exists(first))
+        self.assertFalse(MediaBlob.objects.filter(name=first).exists())
+        self.assertTrue(self.storage.exists(other))
+
+    def test_release_count_and_legacy_files(self):
+        name = self.storage.save('cards/a.jpg', ContentFile(b'same'))
+        for _ in range(2):
+            self.storage.save('cards/a.jpg', ContentFile(b'same'))
+        self.storage.release(name, count=2)
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 1)
+        self.storage.release(name, count=5)
+        self.assertFalse(self.storage.exists(name))
+
+        # 참조 기록이 없는 (해시 저장소 도입 이전) 파일은 바로 삭제
+        legacy = self.media_root / 'cards' / 'legacy.jpg'
+        legacy.write_bytes(b'legacy')
+        self.storage.release('cards/legacy.jpg')
+        self.assertFalse(legacy.exists())
+
+    def test_concurrent_first_save_counts_both_references(self):
+        name = self.storage.save('cards/a.jpg', ContentFile(b'same'))
+        # 첫 UPDATE 시점에는 행이 없었고, INSERT 전에 다른 프로세스가 같은 내용을 등록한 경우
+        querysets = [MediaBlob.objects.none(), MediaBlob.objects.filter(name=name)]
+        with mock.patch.object(MediaBlob.objects, 'filter', side_effect=querysets):
+            with CaptureQueriesContext(connection) as queries:
+                self.assertEqual(self.storage.save('cards/b.jpg', ContentFile(b'same')), name)
+        self.assertTrue(any(query['sql'].startswith('INSERT') for query in queries))
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 2)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class MediaCleanupTests(APITestCase):
+    """카드 삭제/이미지 교체 시 파일 참조 해제(커밋 후 작업)와 collect_media"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = Path(media_root)
+        self.storage = Card._meta.get_field('image').storage
+        self.client.force_authenticate(self.admin)
+
+    def make_card(self, color, **fields):
+        return Card.objects.create(
+            name='블랙 매지션', condition='A', price=Decimal(1000), image_status=Card.IMAGE_STATUS_DONE,
+            image=SimpleUploadedFile('card.jpg', make_image(color)), **fields,
+        )
+
+    def run_release_jobs(self):
+        for job in Job.objects.filter(task='release_files', status=Job.STATUS_QUEUED):
+            self.assertTrue(run_job(job))
+
+    def write(self, name, content, age=7200):
+        path = self.media_root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(content)
+        os.utime(path, (time.time() - age, time.time() - age))
+        return path
+
+    def test_deletes_release_files_after_commit(self):
+        first, second = self.make_card('blue'), self.make_card('blue')
+        name = first.image.name
+        self.assertEqual(second.image.name, name)
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(self.client.delete(f'/api/cards/{first.id}/').status_code, 204)
+        # 요청 안에서는 파일을 건드리지 않음
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 2)
+        self.run_release_jobs()
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 1)
+        self.assertTrue(self.storage.exists(name))
+
+        # QuerySet.delete()(관리자 화면 선택 삭제)도 참조 해제
+        with self.captureOnCommitCallbacks(execute=True):
+            Card.objects.all().delete()
+        self.assertEqual(Job.objects.get(task='release_files', status=Job.STATUS_QUEUED).payload, {'names': {name: 1}})
+        self.run_release_jobs()
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertFalse(self.storage.exists(name))
+
+    def test_rolled_back_delete_keeps_files(self):
+        card = self.make_card('blue')
+        with self.captureOnCommitCallbacks(execute=True):
+            with self.assertRaises(RuntimeError), transaction.atomic():
+                Card.objects.filter(pk=card.pk).delete()
+                raise RuntimeError
+        self.assertFalse(Job.objects.filter(task='release_files').exists())
+        self.assertTrue(Card.objects.filter(pk=card.pk).exists())
+
+    def test_image_replacement_releases_previous_original_and_derivatives(self):
+        card = self.make_card('blue')
+        variant = self.storage.save('cards/variants/card_100w.webp', ContentFile(b'variant'))
+        Card.objects.filter(pk=card.pk).update(
+            image_optimized=variant,
+            image_variants={'width': 100, 'height': 140, 'formats': {'webp': [{'width': 100, 'height': 140, 'name': variant}]}},
+        )
+        previous = card.image.name
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/api/cards/{card.id}/', {'image': SimpleUploadedFile('new.jpg', make_image('red'))}, format='multipart',
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.run_release_jobs()
+        card.refresh_from_db()
+        self.assertNotEqual(card.image.name, previous)
+        self.assertTrue(self.storage.exists(card.image.name))
+        self.assertFalse(self.storage.exists(previous))
+        self.assertFalse(self.storage.exists(variant))
+        self.assertEqual(list(MediaBlob.objects.values_list('name', flat=True)), [card.image.name])
+
+    def test_collect_media_removes_only_unreferenced_files(self):
+        kept = self.make_card('blue')
+        # 이전의 일괄 삭제로 참조 횟수만 남은 파일
+        orphan = self.storage.save('cards/orphan.jpg', ContentFile(make_image('green')))
+        # 해시 저장소 도입 이전 파일 (MediaBlob 없음)
+        self.write('cards/legacy.jpg', b'legacy')
+        legacy = self.make_card('red')
+        Card.objects.filter(pk=legacy.pk).update(image='cards/legacy.jpg')
+        self.storage.delete(legacy.image.name)
+        stray = self.write('cards/.upload-stale', b'x' * 10)
+        recent = self.write('cards/variants/.upload-recent', b'y', age=0)
+        for file_path in self.media_root.rglob('*'):
+            if file_path.is_file() and file_path != recent:
+                os.utime(file_path, (time.time() - 7200, time.time() - 7200))
+        orphan_size = (self.media_root / orphan).stat().st_size
+
+        stats = media_gc.collect(dry_run=True, batch_size=2, log=lambda message: None)
+        self.assertEqual((stats['orphaned'], stats['orphaned_bytes'], stats['deleted']), (2, orphan_size + 10, 0))
+        self.assertTrue(stray.exists())
+
+        output = io.StringIO()
+        call_command('collect_media', '--batch-size', '2', stdout=output)
+        self.assertIn('삭제 2개', output.getvalue())
+        files = sorted(str(path.relative_to(self.media_root)) for path in self.media_root.rglob('*') if path.is_file())
+        self.assertEqual(files, sorted([kept.image.name, 'cards/legacy.jpg', 'cards/variants/.upload-recent']))
+        # 이전 파일은 참조 횟수로 관리 시작, 참조가 끊긴 파일의 기록은 삭제
+        self.assertEqual(
+            dict(MediaBlob.objects.values_list('name', 'refcount')), {kept.image.name: 1, 'cards/legacy.jpg': 1},
+        )
+
+    def test_collect_media_keeps_file_reused_by_card_committed_after_mark(self):
+        old = timezone.now() - timedelta(hours=2)
+        name = self.storage.save('cards/card.jpg', ContentFile(make_image('blue')))
+        MediaBlob.objects.filter(name=name).update(refcount=0, referenced_at=old)
+        os.utime(self.media_root / name, (time.time() - 7200, time.time() - 7200))
+        mark_referenced = media_gc.mark_referenced
+
+        def mark_then_commit_upload(started, **kwargs):
+            counts = mark_referenced(started, **kwargs)
+            # 표시 단계 전에 같은 내용을 업로드(referenced_at 갱신)하고 그 뒤에 커밋된 카드
+            with mock.patch('cards.storage.timezone.now', return_value=old):
+                card = self.make_card('blue')
+            self.assertEqual(card.image.name, name)
+            return counts
+
+        with mock.patch.object(media_gc, 'mark_referenced', mark_then_commit_upload):
+            stats = media_gc.collect(log=lambda message: None)
+        self.assertEqual(stats['deleted'], 0)
+        self.assertTrue(self.storage.exists(name))
+        self.assertEqual(MediaBlob.objects.get(name=name).refcount, 1)
+
+
+class CardNameIndexTests(TestCase):
+    """카드명 자동완성 메모리 인덱스"""
+
+    @classmethod
+    def setUpTestData(cls):
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블랙 매지션', '붉은 눈의 흑룡')])
+        name_dictionary.reconcile()
+
+    def setUp(self):
+        name_index.invalidate()
+        self.addCleanup(name_index.invalidate)
+
+    def test_reloads_after_rename_in_other_process(self):
+        self.assertEqual(name_index.search('매지션'), ['블랙 매지션'])
+        # 다른 프로세스에서 이름 변경 (개수와 최대 id는 그대로, 이 프로세스의 시그널은 발생하지 않음)
+        card_name = CardName.objects.get(name='블랙 매지션')
+        CardName.objects.filter(pk=card_name.pk).update(name='블랙 매지션 걸')
+        name_dictionary.record_revision(added=['블랙 매지션 걸'], removed=['블랙 매지션'])
+        self.assertEqual(name_index.search('매지션'), ['블랙 매지션'])
+
+        with mock.patch.object(name_index, '_last_check', 0.0):
+            self.assertEqual(name_index.search('매지션'), ['블랙 매지션 걸'])
+
+    def test_reloads_after_change_in_same_process(self):
+        self.assertEqual(name_index.search('ㅂㄹ'), ['블랙 매지션'])
+        CardName.objects.create(name='블루아이즈')
+        self.assertEqual(name_index.search('ㅂㄹ'), ['블루아이즈', '블랙 매지션'])
+
+    def test_search_card_names_api(self):
+        response = self.client.get('/api/cards/search_card_names/', {'q': '흑', 'limit': 5})
+        self.assertEqual(response.json(), {'results': [{'name': '붉은 눈의 흑룡'}], 'count': 1})
+        self.assertEqual(self.client.get('/api/cards/search_card_names/', {'q': ' '}).json(), {'results': []})
+
+
+class CardNameIndexSearchTests(SimpleTestCase):
+    """CardNameIndex.search: 초성/자모 단위 일치와 순위"""
+
+    NAMES = [
+        '블루아이즈 얼티메이트 드래곤', '진 블루아이즈', '블루아이즈', '블루아이즈 화이트 드래곤',
+        '블랙 매지션', '붉은 눈의 흑룡', 'Dark Magician',
+    ]
+
+    def setUp(self):
+        self.index = name_index.CardNameIndex(self.NAMES)
+
+    def test_decompose_and_chosung(self):
+        self.assertEqual(name_index.decompose('붉 A'), 'ㅂㅜㄹㄱa')
+        self.assertEqual(name_index.decompose('의'), 'ㅇㅡㅣ')
+        self.assertEqual(name_index.chosung('블루 아이즈!'), 'ㅂㄹㅇㅇㅈ!')
+        self.assertTrue(name_index.is_chosung_query('ㅂㄹ ㅇㅇ'))
+        self.assertFalse(name_index.is_chosung_query('ㅂ루'))
+        self.assertFalse(name_index.is_chosung_query(' '))
+
+    def test_ranks_exact_then_prefix_then_substring_shorter_first(self):
+        self.assertEqual(self.index.search('블루아이즈'), [
+            '블루아이즈', '블루아이즈 화이트 드래곤', '블루아이즈 얼티메이트 드래곤', '진 블루아이즈',
+        ])
+        self.assertEqual(self.index.search('블루아이즈', limit=2), ['블루아이즈', '블루아이즈 화이트 드래곤'])
+
+    def test_chosung_query(self):
+        self.assertEqual(self.index.search('ㅂㄹㅇㅇㅈ'), [
+            '블루아이즈', '블루아이즈 화이트 드래곤', '블루아이즈 얼티메이트 드래곤', '진 블루아이즈',
+        ])
+        self.assertEqual(self.index.search('ㅂㄹ'), [
+            '블루아이즈', '블랙 매지션', '블루아이즈 화이트 드래곤', '블루아이즈 얼티메이트 드래곤', '진 블루아이즈',
+        ])
+        self.assertEqual(self.index.search('ㅎㄹ'), ['붉은 눈의 흑룡'])
+
+    def test_matches_syllable_being_typed(self):
+        # 입력 중인 미완성 음절 ("블루앙"은 "블루아이즈"의 "아" + 다음 초성 "ㅇ")
+        for query in ('블루앙', '블룽', '블루아ㅇ'):
+            self.assertEqual(self.index.search(query, limit=1), ['블루아이즈'], query)
+        # 겹받침은 두 글자로 나누어 입력됨 ("불" + "ㄱ" → "붉")
+        self.assertEqual(self.index.search('불ㄱ'), ['붉은 눈의 흑룡'])
+        self.assertEqual(self.index.search('흐'), ['붉은 눈의 흑룡'])
+
+    def test_ignores_case_and_spaces(self):
+        self.assertEqual(self.index.search('dark mag'), ['Dark Magician'])
+        self.assertEqual(self.index.search('블랙매지'), ['블랙 매지션'])
+        self.assertEqual(self.index.search('매지션 블랙'), [])
+        self.assertEqual(self.index.search('  '), [])
+
+
+class LoadCardNamesCommandTests(TestCase):
+    """load_card_names: 파일과 DB의 차이만 한 트랜잭션에서 반영"""
+
+    def setUp(self):
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블랙 매지션', '옛날 카드')])
+        self.path = tempfile.mktemp(suffix='.dat')
+        self.addCleanup(lambda: os.path.exists(self.path) and os.remove(self.path))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write('블루아이즈 화이트 드래곤\n블랙 매지션\n\n블루아이즈 화이트 드래곤\n붉은 눈의 흑룡\n')
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('load_card_names', self.path, *args, stdout=out)
+        return out.getvalue()
+
+    def test_adds_only_new_names_in_few_queries(self):
+        version = name_dictionary.current_version()
+        # 사전 이력 잠금(PostgreSQL) + 시작 시 카드명(비교에도 사용) + INSERT 한 번 + 끝난 뒤 카드명 + 이력 기록
+        # + 버전 조회 (카드명 수, 이력 길이와 무관)
+        with CaptureQueriesContext(connection) as queries:
+            output = self.run_command()
+        self.assertEqual(len(queries), 8 if connection.vendor == 'postgresql' else 7, [q['sql'] for q in queries])
+        # 이력 전체를 다시 읽지 않음 (이력 표는 기록과 버전 조회만)
+        revision_queries = [q['sql'] for q in queries if 'cards_cardnamerevision' in q['sql']]
+        self.assertEqual(len(revision_queries), 2, revision_queries)
+        self.assertIn('추가 2개, 삭제 0개, 변경 없음 1개', output)
+        revision = CardNameRevision.objects.latest('id')
+        self.assertEqual((revision.added, revision.removed), (['붉은 눈의 흑룡', '블루아이즈 화이트 드래곤'], []))
+        self.assertEqual(
+            set(CardName.objects.values_list('name', flat=True)),
+            {'블랙 매지션', '옛날 카드', '블루아이즈 화이트 드래곤', '붉은 눈의 흑룡'},
+        )
+        self.assertGreater(name_dictionary.current_version(), version)
+
+        output = self.run_command()
+        self.assertIn('추가 0개', output)
+
+    def test_prune_and_dry_run(self):
+        self.run_command('--prune', '--dry-run')
+        self.assertTrue(CardName.objects.filter(name='옛날 카드').exists())
+        output = self.run_command('--prune')
+        self.assertIn('삭제 1개', output)
+        self.assertFalse(CardName.objects.filter(name='옛날 카드').exists())
+
+    def test_prune_with_truncated_file_changes_nothing(self):
+        CardName.objects.bulk_create([CardName(name=f'카드 {i}') for i in range(10)])
+        before = set(CardName.objects.values_list('name', flat=True))
+        version = name_dictionary.current_version()
+        # 스크래핑이 중간에 실패해 카드명 3개만 남은 파일 (DB에는 12개)
+        with self.assertRaisesMessage(CommandError, '--force'):
+            call_command('load_card_names', self.path, prune=True, stdout=io.StringIO())
+        self.assertEqual(set(CardName.objects.values_list('name', flat=True)), before)
+        self.assertEqual(name_dictionary.current_version(), version)
+
+        output = self.run_command('--prune', '--dry-run')
+        self.assertIn('절반보다 적습니다', output)
+        self.assertEqual(set(CardName.objects.values_list('name', flat=True)), before)
+
+        output = self.run_command('--prune', '--force')
+        self.assertIn('삭제 11개', output)
+        self.assertEqual(CardName.objects.count(), 3)
+
+
+class CardNameDictionaryTests(APITestCase):
+    """GET /api/cards/get_all_card_names/: 버전별 압축 사전과 ?since_version= 변경분"""
+
+    url = '/api/cards/get_all_card_names/'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블랙 매지션', '붉은 눈의 흑룡')])
+        name_dictionary.reconcile()
+
+    def setUp(self):
+        cache.clear()
+        # 다른 테스트에서 같은 버전 번호로 만든 사전을 재사용하지 않도록 (롤백되면 id가 다시 쓰일 수 있음)
+        name_dictionary._dictionary = None
+        self.client.force_authenticate(self.admin)
+        self.version = name_dictionary.current_version()
+
+    def test_changes_since_are_net(self):
+        CardName.objects.create(name='블루아이즈')
+        temporary = CardName.objects.create(name='임시 카드')
+        temporary.delete()
+        card_name = CardName.objects.get(name='블랙 매지션')
+        card_name.name = '블랙 매지션 걸'
+        card_name.save()
+        # 삭제 후 다시 추가된 이름은 처음 버전에도 있었으므로 변경 없음
+        CardName.objects.get(name='붉은 눈의 흑룡').delete()
+        CardName.objects.create(name='붉은 눈의 흑룡')
+
+        added, removed, latest = name_dictionary.changes_since(self.version)
+        self.assertEqual((added, removed), (['블랙 매지션 걸', '블루아이즈'], ['블랙 매지션']))
+        self.assertEqual(latest, name_dictionary.current_version())
+        self.assertEqual(name_dictionary.changes_since(latest), ([], [], latest))
+
+        response = self.client.get(self.url, {'since_version': self.version})
+        self.assertEqual(response.json(), {
+            'version': latest, 'since_version': self.version, 'full': False,
+            'added': ['블랙 매지션 걸', '블루아이즈'], 'removed': ['블랙 매지션'],
+        })
+        self.assertEqual(response['ETag'], f'"names-{latest}-since{self.version}"')
+
+    def test_changes_since_return_304_until_next_change(self):
+        CardName.objects.create(name='블루아이즈')
+        params = {'since_version': self.version}
+        etag = self.client.get(self.url, params)['ETag']
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        # 전체 사전의 ETag는 변경분 응답과 일치하지 않음
+        full_etag = self.client.get(self.url)['ETag']
+        self.assertEqual(self.client.get(self.url, params, HTTP_IF_NONE_MATCH=full_etag).status_code, 200)
+
+        CardName.objects.create(name='진 블루아이즈')
+        response = self.client.get(self.url, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['added'], ['블루아이즈', '진 블루아이즈'])
+
+    def test_unknown_since_version_returns_full_list(self):
+        for since_version in (0, -1, self.version + 1):
+            response = self.client.get(self.url, {'since_version': since_version})
+            self.assertEqual(response.json(), {
+                'version': self.version, 'full': True, 'card_names': ['붉은 눈의 흑룡', '블랙 매지션'], 'count': 2,
+            }, since_version)
+        response = self.client.get(self.url, {'since_version': 'abc'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_full_dictionary_is_precompressed(self):
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip;q=1, br;q=0')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['ETag'], f'"names-{self.version}-gzip"')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(json.loads(gzip.decompress(response.content)), {
+            'version': self.version, 'card_names': ['붉은 눈의 흑룡', '블랙 매지션'], 'count': 2,
+        })
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='identity')
+        self.assertFalse(response.has_header('Content-Encoding'))
+        self.assertEqual(response['ETag'], f'"names-{self.version}"')
+        # 압축 결과는 버전당 한 번만 만듦
+        with mock.patch.object(name_dictionary, 'Dictionary', side_effect=AssertionError):
+            self.assertEqual(self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip').status_code, 200)
+
+    def test_304_matches_any_encoding_of_current_version(self):
+        for etag in (f'"names-{self.version}"', f'"other", W/"names-{self.version}-gzip"', '*'):
+            with mock.patch.object(name_dictionary, 'get_dictionary', side_effect=AssertionError):
+                response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304, etag)
+        CardName.objects.create(name='블루아이즈')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"names-{self.version}-gzip"')
+        self.assertEqual(response.status_code, 200)
+
+    def test_preferred_encoding(self):
+        available = {'gzip': b'', 'br': b''}
+        self.assertEqual(name_dictionary.preferred_encoding('gzip, br', available), 'br')
+        self.assertEqual(name_dictionary.preferred_encoding('gzip, br;q=0', available), 'gzip')
+        self.assertEqual(name_dictionary.preferred_encoding('*', {'gzip': b''}), 'gzip')
+        self.assertIsNone(name_dictionary.preferred_encoding('', available))
+        self.assertIsNone(name_dictionary.preferred_encoding('gzip;q=abc', available))
+
+    def test_requires_admin(self):
+        self.client.force_authenticate(None)
+        self.assertIn(self.client.get(self.url).status_code, (401, 403))
+        self.assertIn(self.client.get(self.url, {'since_version': 1}).status_code, (401, 403))
+
+
+@skipUnless(connection.vendor == 'postgresql', '동시 트랜잭션은 PostgreSQL 기준 (SQLite는 쓰기를 하나씩만 실행)')
+class CardNameRevisionOrderTests(TransactionTestCase):
+    """사전 이력은 id 순서대로 커밋됨 (since_version으로 동기화할 때 이력을 건너뛰지 않음)"""
+
+    def test_later_revision_waits_for_uncommitted_one(self):
+        version = name_dictionary.current_version()
+        recorded = threading.Event()
+        release = threading.Event()
+        ids = {}
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    ids['first'] = name_dictionary.record_revision(added=['블랙 매지션']).id
+                    recorded.set()
+                    release.wait(5)
+            finally:
+                connections.close_all()
+
+        def writer():
+            try:
+                ids['second'] = name_dictionary.record_revision(added=['붉은 눈의 흑룡']).id
+            finally:
+                connections.close_all()
+
+        first = threading.Thread(target=slow_writer)
+        first.start()
+        self.assertTrue(recorded.wait(5))
+        second = threading.Thread(target=writer)
+        second.start()
+        second.join(0.5)
+        # 먼저 시작한 이력이 커밋되기 전에는 다음 이력이 기록(버전 증가)되지 않음
+        self.assertTrue(second.is_alive())
+        self.assertEqual(name_dictionary.current_version(), version)
+        release.set()
+        first.join(5)
+        second.join(5)
+        self.assertLess(ids['first'], ids['second'])
+        self.assertEqual(name_dictionary.current_version(), ids['second'])
+
+
+def load_scraper():
+    """scripts/scraping/scrape_yugioh_cards.py (패키지가 아니므로 경로로 불러옴)"""
+    path = Path(settings.BASE_DIR) / 'scripts' / 'scraping' / 'scrape_yugioh_cards.py'
+    spec = importlib.util.spec_from_file_location('scrape_yugioh_cards', path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class FixtureSite(BaseHTTPRequestHandler):
+    """카드 검색 결과 페이지를 흉내 내는 로컬 HTTP 서버 (pages: 페이지 번호 → 카드명 목록)"""
+    pages = {}
+    failing = set()
+    requests = []
+
+    def do_GET(self):
+        page = int(parse_qs(urlparse(self.path).query)['page'][0])
+        etag = f'"page-{page}-{len(self.pages.get(page, []))}"'
+        self.requests.append((page, self.headers.get('If-None-Match')))
+        if page in self.failing:
+            self.send_response(404)
+            self.end_headers()
+            return
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = ''.join(f'<span class="card_name">{name}</span>' for name in self.pages.get(page, []))
+        body = f'<html><body>{body}</body></html>'.encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class ScraperTests(SimpleTestCase):
+    """scrape_yugioh_cards.py: 동시 요청, 체크포인트 재개, 조건부 요청, 증분 모드"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.scraper = load_scraper()
+        cls.server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureSite)
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}/card_search.action'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        super().tearDownClass()
+
+    def setUp(self):
+        FixtureSite.pages = {
+            1: ['블루아이즈 화이트 드래곤', '블랙 매지션', '블랙 매지션'],
+            2: ['붉은 눈의 흑룡', '&quot;달의 서&quot;'],
+            3: ['크리보', '사이버 드래곤'],
+        }
+        FixtureSite.failing = set()
+        FixtureSite.requests = []
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        self.output = os.path.join(self.directory, 'names.dat')
+
+    def scrape(self, **kwargs):
+        options = {'workers': 3, 'rate': 1000, 'max_pages': 10, 'log': lambda message: None}
+        options.update(kwargs)
+        return self.scraper.scrape_card_names(
+            base_url=self.base_url, output=self.output,
+            checkpoint_dir=os.path.join(self.directory, 'checkpoint'), **options
+        )
+
+    def read_output(self):
+        with open(self.output, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_scrapes_until_empty_page_and_revalidates_with_etag(self):
+        names = self.scrape()
+        self.assertEqual(names, sorted(['블루아이즈 화이트 드래곤', '블랙 매지션', '붉은 눈의 흑룡', '달의 서', '크리보', '사이버 드래곤']))
+        self.assertEqual(self.read_output(), names)
+        # 빈 페이지(4) 이후로는 요청을 계속 보내지 않음 (동시 요청 수만큼만 앞서 요청)
+        self.assertLessEqual(max(page for page, _ in FixtureSite.requests), 4 + 2)
+
+        # 완료된 실행 뒤에는 저장된 ETag로 조건부 요청 (304면 저장된 결과 사용)
+        FixtureSite.requests = []
+        self.assertEqual(self.scrape(), names)
+        self.assertTrue(all(etag for page, etag in FixtureSite.requests if page <= 3))
+
+    def test_resumes_from_checkpoint_after_failure(self):
+        FixtureSite.failing = {2}
+        self.assertIsNone(self.scrape())
+        self.assertFalse(os.path.exists(self.output))
+
+        FixtureSite.failing = set()
+        FixtureSite.requests = []
+        names = self.scrape()
+        # 이미 받은 페이지는 다시 요청하지 않음
+        self.assertEqual([page for page, _ in FixtureSite.requests], [2])
+        self.assertIn('붉은 눈의 흑룡', names)
+        self.assertIn('크리보', names)
+
+    def test_incremental_stops_at_known_names(self):
+        with open(self.output, 'w', encoding='utf-8') as f:
+            f.write('붉은 눈의 흑룡\n달의 서\n오래된 카드\n')
+        names = self.scrape(incremental=True, workers=1)
+        self.assertEqual(names, sorted(['블루아이즈 화이트 드래곤', '블랙 매지션', '붉은 눈의 흑룡', '달의 서', '오래된 카드']))
+        # 새 카드명이 없는 2페이지에서 중단
+        self.assertEqual([page for page, _ in FixtureSite.requests], [1, 2])
+
+    def test_token_bucket_limits_rate(self):
+        bucket = self.scraper.TokenBucket(rate=50, capacity=1)
+        started = time.monotonic()
+        for _ in range(6):
+            bucket.acquire()
+        self.assertGreaterEqual(time.monotonic() - started, 5 / 50 * 0.9)
+
+
+THROTTLE_TEST_RATES = {'card_search': '3/min', 'card_names': '30/min', 'card_upload': '60/min'}
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': THROTTLE_TEST_RATES},
+)
+class CardActionThrottleTests(APITestCase):
+    """액션별 슬라이딩 윈도 요청 빈도 제한"""
+
+    def setUp(self):
+        cache.clear()
+        throttles.CardActionThrottle.previous_counts.clear()
+        throttles.CardActionThrottle.blocked_until.clear()
+        self.now = 1_000_000 * 60.0
+        patcher = mock.patch.object(throttles.CardActionThrottle, 'timer', lambda throttle: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def search(self):
+        return self.client.get('/api/cards/search_card_names/', {'q': '블루'})
+
+    def test_rejects_over_limit_with_retry_after(self):
+        self.assertEqual([self.search().status_code for _ in range(3)], [200, 200, 200])
+        response = self.search()
+        self.assertEqual(response.status_code, 429)
+        # 다음 구간에서 이전 구간 3회 × 가중치 + 다시 보낸 1회 ≤ 3이 되는 시점 (20초 경과, 가중치 2/3)
+        self.assertEqual(int(response['Retry-After']), 60 + 20)
+        self.assertEqual(throttles.stats()['card_search']['rejected'], 1)
+        # 다른 IP와 제한이 없는 액션은 영향 없음
+        self.assertEqual(self.client.get('/api/cards/search_card_names/', {'q': '블루'}, REMOTE_ADDR='10.0.0.2').status_code, 200)
+        self.assertEqual(self.client.get('/api/cards/').status_code, 200)
+
+    def test_previous_window_is_weighted(self):
+        for _ in range(3):
+            self.search()
+        # 다음 구간 시작: 이전 구간 3회가 그대로 반영되어 거부
+        self.now += 60
+        self.assertEqual(self.search().status_code, 429)
+        # 구간의 3/4이 지나면 이전 구간 가중치 1/4 → 추정 0.75 + 현재 2회
+        self.now += 45
+        self.assertEqual(self.search().status_code, 200)
+
+    def test_spoofed_forwarded_for_shares_limit(self):
+        # 프록시 없음: 클라이언트가 보낸 X-Forwarded-For는 무시하고 REMOTE_ADDR 사용
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': THROTTLE_TEST_RATES, 'NUM_PROXIES': 0,
+        }):
+            statuses = [
+                self.client.get('/api/cards/search_card_names/', {'q': '블루'},
+                                HTTP_X_FORWARDED_FOR=f'198.51.100.{i}').status_code
+                for i in range(4)
+            ]
+        self.assertEqual(statuses, [200, 200, 200, 429])
+
+        # nginx 1단: 클라이언트가 보낸 주소 뒤에 nginx가 덧붙인 실제 주소를 사용
+        cache.clear()
+        throttles.CardActionThrottle.previous_counts.clear()
+        throttles.CardActionThrottle.blocked_until.clear()
+        with override_settings(REST_FRAMEWORK={
+            **settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': THROTTLE_TEST_RATES, 'NUM_PROXIES': 1,
+        }):
+            statuses = [
+                self.client.get('/api/cards/search_card_names/', {'q': '블루'},
+                                HTTP_X_FORWARDED_FOR=f'198.51.100.{i}, 203.0.113.7').status_code
+                for i in range(4)
+            ]
+            other = self.client.get('/api/cards/search_card_names/', {'q': '블루'},
+                                    HTTP_X_FORWARDED_FOR='198.51.100.1, 203.0.113.8')
+        self.assertEqual(statuses, [200, 200, 200, 429])
+        self.assertEqual(other.status_code, 200)
+
+    def test_rejected_requests_do_not_count(self):
+        for _ in range(3):
+            self.search()
+        # 제한을 넘겨 계속 재시도해도 Retry-After는 처음 거부 시각 기준, 로그는 한 번만 (DEBUG)
+        with self.assertLogs('cards.throttles', 'DEBUG') as logs:
+            retry_after = [int(self.search()['Retry-After']) for _ in range(5)]
+            self.now += 10
+            retry_after.append(int(self.search()['Retry-After']))
+        self.assertEqual(retry_after, [80] * 5 + [70])
+        self.assertEqual([record.levelname for record in logs.records], ['DEBUG'])
+        self.assertEqual(throttles.stats()['card_search']['rejected'], 6)
+        # 차단 중인 재시도는 구간 카운터를 조회하지 않음
+        with mock.patch.object(throttles.cache, 'incr', wraps=throttles.cache.incr) as incr:
+            self.assertEqual(self.search().status_code, 429)
+        self.assertEqual([call.args[0] for call in incr.call_args_list], ['cards:throttle:rejected:card_search'])
+
+        # 프로세스의 차단 시각 없이 카운터만으로도 Retry-After 직전까지 거부, 이후 허용
+        # (거부된 요청이 카운터에 남았다면 이전 구간이 4회 이상이라 계속 거부됨)
+        self.now += 69
+        throttles.CardActionThrottle.blocked_until.clear()
+        self.assertEqual(self.search().status_code, 429)
+        throttles.CardActionThrottle.blocked_until.clear()
+        self.now += 1
+        self.assertEqual(self.search().status_code, 200)
+
+    def test_fast_path_skips_cache(self):
+        throttle = throttles.CardActionThrottle()
+        view = mock.Mock(action='list', throttle_scopes={'search_card_names': 'card_search'})
+        with mock.patch.object(throttles, 'cache') as mocked_cache:
+            self.assertTrue(throttle.allow_request(mock.Mock(), view))
+        mocked_cache.assert_not_called()
+        self.assertFalse(mocked_cache.method_calls)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class PerformanceMiddlewareTests(APITestCase):
+    """요청별 성능 계측 (Server-Timing, N+1/느린 쿼리 경고, Prometheus 집계)"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([('available', 'UR', 'S', 3000), ('sold', 'N', 'B', 500)])
+        cls.admin = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+
+    def setUp(self):
+        cache.clear()
+        instrumentation.aggregator.flush()
+        instrumentation.aggregator.known_keys.clear()
+        cache.clear()
+
+    def run_middleware(self, view):
+        def get_response(request):
+            view()
+            return HttpResponse('ok')
+
+        return instrumentation.PerformanceMiddleware(get_response)(RequestFactory().get('/test/'))
+
+    def test_server_timing_header(self):
+        response = self.client.get('/api/cards/')
+        timing = response['Server-Timing']
+        self.assertRegex(timing, r'^db;dur=[\d.]+;desc="\d+ queries", ')
+        self.assertIn('serialize;dur=', timing)
+        self.assertRegex(timing, r'total;dur=[\d.]+$')
+
+    def test_flags_repeated_and_slow_queries(self):
+        def n_plus_one():
+            for card in self.cards:
+                for _ in range(5):
+                    Card.objects.filter(pk=card.pk).exists()
+
+        with self.assertLogs('cards.instrumentation', 'WARNING') as logs:
+            response = self.run_middleware(n_plus_one)
+        self.assertIn('desc="10 queries"', response['Server-Timing'])
+        self.assertEqual(len([line for line in logs.output if 'N+1' in line]), 1)
+
+        with self.settings(PERFORMANCE_METRICS={'SLOW_QUERY_MS': 0}):
+            with self.assertLogs('cards.instrumentation', 'WARNING') as logs:
+                self.run_middleware(lambda: Card.objects.count())
+        self.assertTrue(any('느린 쿼리' in line for line in logs.output))
+
+    def test_timed_outside_request_is_noop(self):
+        with instrumentation.timed('image'):
+            pass
+        with self.settings(PERFORMANCE_METRICS={'ENABLED': False}):
+            response = self.run_middleware(lambda: None)
+        self.assertFalse(response.has_header('Server-Timing'))
+
+    def test_metrics_endpoint(self):
+        self.client.get('/api/cards/')
+        self.client.get('/api/cards/')
+        self.assertIn(self.client.get('/api/cards/metrics/').status_code, (401, 403))
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get('/api/cards/metrics/')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('cards_http_requests_total{method="GET",status="200",view="card-list"} 2', body)
+        self.assertIn('cards_http_request_duration_seconds_bucket{method="GET",view="card-list",le="+Inf"} 2', body)
+        self.assertIn('cards_http_request_duration_seconds_count{method="GET",view="card-list"} 2', body)
+        self.assertIn('cards_phase_duration_seconds_total{method="GET",phase="serialize",view="card-list"}', body)
+        self.assertIn('cards_jobs{status="queued"}', body)
+        self.assertIn('cards_response_cache_requests_total{outcome="miss"}', body)
+
+
+class AsyncReadUrls:
+    """ASGI 실행(ASYNC_READ_VIEWS)과 같은 URL 구성"""
+    urlpatterns = [*card_urls.async_read_patterns, path('', include('cards.urls'))]
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class AsyncReadViewTests(TestCase):
+    """비동기 조회 뷰(cards/async_views.py)가 CardViewSet과 같은 응답을 주는지"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.cards = make_cards([
+            ('available', 'UR', 'S', 3000), ('available', 'SE', 'A', 12000), ('sold', 'N', 'B', 500),
+        ] * 10)
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블루아이즈 화이트 드래곤', '블랙 매지션')])
+
+    def setUp(self):
+        cache.clear()
+
+    async def get_both(self, url, **headers):
+        """같은 요청의 (동기 CardViewSet 응답, 비동기 뷰 응답)"""
+        # 비동기 테스트 클라이언트만 기본으로 Host 헤더를 보내므로 맞춰 줌 (ETag에 포함됨)
+        expected = await sync_to_async(self.client.get)(url, headers={'host': 'testserver', **headers})
+        await sync_to_async(cache.clear)()
+        with override_settings(ROOT_URLCONF=AsyncReadUrls):
+            actual = await self.async_client.get(url, headers=headers)
+        return expected, actual
+
+    async def test_list_matches_viewset(self):
+        for url in (
+            '/api/cards/', '/api/cards/?sale_status=available&rarity=UR,SE&ordering=price',
+            '/api/cards/?page=2', '/api/cards/?rarity=XX',
+        ):
+            expected, actual = await self.get_both(url)
+            self.assertEqual(actual.status_code, expected.status_code, url)
+            self.assertEqual(actual.json(), expected.json(), url)
+            self.assertEqual(actual.get('ETag'), expected.get('ETag'), url)
+
+        # cursor 링크를 따라가도 같은 결과
+        expected, actual = await self.get_both('/api/cards/?cursor=')
+        next_url = actual.json()['next'].replace('http://testserver', '')
+        expected, actual = await self.get_both(next_url)
+        self.assertEqual(actual.json(), expected.json())
+        self.assertEqual(len(actual.json()['results']), 10)
+
+    async def test_list_cache_and_conditional_get(self):
+        with override_settings(ROOT_URLCONF=AsyncReadUrls):
+            first = await self.async_client.get('/api/cards/')
+            second = await self.async_client.get('/api/cards/')
+            not_modified = await self.async_client.get('/api/cards/', headers={'If-None-Match': first['ETag']})
+        self.assertEqual((first['X-Cache'], second['X-Cache']), ('MISS', 'HIT'))
+        self.assertEqual(second.content, first.content)
+        self.assertEqual(not_modified.status_code, 304)
+        # 비동기 요청에서도 쿼리가 계측됨
+        self.assertRegex(first['Server-Timing'], r'^db;dur=[\d.]+;desc="[1-9]\d* queries"')
+
+    async def test_detail_and_name_search_match_viewset(self):
+        for url in (f'/api/cards/{self.cards[0].id}/', '/api/cards/999999/', '/api/cards/search_card_names/?q=블루'):
+            expected, actual = await self.get_both(url)
+            self.assertEqual((actual.status_code, actual.json()), (expected.status_code, expected.json()), url)
+
+    async def test_writes_use_viewset(self):
+        with override_settings(ROOT_URLCONF=AsyncReadUrls):
+            response = await self.async_client.post('/api/cards/', {'name': '블랙 매지션'})
+            self.assertIn(response.status_code, (401, 403))
+            response = await self.async_client.delete(f'/api/cards/{self.cards[0].id}/')
+            self.assertIn(response.status_code, (401, 403))
+        self.assertTrue(await Card.objects.filter(pk=self.cards[0].id).aexists())
+
+
+# 테스트에서는 파생 이미지를 한 종류만 만들어 빠르게
+FAST_DERIVATIVES = {'WIDTHS': [200], 'FORMATS': ['jpeg'], 'QUALITY': {'jpeg': 80}}
+
+
+class BenchmarkResultTests(SimpleTestCase):
+    """벤치마크 결과 요약/비교"""
+
+    def test_parse_count(self):
+        self.assertEqual([benchmarks.parse_count(text) for text in ('10k', '100K', '1m', '2500', '1.5k')],
+                         [10_000, 100_000, 1_000_000, 2500, 1500])
+
+    def test_summarize_percentiles(self):
+        summary = benchmarks.summarize([i / 1000 for i in range(100, 0, -1)], errors=2, elapsed=2.0)
+        self.assertEqual((summary['requests'], summary['errors'], summary['rps']), (100, 2, 50.0))
+        self.assertEqual((summary['p50'], summary['p95'], summary['p99'], summary['max']), (0.05, 0.095, 0.099, 0.1))
+        self.assertIsNone(benchmarks.summarize([], errors=0, elapsed=1.0)['p50'])
+
+    def test_compare_flags_regressions(self):
+        baseline = {
+            'micro': {'serializer.detail': {'median': 0.001}, 'name_search.autocomplete': {'median': 0.002}},
+            'load': {'list': {'requests': 500, 'p50': 0.020, 'p95': 0.050, 'p99': 0.080, 'rps': 300}},
+        }
+        current = {
+            'micro': {'serializer.detail': {'median': 0.0012}, 'name_search.autocomplete': {'median': 0.0021},
+                      'optimize_card_image': {'median': 1.0}},
+            # p50 15% 증가는 부하 기준(20%) 이내, p99는 표본이 적어 비교하지 않음
+            'load': {'list': {'requests': 500, 'p50': 0.023, 'p95': 0.050, 'p99': 0.5, 'rps': 200}},
+        }
+        regressions = benchmarks.compare(baseline, current)
+        self.assertEqual(
+            [(item['name'], item['metric']) for item in regressions],
+            [('micro.serializer.detail', 'median'), ('load.list', 'rps')],
+        )
+        self.assertAlmostEqual(regressions[0]['change'], 0.2)
+        self.assertEqual(benchmarks.compare(baseline, baseline), [])
+
+
+@override_settings(IMAGE_DERIVATIVES=FAST_DERIVATIVES)
+class SeedCatalogueTests(TestCase):
+    """성능 측정용 카탈로그 생성/삭제"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = Path(media_root)
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블루아이즈 화이트 드래곤', '블랙 매지션')])
+
+    def files(self):
+        return sorted(path for path in self.media_root.rglob('*') if path.is_file())
+
+    def test_seed_and_clear(self):
+        existing = make_cards([('available', 'N', 'A', 100)])
+        with CaptureQueriesContext(connection) as queries:
+            result = benchmarks.seed_catalogue(30, images=2, batch_size=20, log=lambda message: None)
+        self.assertEqual((result['created'], result['images']), (30, 2))
+        # 카드는 batch_size개씩 INSERT 한 번
+        self.assertEqual(sum(1 for query in queries if query['sql'].startswith('INSERT INTO "cards_card"')), 2)
+
+        seeded = Card.objects.filter(serial_number__startswith=benchmarks.SEED_SERIAL_PREFIX)
+        self.assertEqual(seeded.count(), 30)
+        self.assertEqual(set(seeded.values_list('name', flat=True)) - {'블루아이즈 화이트 드래곤', '블랙 매지션'}, set())
+        self.assertEqual(set(seeded.values_list('image_status', flat=True)), {Card.IMAGE_STATUS_DONE})
+        # 공유 파일의 참조 횟수 = 그 파일을 쓰는 카드 수
+        self.assertEqual(len(self.files()), 4)
+        for blob in MediaBlob.objects.all():
+            users = sum(1 for card in seeded if blob.name in card.file_names())
+            self.assertEqual(blob.refcount, users, blob.name)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = benchmarks.clear_seeded(batch_size=20, log=lambda message: None)
+        self.assertEqual(result['deleted'], 30)
+        # 테스트에서는 커밋 후 등록되는 참조 해제 작업을 직접 처리
+        self.assertEqual(benchmarks._release_files_now(), 8)
+        self.assertEqual(list(Card.objects.values_list('id', flat=True)), [existing[0].id])
+        self.assertFalse(MediaBlob.objects.exists())
+        self.assertEqual(self.files(), [])
+
+    def test_serials_continue_after_deleted_seed_cards(self):
+        benchmarks.seed_catalogue(3, images=1, log=lambda message: None)
+        Card.objects.filter(serial_number=f'{benchmarks.SEED_SERIAL_PREFIX}0000000').delete()
+        benchmarks.seed_catalogue(2, images=1, log=lambda message: None)
+        self.assertEqual(
+            sorted(Card.objects.filter(serial_number__startswith=benchmarks.SEED_SERIAL_PREFIX)
+                   .values_list('serial_number', flat=True)),
+            [f'{benchmarks.SEED_SERIAL_PREFIX}{number:07d}' for number in (1, 2, 3, 4)],
+        )
+
+    def test_requires_card_names(self):
+        CardName.objects.all().delete()
+        with self.assertRaises(benchmarks.NoCardNamesError):
+            benchmarks.seed_catalogue(10, log=lambda message: None)
+
+
+class BenchmarkCommandTests(SimpleTestCase):
+    """python manage.py benchmark: 결과 저장과 기준 결과 비교"""
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory, ignore_errors=True)
+        self.output = os.path.join(directory, 'result.json')
+        self.baseline = os.path.join(directory, 'baseline.json')
+        for target, patched in ((benchmarks, 'run_micro'), (benchmarks, 'environment')):
+            patcher = mock.patch.object(target, patched)
+            self.addCleanup(patcher.stop)
+            setattr(self, patched, patcher.start())
+        self.environment.return_value = {'database': 'sqlite', 'cards': 0, 'card_names': 0, 'commit': 'abc123'}
+        self.run_micro.return_value = {'serializer.detail': {'median': 0.002, 'min': 0.002, 'number': 1, 'rounds': 1}}
+
+    def run_command(self, *args):
+        out = io.StringIO()
+        call_command('benchmark', '--micro-only', '--output', self.output, *args, stdout=out)
+        return out.getvalue()
+
+    def test_writes_json_and_compares(self):
+        self.run_command()
+        with open(self.output, encoding='utf-8') as f:
+            result = json.load(f)
+        self.assertEqual(result['micro']['serializer.detail']['median'], 0.002)
+        self.assertNotIn('load', result)
+
+        shutil.copy(self.output, self.baseline)
+        self.assertIn('느려진 항목 없음', self.run_command('--compare', self.baseline))
+        self.run_micro.return_value = {'serializer.detail': {'median': 0.003}}
+        with self.assertRaisesMessage(CommandError, '1개 항목'):
+            self.run_command('--compare', self.baseline)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    IMAGE_DERIVATIVES=FAST_DERIVATIVES,
+)
+class LoadScenarioTests(TransactionTestCase):
+    """프로세스 안의 WSGI 서버로 실제 HTTP 부하 시나리오 실행"""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        media = override_settings(MEDIA_ROOT=media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+        self.media_root = Path(media_root)
+        cache.clear()
+        CardName.objects.bulk_create([CardName(name=name) for name in ('블루아이즈 화이트 드래곤', '블랙 매지션')])
+        self.cards = make_cards([('available', 'UR', 'S', 3000), ('sold', 'N', 'B', 500)])
+
+    def test_reports_latency_and_cleans_up(self):
+        override = None
+        concurrency = 2
+        shared = connections['default']
+        if shared.vendor == 'sqlite' and shared.is_in_memory_db():
+            # 메모리 SQLite는 연결마다 DB가 다르므로 서버 스레드가 테스트의 연결을 공유 (LiveServerTestCase와 동일)
+            override = {'default': shared}
+            concurrency = 1
+            shared.inc_thread_sharing()
+            self.addCleanup(shared.dec_thread_sharing)
+
+        results = benchmarks.run_load_scenarios(
+            requests=6, concurrency=concurrency, log=lambda message: None, connections_override=override,
+        )
+        self.assertEqual(set(results), {'list', 'filter', 'detail', 'autocomplete', 'upload'})
+        for name, summary in results.items():
+            self.assertEqual((summary['requests'], summary['errors']), (6, 0), name)
+            self.assertTrue(0 < summary['p50'] <= summary['p95'] <= summary['p99'] <= summary['max'], name)
+            self.assertGreater(summary['rps'], 0)
+
+        # 등록 시나리오의 카드/작업/이미지, 임시 관리자는 정리됨
+        self.assertEqual(sorted(Card.objects.values_list('id', flat=True)), sorted(card.id for card in self.cards))
+        self.assertFalse(Job.objects.exists())
+        self.assertFalse(User.objects.exists())
+        self.assertEqual([path for path in self.media_root.rglob('*') if path.is_file()], [])
+
+    @skipUnless(connection.vendor == 'postgresql', 'ASGI 서버 스레드는 테스트의 DB 연결을 공유할 수 없음 (메모리 SQLite)')
+    def test_server_comparison(self):
+        results = benchmarks.run_server_comparison(
+            requests=6, concurrency=4, workers=2, scenarios=['list', 'detail', 'upload'], log=lambda message: None,
+        )
+        self.assertEqual(set(results), {'wsgi:list', 'wsgi:detail', 'asgi:list', 'asgi:detail'})
+        for name, summary in results.items():
+            self.assertEqual((summary['requests'], summary['errors']), (6, 0), name)
+
+        # 결과는 부하 시나리오와 같은 기준으로 비교됨
+        slower = {name: {**summary, 'rps': summary['rps'] / 2} for name, summary in results.items()}
+        regressions = benchmarks.compare({'servers': results}, {'servers': slower})
+        self.assertIn(('servers.asgi:list', 'rps'), [(item['name'], item['metric']) for item in regressions])
 
-# Create your tests here.
@@ -0,0 +1,155 @@
+"""
+액션별 요청 빈도 제한 (DRF throttle)
+
+ViewSet에 `throttle_scopes = {액션: 범위}`를 지정하고, 범위별 제한은
+REST_FRAMEWORK['DEFAULT_THROTTLE_RATES']에서 설정합니다 (예: 'card_upload': '60/min').
+
+- 알고리즘: 슬라이딩 윈도 카운터. 현재 구간의 요청 수에 이전 구간의 요청 수를 남은 비율만큼
+  더해 추정하므로, 고정 구간 방식처럼 구간 경계에서 두 배까지 몰리지 않습니다.
+- 카운터는 CACHES['default']의 원자적 incr로 증가시키므로 동시 요청에도 누락되지 않으며,
+  운영(REDIS_URL)에서는 모든 워커가 같은 카운터를 공유합니다 (locmem이면 프로세스별).
+- 거부한 요청은 카운터에서 다시 빼므로(decr) DRF 기본 throttle처럼 허용된 요청만 구간에 남고,
+  제한을 넘겨 계속 재시도해도 Retry-After가 뒤로 밀리지 않습니다.
+- 끝난 이전 구간의 요청 수는 더 바뀌지 않으므로 프로세스에 보관하여, 허용되는 요청은
+  캐시 요청 한 번(incr)만 사용합니다. 워커 간에 정확히 세기 위한 것으로, 제한이 있는 액션은
+  이 왕복 시간(Redis 기준 수백 µs)이 추가됩니다. 제한이 없는 액션은 캐시를 사용하지 않습니다.
+- 제한을 넘으면 429와 Retry-After 헤더로 응답하고, 범위별 거부 횟수를 기록합니다 (stats()).
+  같은 클라이언트는 Retry-After까지 이 프로세스에서 카운터를 조회하지 않고 바로 거부하며,
+  로그는 차단을 시작할 때만 DEBUG 수준으로 남깁니다 (거부 횟수는 stats()로 확인).
+"""
+import logging
+import math
+
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+logger = logging.getLogger(__name__)
+
+REJECTED_KEY = 'cards:throttle:rejected:{scope}'
+# 프로세스에 보관하는 이전 구간 요청 수/차단 시각의 최대 항목 수
+MAX_PREVIOUS_COUNTS = 10000
+
+
+def _incr(key, timeout):
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # 키가 없으면(새 구간) 생성, 동시에 생성된 경우 한 번 더 증가
+        if cache.add(key, 1, timeout=timeout):
+            return 1
+        return cache.incr(key)
+
+
+class CardActionThrottle(SimpleRateThrottle):
+    """view.throttle_scopes[view.action]의 범위로 제한하는 슬라이딩 윈도 throttle"""
+    cache_format = 'cards:throttle:{scope}:{ident}:{window}'
+    # 이전 구간 키 → 요청 수 (구간이 끝난 뒤에는 변하지 않음)
+    previous_counts = {}
+    # (범위, 클라이언트) → 이 프로세스에서 바로 거부할 시각 (Retry-After)
+    blocked_until = {}
+
+    def __init__(self):
+        # 범위가 액션마다 다르므로 allow_request에서 결정 (SimpleRateThrottle.__init__ 생략)
+        self.wait_seconds = None
+
+    def get_ident(self, request):
+        """로그인 사용자는 사용자별, 그 외에는 클라이언트 IP별
+
+        X-Forwarded-For는 클라이언트가 임의로 보낼 수 있으므로 REST_FRAMEWORK['NUM_PROXIES']가
+        설정된 경우에만 사용합니다. 이때 신뢰하는 프록시(nginx)가 덧붙인 오른쪽 주소를 쓰는
+        DRF BaseThrottle.get_ident를 따르고, 설정되지 않았으면 REMOTE_ADDR만 사용합니다.
+        """
+        if request.user and request.user.is_authenticated:
+            return f'user-{request.user.pk}'
+        if api_settings.NUM_PROXIES is not None:
+            return super().get_ident(request) or 'unknown'
+        return request.META.get('REMOTE_ADDR') or 'unknown'
+
+    def allow_request(self, request, view):
+        scope = getattr(view, 'throttle_scopes', {}).get(getattr(view, 'action', None))
+        if scope is None:
+            return True
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+        self.scope = scope
+        self.num_requests, self.duration = self.parse_rate(rate)
+
+        ident = self.get_ident(request)
+        now = self.timer()
+        blocked = self.blocked_until.get((scope, ident))
+        if blocked is not None:
+            if now < blocked:
+                self.wait_seconds = max(1, math.ceil(blocked - now))
+                _incr(REJECTED_KEY.format(scope=scope), timeout=None)
+                return False
+            self.blocked_until.pop((scope, ident), None)
+
+        window = int(now // self.duration)
+        elapsed = now - window * self.duration
+
+        key = self._key(ident, window)
+        count = _incr(key, timeout=self.duration * 2)
+        previous = self._previous_count(ident, window - 1)
+        weight = 1 - elapsed / self.duration
+        if previous * weight + count <= self.num_requests:
+            return True
+
+        # 거부한 요청은 구간의 요청 수에 남기지 않음
+        try:
+            cache.decr(key)
+        except ValueError:
+            pass
+        self.wait_seconds = self._retry_after(count, previous, elapsed)
+        if len(self.blocked_until) >= MAX_PREVIOUS_COUNTS:
+            self.blocked_until.clear()
+        self.blocked_until[(scope, ident)] = now + self.wait_seconds
+        _incr(REJECTED_KEY.format(scope=scope), timeout=None)
+        logger.debug('요청 빈도 제한 초과: scope=%s, ident=%s, %s초 후 재시도', scope, ident, self.wait_seconds)
+        return False
+
+    def wait(self):
+        return self.wait_seconds
+
+    def _key(self, ident, window):
+        return self.cache_format.format(scope=self.scope, ident=ident, window=window)
+
+    def _previous_count(self, ident, window):
+        key = self._key(ident, window)
+        count = self.previous_counts.get(key)
+        if count is None:
+            count = cache.get(key, 0)
+            if len(self.previous_counts) >= MAX_PREVIOUS_COUNTS:
+                self.previous_counts.clear()
+            self.previous_counts[key] = count
+        return count
+
+    def _retry_after(self, count, previous, elapsed):
+        """다시 보낸 요청이 허용될 때까지의 시간(초)
+
+        count: 이번 요청을 포함한 현재 구간의 요청 수 (이번 요청은 거부되므로 허용된 요청은 count - 1)
+        """
+        if count <= self.num_requests and previous:
+            # 이번 구간 안에서 이전 구간의 가중치가 충분히 줄어드는 시점
+            seconds = self.duration * (1 - (self.num_requests - count) / previous) - elapsed
+        else:
+            # 다음 구간에서 이번 구간(허용된 요청)의 가중치 + 다시 보낸 요청 1회가 제한 이하가 되는 시점
+            allowed = count - 1
+            seconds = self.duration - elapsed
+            if allowed > self.num_requests - 1:
+                seconds += self.duration * (1 - (self.num_requests - 1) / allowed)
+        return max(1, math.ceil(seconds))
+
+
+def stats():
+    """범위별 거부 횟수 (공유 캐시면 전체 워커 합계)"""
+    scopes = list(api_settings.DEFAULT_THROTTLE_RATES)
+    values = cache.get_many([REJECTED_KEY.format(scope=scope) for scope in scopes])
+    return {
+        scope: {
+            'rate': api_settings.DEFAULT_THROTTLE_RATES[scope],
+            'rejected': values.get(REJECTED_KEY.format(scope=scope), 0),
+        }
+        for scope in scopes
+    }
@@ -0,0 +1,126 @@
+"""
+카드 판매 상태 변경 (판매중 / 예약중 / 판매완료)
+
+상태 변경은 허용된 전이(Card.SALE_STATUS_TRANSITIONS)만 가능하며, 조건부 UPDATE 한 번으로
+처리합니다:
+
+    UPDATE cards_card SET sale_status = %s, updated_at = %s
+    WHERE id = %s AND sale_status = <이전 상태> RETURNING ...
+
+- 모델을 읽고 save()하지 않으므로 모든 컬럼을 다시 쓰거나 post_save(이미지 처리) 시그널이
+  실행되지 않습니다 (update_fields=['sale_status', 'updated_at']와 같은 범위의 변경).
+- 두 관리자가 동시에 같은 카드의 상태를 바꾸면 먼저 커밋된 쪽만 적용되고, 나머지는
+  이전 상태 조건이 맞지 않아 TransitionConflict가 발생합니다 (API는 409).
+- 적용된 변경은 CardStatusTransition에 기록하고, 같은 트랜잭션에서 재고 통계(cards/inventory_stats.py)를 갱신합니다.
+
+UPDATE ... RETURNING은 PostgreSQL과 SQLite(3.35+)에서 지원됩니다.
+"""
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import inventory_stats, response_cache
+from .models import Card, CardStatusTransition
+
+
+class TransitionError(Exception):
+    """상태 변경 실패 (current_status: 현재 카드 상태)"""
+
+    def __init__(self, message, current_status):
+        super().__init__(message)
+        self.current_status = current_status
+
+
+class TransitionNotAllowed(TransitionError):
+    """허용되지 않는 상태 변경 (예: 판매완료 → 예약중)"""
+
+
+class TransitionConflict(TransitionError):
+    """다른 요청이 먼저 상태를 바꿔 요청한 이전 상태와 맞지 않음"""
+
+
+def is_allowed(from_status, to_status):
+    return to_status in Card.SALE_STATUS_TRANSITIONS.get(from_status, ())
+
+
+def _returning_update(card_id, from_status, to_status, now):
+    """조건부 UPDATE ... RETURNING (조건이 맞지 않으면 None)"""
+    quote = connection.ops.quote_name
+    fields = Card._meta.concrete_fields
+    table = Card._meta.db_table
+    updated_at = Card._meta.get_field('updated_at').get_db_prep_value(now, connection)
+    sql = (
+        f"UPDATE {quote(table)} SET {quote('sale_status')} = %s, {quote('updated_at')} = %s "
+        f"WHERE {quote('id')} = %s AND {quote('sale_status')} = %s "
+        f"RETURNING {', '.join(quote(field.column) for field in fields)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [to_status, updated_at, card_id, from_status])
+        row = cursor.fetchone()
+    if row is None:
+        return None
+
+    # ORM 조회와 같은 값 변환(날짜/JSON/Decimal 등)을 적용해 모델 인스턴스로 만듦
+    values = []
+    for field, value in zip(fields, row):
+        column = field.get_col(table)
+        for converter in connection.ops.get_db_converters(column) + column.get_db_converters(connection):
+            value = converter(value, column, connection)
+        values.append(value)
+    return Card.from_db(connection.alias, [field.attname for field in fields], values)
+
+
+def transition(card_id, to_status, from_status=None, user=None):
+    """카드 판매 상태 변경, (카드, 변경 여부) 반환
+
+    from_status: 클라이언트가 알고 있는 현재 상태. 생략하면 현재 상태를 먼저 조회
+    (조회와 변경 사이에 다른 요청이 상태를 바꾸면 마찬가지로 충돌 처리).
+    이미 요청한 상태이면 변경 없이 (카드, False)를 반환합니다.
+
+    예외: Card.DoesNotExist, TransitionNotAllowed, TransitionConflict
+    """
+    if to_status not in Card.SALE_STATUS_TRANSITIONS:
+        raise ValueError(f"알 수 없는 판매 상태: {to_status}")
+
+    client_status = from_status is not None
+    with transaction.atomic():
+        if from_status is None:
+            from_status = Card.objects.filter(pk=card_id).values_list('sale_status', flat=True).first()
+            if from_status is None:
+                raise Card.DoesNotExist(f"카드 #{card_id}가 없습니다.")
+
+        if from_status != to_status:
+            if not is_allowed(from_status, to_status):
+                if not client_status:
+                    raise TransitionNotAllowed(
+                        f"{from_status} 상태에서 {to_status}(으)로 변경할 수 없습니다.", from_status
+                    )
+                # 클라이언트가 보낸 이전 상태는 오래되었을 수 있으므로 아래에서 실제 상태를 읽어 판단
+                card = None
+            else:
+                card = _returning_update(card_id, from_status, to_status, timezone.now())
+            if card is not None:
+                CardStatusTransition.objects.create(
+                    card_id=card_id, card_number=card_id,
+                    from_status=from_status, to_status=to_status,
+                    user=user if user is not None and user.is_authenticated else None,
+                )
+                # 시그널/CardQuerySet을 거치지 않으므로 재고 통계 갱신과 응답 캐시 무효화를 직접 처리
+                inventory_stats.record(
+                    before=[(from_status, card.rarity, card.condition, card.price)],
+                    after=[inventory_stats.values_of(card)],
+                )
+                response_cache.invalidate_on_commit()
+                return card, True
+
+        # 이전 상태 조건이 맞지 않음: 이미 요청한 상태면 그대로, 아니면 충돌 (오류에는 실제 현재 상태)
+        card = Card.objects.get(pk=card_id)
+        if card.sale_status == to_status:
+            return card, False
+        if card.sale_status == from_status:
+            # 클라이언트가 보낸 이전 상태가 맞고 그 상태에서 허용되지 않는 변경
+            raise TransitionNotAllowed(
+                f"{from_status} 상태에서 {to_status}(으)로 변경할 수 없습니다.", card.sale_status
+            )
+        raise TransitionConflict(
+            f"카드 상태가 이미 {card.sale_status}(으)로 변경되었습니다.", card.sale_status
+        )
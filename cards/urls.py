@@ -1,11 +1,20 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
+from . import async_views
 from .views import CardViewSet
 
 router = DefaultRouter()
 router.register(r'cards', CardViewSet)
 
+# ASGI에서는 공개 조회(목록/상세/카드명 검색)를 비동기 뷰로 처리 (쓰기 요청은 CardViewSet으로 전달)
+async_read_patterns = [
+    path('api/cards/', async_views.card_list, name='card-list'),
+    path('api/cards/search_card_names/', async_views.search_card_names, name='card-search-card-names'),
+    path('api/cards/<int:pk>/', async_views.card_detail, name='card-detail'),
+]
+
 urlpatterns = [
+    *(async_read_patterns if settings.ASYNC_READ_VIEWS else []),
     path('api/', include(router.urls)),
 ]
-
@@ -1,13 +1,28 @@
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import AllowAny, IsAdminUser
 from rest_framework.response import Response
-from django.db.models import Q
-from django.core.cache import cache
+from django.db.models import Count, Max, Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_vary_headers
+from django.utils.http import parse_etags
 from django.conf import settings
 import logging
-from .models import Card, CardName
-from .serializers import CardSerializer
+from .models import Card
+from .serializers import CardBulkUpdateSerializer, CardListSerializer, CardSerializer
+from .jobs import queue_stats
+from .bulk import bulk_update_cards
+from .importer import ArchiveError, import_cards
+from . import exporter, instrumentation, inventory_stats, name_dictionary, name_index, response_cache, throttles, transitions
+from .search import search_cards
+from .storage import release_on_commit
+from .filters import choice_lookups, filter_cards
+from .pagination import CardPagination
+from .throttles import CardActionThrottle
 
 logger = logging.getLogger(__name__)
 
@@ -15,18 +30,92 @@ logger = logging.getLogger(__name__)
 class CardViewSet(viewsets.ModelViewSet):
     queryset = Card.objects.all()
     serializer_class = CardSerializer
+    pagination_class = CardPagination
+    throttle_classes = [CardActionThrottle]
+    # 액션별 요청 빈도 제한 범위 (제한 값은 settings.REST_FRAMEWORK['DEFAULT_THROTTLE_RATES'])
+    throttle_scopes = {
+        'create': 'card_upload',
+        'update': 'card_upload',
+        'partial_update': 'card_upload',
+        'bulk_import': 'card_upload',
+        'search_card_names': 'card_search',
+        'get_all_card_names': 'card_names',
+    }
     
     def get_permissions(self):
         """
         카드 생성(등록), 수정, 삭제, 판매 상태 변경, 카드명 목록 조회는 admin만 가능
         일반 카드 조회는 모두 가능
         """
-        if self.action in ['create', 'update', 'partial_update', 'destroy', 'mark_as_sold', 'mark_as_available', 'mark_as_reserved', 'check_auth', 'get_all_card_names']:
+        if self.action in ['create', 'update', 'partial_update', 'destroy', 'mark_as_sold', 'mark_as_available', 'mark_as_reserved', 'bulk_update', 'bulk_import', 'check_auth', 'get_all_card_names', 'queue_status', 'cache_status', 'throttle_status', 'metrics', 'stats', 'export']:
             permission_classes = [IsAdminUser]
         else:
             permission_classes = [AllowAny]
         return [permission() for permission in permission_classes]
     
+    def get_queryset(self):
+        """
+        목록 조회 시 필터/정렬 및 검색 적용
+        - sale_status, rarity, condition, min_price, max_price, ordering (cards/filters.py)
+        - ?q= 검색어가 있으면 카드명/시리얼 유사도 검색 (ordering이 없으면 유사도순)
+        """
+        queryset = super().get_queryset()
+        if self.action == 'list':
+            query = self.request.query_params.get('q', '').strip()
+            if query:
+                queryset = search_cards(queryset, query[:100])
+            queryset = filter_cards(queryset, self.request.query_params)
+            # 목록은 모델 인스턴스 대신 필요한 컬럼만 dict로 조회 (CardListSerializer)
+            queryset = queryset.values(*CardListSerializer.source_fields)
+        return queryset
+    
+    def get_serializer_class(self):
+        if self.action == 'list':
+            return CardListSerializer
+        return super().get_serializer_class()
+    
+    def list(self, request, *args, **kwargs):
+        """카드 목록 (변경이 없으면 공유 캐시의 응답 또는 304 사용)"""
+        return response_cache.cached_response(
+            request, 'list',
+            lambda: super(CardViewSet, self).list(request, *args, **kwargs),
+            self._list_validators,
+        )
+    
+    def retrieve(self, request, *args, **kwargs):
+        """카드 상세 (변경이 없으면 공유 캐시의 응답 또는 304 사용)"""
+        return response_cache.cached_response(
+            request, 'retrieve',
+            lambda: super(CardViewSet, self).retrieve(request, *args, **kwargs),
+            self._retrieve_validators,
+        )
+    
+    def _list_validators(self):
+        """목록 검증값: 필터 조건에 맞는 카드의 max(updated_at)와 개수로 만든 ETag (집계 쿼리 한 번)
+        
+        검색어(q)는 비용이 크므로 제외하고 계산 - 필터 범위 내 어떤 변경이든 값이 바뀌므로 안전함
+        max(updated_at)는 삭제 후 과거로 돌아갈 수 있고 HTTP 날짜는 초 단위라 Last-Modified는 보내지 않음
+        (If-Modified-Since만 보낸 요청은 항상 전체 응답)
+        """
+        queryset = filter_cards(Card.objects.all(), self.request.query_params)
+        stats = queryset.order_by().aggregate(last_modified=Max('updated_at'), count=Count('id'))
+        last_modified = stats['last_modified']
+        etag = response_cache.make_etag(
+            self.request, 'list', last_modified.isoformat() if last_modified else '', stats['count']
+        )
+        return etag, None
+    
+    def _retrieve_validators(self):
+        """상세 검증값: 카드의 updated_at (없으면 None → 일반 404 처리)"""
+        lookup = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+        try:
+            last_modified = Card.objects.filter(pk=lookup).values_list('updated_at', flat=True).first()
+        except (TypeError, ValueError):
+            return None
+        if last_modified is None:
+            return None
+        return response_cache.make_etag(self.request, 'retrieve', last_modified.isoformat()), last_modified
+    
     def get_serializer_context(self):
         context = super().get_serializer_context()
         context['request'] = self.request
@@ -37,47 +126,105 @@ class CardViewSet(viewsets.ModelViewSet):
         # sale_status는 항상 'available'로 설정 (보안)
         serializer.save(sale_status='available')
     
+    def perform_update(self, serializer):
+        """이미지가 교체되면 최적화 이미지를 초기화하여 다시 처리되도록 함
+        
+        이전 원본/파생 이미지 파일은 커밋 후 release_files 작업으로 참조 해제
+        """
+        if serializer.validated_data.get('image'):
+            previous = serializer.instance.file_names()
+            serializer.save(image_optimized=None, image_variants={}, image_status=Card.IMAGE_STATUS_PENDING)
+            release_on_commit(previous)
+        else:
+            serializer.save()
+    
     @action(detail=True, methods=['patch'])
     def mark_as_sold(self, request, pk=None):
         """판매 완료로 표시"""
-        card = self.get_object()
-        card.sale_status = 'sold'
-        card.save()
-        serializer = self.get_serializer(card)
-        return Response(serializer.data)
+        return self._transition(request, pk, 'sold')
     
     @action(detail=True, methods=['patch'])
     def mark_as_available(self, request, pk=None):
         """판매중으로 표시"""
-        card = self.get_object()
-        card.sale_status = 'available'
-        card.save()
-        serializer = self.get_serializer(card)
-        return Response(serializer.data)
+        return self._transition(request, pk, 'available')
     
     @action(detail=True, methods=['patch'])
     def mark_as_reserved(self, request, pk=None):
         """예약중으로 표시"""
-        card = self.get_object()
-        card.sale_status = 'reserved'
-        card.save()
+        return self._transition(request, pk, 'reserved')
+    
+    def _transition(self, request, pk, to_status):
+        """조건부 UPDATE 한 번으로 판매 상태 변경 (cards/transitions.py)
+        
+        요청 본문의 from(클라이언트가 본 현재 상태)과 실제 상태가 다르거나
+        허용되지 않는 변경이면 409와 현재 상태를 반환
+        """
+        from_status = request.data.get('from') or None
+        if from_status is not None and from_status not in Card.SALE_STATUS_TRANSITIONS:
+            return Response({'error': f'알 수 없는 판매 상태입니다: {from_status}'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            card, _ = transitions.transition(int(pk), to_status, from_status=from_status, user=request.user)
+        except (Card.DoesNotExist, ValueError):
+            raise Http404
+        except transitions.TransitionError as e:
+            return Response(
+                {'error': str(e), 'current_status': e.current_status},
+                status=status.HTTP_409_CONFLICT,
+            )
         serializer = self.get_serializer(card)
         return Response(serializer.data)
     
+    @action(detail=False, methods=['post'])
+    def bulk_update(self, request):
+        """여러 카드의 판매 상태/가격 일괄 변경 (관리자 전용)
+        
+        UPDATE ... WHERE id IN (...) 한 번으로 처리하고 id별 결과(updated/unchanged/rejected/not_found)를 반환
+        판매 상태는 허용된 전이만 적용 (그 외는 rejected)
+        """
+        serializer = CardBulkUpdateSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = bulk_update_cards(serializer.validated_data['ids'], serializer.changes, user=request.user)
+        
+        summary = {outcome: 0 for outcome in ('updated', 'unchanged', 'rejected', 'not_found')}
+        for outcome in results.values():
+            summary[outcome] += 1
+        logger.info(f"카드 일괄 수정: {serializer.changes} - {summary}")
+        return Response({
+            **summary,
+            'results': [{'id': card_id, 'result': outcome} for card_id, outcome in results.items()],
+        })
+    
+    @action(detail=False, methods=['post'], parser_classes=[MultiPartParser])
+    def bulk_import(self, request):
+        """이미지 ZIP(archive) + CSV/JSON manifest로 카드 일괄 등록 (관리자 전용, cards/importer.py)
+        
+        manifest 파일을 따로 보내지 않으면 ZIP 안의 manifest.csv/manifest.json 사용
+        dry_run=true이면 검증 결과만 반환. 응답은 행별 결과(created/valid/error)
+        """
+        archive = request.FILES.get('archive')
+        if archive is None:
+            return Response({'error': 'archive(ZIP) 파일을 첨부해주세요.'}, status=status.HTTP_400_BAD_REQUEST)
+        dry_run = str(request.data.get('dry_run', '')).lower() in ('1', 'true', 'yes')
+        try:
+            report = import_cards(archive, manifest=request.FILES.get('manifest'), dry_run=dry_run)
+        except ArchiveError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED)
+    
     @action(detail=False, methods=['get'])
     def search_card_names(self, request):
-        """카드명 자동완성 검색 (레거시 - 사용하지 않음)"""
+        """카드명 자동완성 검색 (메모리 인덱스, 초성/자모 단위 부분 일치 지원)"""
         query = request.query_params.get('q', '').strip()
         
         if not query or len(query) < 1:
             return Response({'results': []})
         
-        # 카드명 검색 (대소문자 구분 없음, 부분 일치)
-        card_names = CardName.objects.filter(
-            name__icontains=query
-        ).order_by('name')[:20]  # 최대 20개만 반환
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            limit = 20
         
-        results = [{'name': card.name} for card in card_names]
+        results = [{'name': name} for name in name_index.search(query, limit)]
         
         return Response({
             'results': results,
@@ -86,42 +233,71 @@ class CardViewSet(viewsets.ModelViewSet):
     
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def get_all_card_names(self, request):
-        """모든 카드명 목록 반환 (관리자 전용 - 프론트엔드에서 클라이언트 사이드 검색용)"""
-        # 관리자 전용이므로 Rate limiting은 간소화 (관리자 사용이므로 제한 완화)
-        client_ip = self._get_client_ip(request)
-        
-        # Rate limiting: 관리자이므로 IP당 1분에 최대 30회 요청 허용 (관리자 사용 고려)
-        cache_key = f'card_names_rate_limit_{client_ip}'
-        request_count = cache.get(cache_key, 0)
-        
-        if request_count >= 30:
-            logger.warning(
-                f'Rate limit exceeded for get_all_card_names (admin): IP={client_ip}, '
-                f'User={request.user.username if request.user.is_authenticated else "unknown"}'
-            )
-            return Response(
-                {'error': '요청이 너무 많습니다. 잠시 후 다시 시도해주세요.'},
-                status=status.HTTP_429_TOO_MANY_REQUESTS
-            )
+        """
+        모든 카드명 목록 반환 (관리자 전용 - 프론트엔드에서 클라이언트 사이드 검색용)
         
-        # Rate limit 카운터 증가 (1분 TTL)
-        cache.set(cache_key, request_count + 1, 60)
+        - 버전별로 미리 압축한 사전을 강한 ETag와 함께 반환 (변경이 없으면 304)
+        - ?since_version=N: 해당 버전 이후 추가/삭제된 카드명만 반환
+        - 요청 빈도 제한: card_names 범위 (throttle_scopes)
+        """
+        since_version = request.query_params.get('since_version')
+        if since_version is not None:
+            return self._card_name_changes(since_version)
         
-        # 데이터 반환
-        card_names = CardName.objects.all().order_by('name').values_list('name', flat=True)
-        return Response({
-            'card_names': list(card_names),
-            'count': len(card_names)
-        })
+        # 버전만 조회하여 변경이 없으면 사전을 만들거나 읽지 않고 304
+        version = name_dictionary.current_version()
+        if name_dictionary.etag_matches(parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')), version):
+            response = HttpResponseNotModified()
+            response['ETag'] = name_dictionary.etag(version)
+        else:
+            dictionary = name_dictionary.get_dictionary(version)
+            # 미리 압축해 둔 본문을 그대로 전송 (요청마다 직렬화/압축하지 않음)
+            encoding = name_dictionary.preferred_encoding(
+                request.META.get('HTTP_ACCEPT_ENCODING'), dictionary.encoded
+            )
+            body = dictionary.encoded[encoding] if encoding else dictionary.body
+            response = HttpResponse(body, content_type='application/json; charset=utf-8')
+            if encoding:
+                response['Content-Encoding'] = encoding
+            response['ETag'] = dictionary.etag_for(encoding)
+        response['Cache-Control'] = 'private, no-cache'
+        patch_vary_headers(response, ['Accept-Encoding'])
+        return response
     
-    def _get_client_ip(self, request):
-        """클라이언트 IP 주소 추출"""
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0].strip()
+    def _card_name_changes(self, since_version):
+        """?since_version=N 이후 추가/삭제된 카드명만 반환 (알 수 없는 버전이면 전체 목록)"""
+        try:
+            since_version = int(since_version)
+        except ValueError:
+            return Response({'error': 'since_version은 정수여야 합니다.'}, status=status.HTTP_400_BAD_REQUEST)
+        
+        version = name_dictionary.current_version()
+        if since_version <= 0 or since_version > version:
+            dictionary = name_dictionary.get_dictionary(version)
+            return Response({
+                'version': dictionary.version,
+                'full': True,
+                'card_names': dictionary.names,
+                'count': len(dictionary.names),
+            })
+        
+        if name_dictionary.etag_matches(
+            parse_etags(self.request.META.get('HTTP_IF_NONE_MATCH', '')), version, since_version
+        ):
+            response = HttpResponseNotModified()
         else:
-            ip = request.META.get('REMOTE_ADDR', 'unknown')
-        return ip
+            added, removed, latest = name_dictionary.changes_since(since_version)
+            response = Response({
+                'version': latest,
+                'since_version': since_version,
+                'full': False,
+                'added': added,
+                'removed': removed,
+            })
+            version = latest
+        response['ETag'] = name_dictionary.etag(version, since_version=since_version)
+        response['Cache-Control'] = 'private, no-cache'
+        return response
     
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def check_auth(self, request):
@@ -131,3 +307,81 @@ class CardViewSet(viewsets.ModelViewSet):
             'is_admin': True,
             'username': request.user.username if request.user.is_authenticated else None
         })
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def queue_status(self, request):
+        """백그라운드 작업 큐 현황 (관리자 전용)"""
+        return Response(queue_stats())
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def stats(self, request):
+        """판매 상태 × 레어리티 × 상태별 카드 수와 가격 합계 (관리자 전용)
+        
+        카드 변경 시 함께 갱신되는 재고 통계 표만 읽으므로 카드 수와 관계없이 일정한 비용
+        sale_status, rarity, condition으로 조합을 좁힐 수 있음 (목록 필터와 같은 형식, 예: rarity=UR,SE)
+        """
+        errors = {}
+        lookups = choice_lookups(request.query_params, errors)
+        if errors:
+            raise ValidationError(errors)
+        return Response(inventory_stats.summary(lookups))
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def export(self, request):
+        """필터 조건에 맞는 카드 전체를 CSV/NDJSON 파일로 스트리밍 (관리자 전용, cards/exporter.py)
+        
+        output=csv(기본값)|ndjson, gzip=true이면 .gz로 압축
+        필터/정렬/검색 파라미터는 목록과 같음 (sale_status, rarity, condition, min_price, max_price, ordering, q)
+        """
+        output_format = request.query_params.get('output', 'csv')
+        if output_format not in exporter.FORMATS:
+            raise ValidationError({'output': f"가능한 값: {', '.join(exporter.FORMATS)}"})
+        queryset = Card.objects.all()
+        query = request.query_params.get('q', '').strip()
+        if query:
+            queryset = search_cards(queryset, query[:100])
+        queryset = filter_cards(queryset, request.query_params)
+        gzip = request.query_params.get('gzip', '').lower() in ('1', 'true', 'yes')
+        export = exporter.CardExport(queryset, output_format, gzip=gzip)
+        
+        # ASGI에서는 비동기 iterator로 넘겨야 전체를 메모리에 모으지 않고 조각마다 전송
+        content = aiter(export) if isinstance(request._request, ASGIRequest) else iter(export)
+        response = StreamingHttpResponse(content, content_type=export.content_type)
+        filename = f"cards-{timezone.localtime():%Y%m%d-%H%M%S}.{export.extension}"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # nginx가 응답 전체를 버퍼링하지 않고 바로 전달하도록
+        response['X-Accel-Buffering'] = 'no'
+        return response
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_status(self, request):
+        """목록/상세 응답 캐시 적중/실패 현황 (관리자 전용)"""
+        return Response(response_cache.stats())
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def throttle_status(self, request):
+        """범위별 요청 빈도 제한 설정과 거부 횟수 (관리자 전용)"""
+        return Response(throttles.stats())
+    
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def metrics(self, request):
+        """요청 성능 지표와 캐시/요청 제한/작업 큐 현황 (Prometheus 텍스트 형식, 관리자 전용)"""
+        cache_stats = response_cache.stats()
+        queue = queue_stats()
+        extra = [
+            ('cards_response_cache_requests_total', 'counter', cache_stats['hits'], {'outcome': 'hit'}),
+            ('cards_response_cache_requests_total', 'counter', cache_stats['misses'], {'outcome': 'miss'}),
+        ]
+        extra += [
+            ('cards_throttle_rejected_total', 'counter', value['rejected'], {'scope': scope})
+            for scope, value in throttles.stats().items()
+        ]
+        extra += [
+            ('cards_jobs', 'gauge', count, {'status': job_status})
+            for job_status, count in queue['by_status'].items()
+        ]
+        extra.append(('cards_jobs_oldest_queued_seconds', 'gauge', queue['oldest_queued_seconds'], {}))
+        return HttpResponse(
+            instrumentation.prometheus_text(extra),
+            content_type='text/plain; version=0.0.4; charset=utf-8',
+        )
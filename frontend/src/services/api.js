@@ -19,9 +19,10 @@ const api = axios.create({
 })
 
 export const cardService = {
-  // 모든 카드 조회
-  getCards() {
-    return api.get('/api/cards/')
+  // 카드 목록 조회 (?cursor=로 cursor 페이지네이션 사용, 다음 페이지는 응답의 next URL로 조회)
+  // params: sale_status, rarity, condition (쉼표로 여러 값), min_price, max_price, ordering
+  getCards(url = '/api/cards/?cursor=', params = undefined) {
+    return api.get(url, { params })
   },
   
   // 카드 상세 조회
@@ -49,6 +50,26 @@ export const cardService = {
     })
   },
   
+  // 이미지 ZIP + manifest(CSV/JSON, 생략 시 ZIP 안의 manifest.csv)로 카드 일괄 등록, 행별 결과 반환
+  bulkImport(archive, manifest = null, dryRun = false) {
+    const formData = new FormData()
+    formData.append('archive', archive)
+    if (manifest) {
+      formData.append('manifest', manifest)
+    }
+    if (dryRun) {
+      formData.append('dry_run', 'true')
+    }
+    return api.post('/api/cards/bulk_import/', formData, {
+      transformRequest: [
+        (data, headers) => {
+          delete headers['Content-Type']
+          return data
+        }
+      ],
+    })
+  },
+  
   // 카드 수정
   updateCard(id, formData) {
     return api.patch(`/api/cards/${id}/`, formData, {
@@ -63,22 +84,28 @@ export const cardService = {
     return api.delete(`/api/cards/${id}/`)
   },
   
+  // 판매 상태 변경: fromStatus(화면에 표시된 현재 상태)가 실제 상태와 다르면 409
   // 판매 완료로 표시
-  markAsSold(id) {
-    return api.patch(`/api/cards/${id}/mark_as_sold/`)
+  markAsSold(id, fromStatus) {
+    return api.patch(`/api/cards/${id}/mark_as_sold/`, fromStatus ? { from: fromStatus } : {})
   },
   
   // 판매중으로 표시
-  markAsAvailable(id) {
-    return api.patch(`/api/cards/${id}/mark_as_available/`)
+  markAsAvailable(id, fromStatus) {
+    return api.patch(`/api/cards/${id}/mark_as_available/`, fromStatus ? { from: fromStatus } : {})
   },
   
   // 예약중으로 표시
-  markAsReserved(id) {
-    return api.patch(`/api/cards/${id}/mark_as_reserved/`)
+  markAsReserved(id, fromStatus) {
+    return api.patch(`/api/cards/${id}/mark_as_reserved/`, fromStatus ? { from: fromStatus } : {})
+  },
+  
+  // 여러 카드의 판매 상태/가격 일괄 변경 (changes: { sale_status, price })
+  bulkUpdate(ids, changes) {
+    return api.post('/api/cards/bulk_update/', { ids, ...changes })
   },
   
-  // 카드명 자동완성 검색 (레거시 - 사용하지 않음)
+  // 카드명 자동완성 검색 (초성/자모 단위 부분 일치)
   searchCardNames(query) {
     return api.get('/api/cards/search_card_names/', {
       params: { q: query }
@@ -86,9 +113,48 @@ export const cardService = {
   },
   
   // 모든 카드명 목록 가져오기 (클라이언트 사이드 검색용)
-  getAllCardNames() {
-    return api.get('/api/cards/get_all_card_names/')
+  // 처음에는 전체 사전(압축, ETag)을 받고, 이후에는 저장해 둔 버전 이후의 변경분만 받아 적용
+  async getAllCardNames() {
+    const cached = loadCardNameDictionary()
+    if (!cached) {
+      const { data } = await api.get('/api/cards/get_all_card_names/')
+      return saveCardNameDictionary(data.version, data.card_names)
+    }
+    const { data } = await api.get('/api/cards/get_all_card_names/', {
+      params: { since_version: cached.version }
+    })
+    if (data.full) {
+      return saveCardNameDictionary(data.version, data.card_names)
+    }
+    if (data.version === cached.version) {
+      return cached
+    }
+    const names = new Set(cached.card_names)
+    data.removed.forEach((name) => names.delete(name))
+    data.added.forEach((name) => names.add(name))
+    return saveCardNameDictionary(data.version, [...names].sort())
   },
 }
 
+const CARD_NAME_DICTIONARY_KEY = 'cardNameDictionary'
+
+function loadCardNameDictionary() {
+  try {
+    const cached = JSON.parse(localStorage.getItem(CARD_NAME_DICTIONARY_KEY))
+    return cached && Array.isArray(cached.card_names) ? cached : null
+  } catch {
+    return null
+  }
+}
+
+function saveCardNameDictionary(version, cardNames) {
+  const dictionary = { version, card_names: cardNames, count: cardNames.length }
+  try {
+    localStorage.setItem(CARD_NAME_DICTIONARY_KEY, JSON.stringify(dictionary))
+  } catch {
+    // 저장 공간이 부족하면 다음에 전체 사전을 다시 받음
+  }
+  return dictionary
+}
+
 export default api
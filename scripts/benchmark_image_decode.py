@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""
+업로드 이미지 디코딩 벤치마크 (최대 메모리 사용량 / 처리 시간)
+
+이전 방식(verify() 후 원본 해상도로 전체 디코딩하여 축소)과
+현재 방식(헤더만 검사 후 JPEG draft 모드로 축소 디코딩)을 비교합니다.
+각 방식은 별도 프로세스에서 실행하여 최대 RSS를 독립적으로 측정합니다.
+
+사용 예:
+    python scripts/benchmark_image_decode.py                    # 6000x4000 합성 JPEG로 측정
+    python scripts/benchmark_image_decode.py --image photo.jpg  # 실제 사진으로 측정
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 이미지 처리 모듈은 DB 없이 기본 설정만으로 동작
+from django.conf import settings
+if not settings.configured:
+    settings.configure()
+
+from PIL import Image
+
+from cards import imaging
+
+
+def run_legacy(path):
+    """이전 방식: verify()로 한 번 파싱하고, 다시 열어 원본 해상도로 디코딩한 뒤 각 크기로 축소"""
+    with open(path, 'rb') as f:
+        img = Image.open(f)
+        img.verify()
+
+    with Image.open(path) as img:
+        img = imaging.to_rgb(img)
+        for width in reversed(imaging.target_widths(img.width)):
+            height = int(img.height * width / img.width)
+            resized = img.resize((width, height), Image.Resampling.LANCZOS)
+            for fmt in imaging.available_formats():
+                imaging.encode(resized, fmt)
+
+
+def run_current(path):
+    """현재 방식: 헤더만 검사한 뒤 축소 디코딩으로 파생 이미지를 한 번에 생성"""
+    with open(path, 'rb') as f:
+        imaging.inspect_image(f)
+    imaging.build_derivatives(path)
+
+
+MODES = {
+    'legacy': run_legacy,
+    'current': run_current,
+}
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB)
+
+    ru_maxrss는 exec 이전(부모 프로세스) 값을 물려받으므로 Linux에서는 /proc의 VmHWM을 우선 사용
+    """
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def run_child(mode, path, repeat):
+    """자식 프로세스: 지정 방식을 repeat회 실행하고 결과를 JSON으로 출력"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        MODES[mode](path)
+        timings.append(time.perf_counter() - started)
+    print(json.dumps({
+        'mode': mode,
+        'best_seconds': min(timings),
+        'mean_seconds': sum(timings) / len(timings),
+        'peak_rss_mb': peak_rss_mb(),
+    }))
+
+
+def make_sample_image(width, height):
+    """사진과 비슷하게 압축되는 합성 JPEG 생성 (그라디언트 + 노이즈)"""
+    gradient = Image.linear_gradient('L').resize((width, height))
+    noise = Image.effect_noise((width, height), 40)
+    img = Image.merge('RGB', (gradient, noise, gradient.transpose(Image.Transpose.FLIP_LEFT_RIGHT)))
+    tmp = tempfile.NamedTemporaryFile(suffix='.jpg', delete=False)
+    img.save(tmp, 'JPEG', quality=92)
+    tmp.close()
+    return tmp.name
+
+
+def main():
+    parser = argparse.ArgumentParser(description='업로드 이미지 디코딩 벤치마크')
+    parser.add_argument('--image', help='측정할 이미지 경로 (기본값: 합성 JPEG)')
+    parser.add_argument('--size', default='6000x4000', help='합성 이미지 크기 (기본값: 6000x4000)')
+    parser.add_argument('--repeat', type=int, default=3, help='방식별 반복 횟수')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_child(args.child, args.image, args.repeat)
+        return
+
+    path = args.image
+    generated = False
+    if not path:
+        width, height = (int(v) for v in args.size.split('x'))
+        path = make_sample_image(width, height)
+        generated = True
+
+    try:
+        with Image.open(path) as img:
+            print(f"이미지: {path} ({img.format} {img.width}x{img.height}, {os.path.getsize(path) / (1024 * 1024):.1f}MB)")
+        print(f"생성 포맷: {', '.join(imaging.available_formats())}, 너비: {imaging.get_derivative_setting('WIDTHS')}")
+        print()
+        print(f"{'방식':<10}{'최소(초)':>12}{'평균(초)':>12}{'최대 RSS(MB)':>16}")
+
+        results = {}
+        for mode in MODES:
+            output = subprocess.run(
+                [sys.executable, __file__, '--child', mode, '--image', path, '--repeat', str(args.repeat)],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            results[mode] = result
+            print(f"{mode:<10}{result['best_seconds']:>12.3f}{result['mean_seconds']:>12.3f}{result['peak_rss_mb']:>16.1f}")
+
+        legacy, current = results['legacy'], results['current']
+        print()
+        print(f"처리 시간: {legacy['best_seconds'] / current['best_seconds']:.1f}배 빠름")
+        print(f"최대 메모리: {legacy['peak_rss_mb'] - current['peak_rss_mb']:.1f}MB 감소")
+    finally:
+        if generated:
+            os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python
+"""
+카드 목록 직렬화 벤치마크 (rows/sec)
+
+기존 CardSerializer(모델 인스턴스, 필드별 변환)와 목록 전용 CardListSerializer
+(values() dict 행, 요청당 한 번 계산한 URL/표시 이름)를 같은 데이터로 비교합니다.
+DB 없이 메모리에서 만든 행을 사용하므로 순수 직렬화 비용만 측정하며,
+두 결과가 같은 JSON인지도 함께 확인합니다.
+
+사용 예:
+    python scripts/benchmark_serializers.py                 # 20행(기본 페이지 크기) / 1000행
+    python scripts/benchmark_serializers.py --rows 100 --repeat 50
+"""
+import argparse
+import datetime
+import decimal
+import json
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+# 직렬화만 측정하므로 DB 연결 없이 최소 설정으로 실행
+import django
+from django.conf import settings
+if not settings.configured:
+    settings.configure(
+        INSTALLED_APPS=[
+            'django.contrib.contenttypes',
+            'django.contrib.auth',
+            'rest_framework',
+            'cards',
+        ],
+        DATABASES={'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': ':memory:'}},
+        MEDIA_URL='/media/',
+        TIME_ZONE='Asia/Seoul',
+        USE_TZ=True,
+        ALLOWED_HOSTS=['*'],
+        DEFAULT_AUTO_FIELD='django.db.models.BigAutoField',
+    )
+    django.setup()
+
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from cards.models import Card
+from cards.serializers import CardListSerializer, CardSerializer
+
+
+def make_rows(count):
+    """values() 결과와 같은 형태의 합성 행 (파생 이미지 3포맷 x 3해상도 포함)"""
+    now = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+    rows = []
+    for i in range(count):
+        digest = f'{i:064x}'
+        formats = {
+            fmt: [
+                {'width': width, 'height': width * 7 // 5, 'name': f'cards/variants/{digest[:2]}/{digest}-{width}.{ext}'}
+                for width in (320, 640, 1280)
+            ]
+            for fmt, ext in (('avif', 'avif'), ('webp', 'webp'), ('jpeg', 'jpg'))
+        }
+        rows.append({
+            'id': i + 1,
+            'name': f'블루아이즈 화이트 드래곤 {i}',
+            'serial_number': f'LOB-{i:03d}',
+            'image': f'cards/{digest[:2]}/{digest}.jpg',
+            'image_optimized': formats['jpeg'][-1]['name'],
+            'image_status': Card.IMAGE_STATUS_DONE,
+            'image_variants': {'width': 1280, 'height': 1792, 'formats': formats},
+            'condition': 'SABC'[i % 4],
+            'rarity': ('N', 'R', 'SR', 'UR', 'SE')[i % 5],
+            'price': decimal.Decimal(1000 + i),
+            'sale_status': ('available', 'reserved', 'sold')[i % 3],
+            'created_at': now - datetime.timedelta(minutes=i),
+            'updated_at': now,
+        })
+    return rows
+
+
+def make_request():
+    request = APIRequestFactory().get(
+        '/api/cards/', HTTP_X_FORWARDED_HOST='cards.example.com', HTTP_X_FORWARDED_PROTO='https',
+    )
+    return Request(request)
+
+
+def measure(serialize, repeat):
+    """repeat회 중 가장 빠른 실행 시간(초)"""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        serialize()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(rows_count, repeat):
+    rows = make_rows(rows_count)
+    instances = [Card(**row) for row in rows]
+
+    def current():
+        return CardSerializer(instances, many=True, context={'request': make_request()}).data
+
+    def fast():
+        return CardListSerializer(rows, many=True, context={'request': make_request()}).data
+
+    # 두 serializer의 JSON이 같은지 확인 (다르면 벤치마크 의미가 없음)
+    expected = json.loads(json.dumps(current(), default=str))
+    actual = json.loads(json.dumps(fast(), default=str))
+    if expected != actual:
+        for old, new in zip(expected, actual):
+            for key in old:
+                if old[key] != new.get(key):
+                    print(f'불일치: {key}: {old[key]!r} != {new.get(key)!r}')
+                    break
+            else:
+                continue
+            break
+        raise SystemExit('CardListSerializer 결과가 CardSerializer와 다릅니다.')
+
+    current_seconds = measure(current, repeat)
+    fast_seconds = measure(fast, repeat)
+    return {
+        'rows': rows_count,
+        'current_rows_per_sec': rows_count / current_seconds,
+        'fast_rows_per_sec': rows_count / fast_seconds,
+        'speedup': current_seconds / fast_seconds,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='카드 목록 직렬화 벤치마크')
+    parser.add_argument('--rows', type=int, nargs='+', default=[20, 1000], help='한 번에 직렬화할 행 수')
+    parser.add_argument('--repeat', type=int, default=20, help='반복 횟수 (최소 시간 사용)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    results = [run(count, args.repeat) for count in args.rows]
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'행 수':>8}{'CardSerializer':>20}{'CardListSerializer':>22}{'배수':>8}")
+    for result in results:
+        print(
+            f"{result['rows']:>8}"
+            f"{result['current_rows_per_sec']:>15,.0f} rows/s"
+            f"{result['fast_rows_per_sec']:>17,.0f} rows/s"
+            f"{result['speedup']:>7.1f}x"
+        )
+
+
+if __name__ == '__main__':
+    main()
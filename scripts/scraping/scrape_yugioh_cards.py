@@ -1,110 +1,315 @@
 #!/usr/bin/env python
 """
 유희왕 카드 공식 DB 사이트에서 카드명을 스크래핑하는 스크립트
+
+- 여러 페이지를 동시에(--workers) 가져오되, 토큰 버킷으로 초당 요청 수(--rate)를 제한
+- 연결을 재사용하는 requests.Session (페이지마다 새 연결을 만들지 않음, 5xx/429는 자동 재시도)
+- 페이지마다 결과를 체크포인트 디렉터리에 바로 저장하므로 중간에 실패해도 다시 실행하면
+  실패한 페이지부터 이어서 가져옴 (--restart: 처음부터)
+- 이전 실행에서 받은 ETag/Last-Modified로 조건부 요청 (304면 저장된 결과 사용)
+- --incremental: 발매일 최신순으로 가져오다가 새 카드명이 없는 페이지에 도달하면 중단하고
+  기존 .dat 파일에 새 카드명만 추가
+
+사용 예:
+    python scrape_yugioh_cards.py                    # 전체 스크래핑 (중단된 실행이 있으면 이어서)
+    python scrape_yugioh_cards.py --incremental      # 새로 발매된 카드명만 추가
+    python scrape_yugioh_cards.py --workers 2 --rate 1
+    python scrape_yugioh_cards.py --restart          # 체크포인트 무시하고 처음부터
 """
-import requests
-from bs4 import BeautifulSoup
-import time
-import re
+import argparse
+import hashlib
+import json
 import os
+import re
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from html import unescape
 from pathlib import Path
 
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 BASE_DIR = Path(__file__).resolve().parent
 OUTPUT_FILE = BASE_DIR / 'yugioh_card_names.dat'
-# 스크립트가 scripts/scraping 폴더에 있으므로 경로는 그대로 유지
-
-def scrape_card_names():
-    """유희왕 카드 공식 DB에서 카드명 스크래핑"""
-    base_url = "https://www.db.yugioh-card.com/yugiohdb/card_search.action"
-    params = {
-        'ope': '1',
-        'sess': '1',  # sess=1: 한글, sess=2: 영어
-        'rp': '100',  # 한 페이지당 100개
-        'mode': '1',
-        'stype': '1',
-        'link_m': '2',
-        'othercon': '2',
-        'releaseYStart': '1999',
-        'releaseMStart': '1',
-        'releaseDStart': '1',
-        'sort': '1',
-    }
-    
-    all_card_names = []
-    max_pages = 133  # 예상 최대 페이지 수
-    
-    print(f"유희왕 카드명 스크래핑 시작...")
-    print(f"예상 페이지 수: {max_pages}")
-    
-    headers = {
-        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
-        'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
-        'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
-        'Accept-Encoding': 'gzip, deflate, br',
-        'Connection': 'keep-alive',
-        'Upgrade-Insecure-Requests': '1',
+CHECKPOINT_DIR = BASE_DIR / '.checkpoint'
+
+BASE_URL = "https://www.db.yugioh-card.com/yugiohdb/card_search.action"
+SEARCH_PARAMS = {
+    'ope': '1',
+    'sess': '1',  # sess=1: 한글, sess=2: 영어
+    'rp': '100',  # 한 페이지당 100개
+    'mode': '1',
+    'stype': '1',
+    'link_m': '2',
+    'othercon': '2',
+    'releaseYStart': '1999',
+    'releaseMStart': '1',
+    'releaseDStart': '1',
+    'sort': '1',
+}
+# 증분 모드의 정렬 (발매일 최신순, 사이트의 정렬 값이 바뀌면 --sort로 지정)
+INCREMENTAL_SORT = '21'
+# 마지막 페이지를 찾지 못했을 때의 상한 (현재 약 133페이지)
+MAX_PAGES = 300
+
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'ko-KR,ko;q=0.9,en-US;q=0.8,en;q=0.7',
+    'Accept-Encoding': 'gzip, deflate',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+}
+
+
+class TokenBucket:
+    """초당 rate개, 최대 capacity개까지 몰아서 요청할 수 있는 토큰 버킷 (스레드 안전)"""
+
+    def __init__(self, rate, capacity=1):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+def make_session(pool_size):
+    """연결 풀을 재사용하고 일시적인 오류(429/5xx, 연결 실패)는 백오프 후 재시도하는 세션"""
+    retry = Retry(
+        total=3, backoff_factor=1, status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',), respect_retry_after_header=True,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(HEADERS)
+    return session
+
+
+def parse_card_names(html):
+    """검색 결과 페이지의 카드명 목록 (페이지 내 중복 제외, 순서 유지)"""
+    soup = BeautifulSoup(html, 'html.parser')
+    names = []
+    for span in soup.find_all('span', class_='card_name'):
+        # HTML 엔티티 디코딩 (&quot; -> "), 따옴표 제거 및 공백 정리
+        card_name = unescape(span.get_text(strip=True)).strip().strip('"').strip("'")
+        card_name = re.sub(r'\s+', ' ', card_name)
+        if card_name and card_name not in names:
+            names.append(card_name)
+    return names
+
+
+def read_names(path):
+    if not os.path.exists(path):
+        return []
+    with open(path, encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def write_atomic(path, text):
+    """임시 파일에 쓴 뒤 교체 (쓰는 도중 중단되어도 기존 파일이 깨지지 않음)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class Checkpoint:
+    """페이지별 결과(pages/{번호}.json)와 실행 상태(run.json)
+
+    검색 조건마다 별도 디렉터리를 사용합니다. 이전 실행이 끝나지 않았으면 그 실행에서 받은
+    페이지는 건너뛰고, 끝난 실행이면 모든 페이지를 조건부 요청으로 다시 확인합니다.
+    """
+
+    def __init__(self, directory, key):
+        digest = hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+        self.directory = Path(directory) / digest
+        self.run_file = self.directory / 'run.json'
+        self.run = None
+
+    def start(self, restart=False):
+        """실행 시작. 반환값: 이어서 실행하는지 여부"""
+        previous = None
+        if self.run_file.exists() and not restart:
+            previous = json.loads(self.run_file.read_text(encoding='utf-8'))
+        if previous and not previous.get('complete'):
+            self.run = previous
+            return True
+        self.run = {'started_at': time.time(), 'complete': False}
+        self._save_run()
+        return False
+
+    def finish(self):
+        self.run['complete'] = True
+        self._save_run()
+
+    def _save_run(self):
+        write_atomic(self.run_file, json.dumps(self.run))
+
+    def _page_file(self, page):
+        return self.directory / 'pages' / f'{page}.json'
+
+    def page(self, page):
+        path = self._page_file(page)
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding='utf-8'))
+
+    def is_done(self, page):
+        """이번 실행에서 이미 받은 페이지인지"""
+        data = self.page(page)
+        return data is not None and data['fetched_at'] >= self.run['started_at']
+
+    def save_page(self, page, data):
+        write_atomic(self._page_file(page), json.dumps(data, ensure_ascii=False))
+
+
+def fetch_page(session, bucket, base_url, params, page, previous=None):
+    """페이지 하나를 가져와 {'names', 'etag', 'last_modified', 'fetched_at', 'not_modified'} 반환"""
+    headers = {}
+    if previous:
+        if previous.get('etag'):
+            headers['If-None-Match'] = previous['etag']
+        if previous.get('last_modified'):
+            headers['If-Modified-Since'] = previous['last_modified']
+
+    bucket.acquire()
+    response = session.get(base_url, params={**params, 'page': page}, headers=headers, timeout=30)
+    if response.status_code == 304 and previous:
+        return {**previous, 'fetched_at': time.time(), 'not_modified': True}
+    response.raise_for_status()
+    response.encoding = 'utf-8'
+    return {
+        'names': parse_card_names(response.text),
+        'etag': response.headers.get('ETag'),
+        'last_modified': response.headers.get('Last-Modified'),
+        'fetched_at': time.time(),
+        'not_modified': False,
     }
-    
-    for page in range(1, max_pages + 1):
-        params['page'] = page
-        print(f"페이지 {page}/{max_pages} 처리 중...", end=' ')
-        
-        try:
-            response = requests.get(base_url, params=params, headers=headers, timeout=30)
-            response.raise_for_status()
-            response.encoding = 'utf-8'
-            
-            soup = BeautifulSoup(response.text, 'html.parser')
-            
-            # card_name 클래스를 가진 span 태그 찾기
-            card_name_spans = soup.find_all('span', class_='card_name')
-            
-            if not card_name_spans:
-                print(f"카드명을 찾을 수 없음. 페이지 {page}에서 중단.")
+
+
+def scrape_card_names(base_url=BASE_URL, output=OUTPUT_FILE, checkpoint_dir=CHECKPOINT_DIR, workers=4, rate=2.0,
+                      max_pages=MAX_PAGES, incremental=False, restart=False, sort=None, log=print):
+    """카드명 스크래핑 후 output에 저장. 반환값: 저장한 카드명 목록 (실패한 페이지가 있으면 None)"""
+    known = set(read_names(output)) if incremental else set()
+    params = dict(SEARCH_PARAMS, sort=sort or (INCREMENTAL_SORT if incremental else SEARCH_PARAMS['sort']))
+    checkpoint = Checkpoint(checkpoint_dir, json.dumps({'url': base_url, 'params': params, 'incremental': incremental}, sort_keys=True))
+    if checkpoint.start(restart):
+        log("중단된 이전 실행을 이어서 진행합니다 (--restart: 처음부터)")
+
+    bucket = TokenBucket(rate, capacity=workers)
+    session = make_session(workers)
+    results = {}
+    failed = {}
+    # 마지막 페이지 다음(카드명 없음) 또는 증분 모드에서 새 카드명이 없는 첫 페이지
+    stop_page = None
+
+    def record(page, data):
+        nonlocal stop_page
+        results[page] = data['names']
+        if not data['names'] or (incremental and not set(data['names']) - known):
+            stop_page = page if stop_page is None else min(stop_page, page)
+
+    log(f"유희왕 카드명 스크래핑 시작 (동시 요청 {workers}개, 초당 {rate}회{', 증분' if incremental else ''})")
+    next_page = 1
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending = {}
+        while True:
+            # 진행 중인 요청이 workers개가 되도록 다음 페이지 예약 (중단 지점 이후는 예약하지 않음)
+            while len(pending) < workers and next_page <= max_pages and (stop_page is None or next_page < stop_page):
+                page = next_page
+                next_page += 1
+                if checkpoint.is_done(page):
+                    record(page, checkpoint.page(page))
+                    continue
+                future = executor.submit(fetch_page, session, bucket, base_url, params, page, checkpoint.page(page))
+                pending[future] = page
+            if not pending:
                 break
-            
-            page_card_names = []
-            for span in card_name_spans:
-                card_name = span.get_text(strip=True)
-                if card_name:
-                    # HTML 엔티티 디코딩 (&quot; -> ")
-                    from html import unescape
-                    card_name = unescape(card_name)
-                    # 따옴표 제거 및 정리
-                    card_name = card_name.strip().strip('"').strip("'")
-                    # 공백 정리
-                    card_name = re.sub(r'\s+', ' ', card_name)
-                    if card_name and len(card_name) > 0 and card_name not in page_card_names:
-                        page_card_names.append(card_name)
-            
-            all_card_names.extend(page_card_names)
-            print(f"✓ {len(page_card_names)}개 카드명 발견 (총 {len(all_card_names)}개)")
-            
-            # 서버 부하를 줄이기 위해 딜레이
-            time.sleep(1)
-            
-        except requests.exceptions.RequestException as e:
-            print(f"✗ 오류 발생: {str(e)}")
-            print(f"페이지 {page}에서 중단.")
-            break
-        except Exception as e:
-            print(f"✗ 예상치 못한 오류: {str(e)}")
-            continue
-    
-    # 중복 제거 및 정렬
-    unique_card_names = sorted(list(set(all_card_names)))
-    
-    # .dat 파일로 저장
-    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
-        for card_name in unique_card_names:
-            f.write(f"{card_name}\n")
-    
-    print(f"\n=== 스크래핑 완료 ===")
-    print(f"총 {len(unique_card_names)}개의 고유 카드명 발견")
-    print(f"파일 저장 위치: {OUTPUT_FILE}")
-    
+
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                page = pending.pop(future)
+                try:
+                    data = future.result()
+                except requests.RequestException as e:
+                    failed[page] = str(e)
+                    log(f"페이지 {page}: ✗ 오류 발생: {e}")
+                    continue
+                checkpoint.save_page(page, data)
+                record(page, data)
+                status = '변경 없음' if data['not_modified'] else f"{len(data['names'])}개 카드명"
+                log(f"페이지 {page}: ✓ {status}")
+    session.close()
+
+    failed = {page: error for page, error in failed.items() if stop_page is None or page < stop_page}
+    if failed:
+        log(f"\n{len(failed)}개 페이지 실패: {', '.join(map(str, sorted(failed)))}")
+        log("다시 실행하면 실패한 페이지부터 이어서 가져옵니다.")
+        return None
+
+    names = set(known)
+    for page, page_names in results.items():
+        if stop_page is None or page < stop_page:
+            names.update(page_names)
+    unique_card_names = sorted(names)
+    write_atomic(output, ''.join(f"{card_name}\n" for card_name in unique_card_names))
+    checkpoint.finish()
+
+    log("\n=== 스크래핑 완료 ===")
+    if incremental:
+        log(f"새 카드명 {len(names) - len(known)}개 추가")
+    log(f"총 {len(unique_card_names)}개의 고유 카드명")
+    log(f"파일 저장 위치: {output}")
     return unique_card_names
 
-if __name__ == '__main__':
-    scrape_card_names()
 
+def main():
+    parser = argparse.ArgumentParser(description='유희왕 카드 공식 DB 카드명 스크래핑')
+    parser.add_argument('--workers', type=int, default=4, help='동시 요청 수')
+    parser.add_argument('--rate', type=float, default=2.0, help='초당 최대 요청 수')
+    parser.add_argument('--max-pages', type=int, default=MAX_PAGES, help='가져올 최대 페이지 수')
+    parser.add_argument('--incremental', action='store_true', help='새 카드명이 없는 페이지에 도달하면 중단하고 기존 파일에 추가')
+    parser.add_argument('--restart', action='store_true', help='체크포인트를 무시하고 처음부터 실행')
+    parser.add_argument('--sort', help='검색 결과 정렬 값 (기본: 전체 1, 증분 21)')
+    parser.add_argument('--output', default=str(OUTPUT_FILE), help='카드명 파일 경로')
+    parser.add_argument('--checkpoint-dir', default=str(CHECKPOINT_DIR), help='체크포인트 디렉터리')
+    parser.add_argument('--base-url', default=BASE_URL, help='검색 URL')
+    args = parser.parse_args()
+
+    names = scrape_card_names(
+        base_url=args.base_url, output=args.output, checkpoint_dir=args.checkpoint_dir,
+        workers=args.workers, rate=args.rate, max_pages=args.max_pages,
+        incremental=args.incremental, restart=args.restart, sort=args.sort,
+    )
+    if names is None:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'yugioh_site.settings')
+# 공개 조회 API는 비동기 뷰로 처리 (cards/async_views.py, 쓰기 요청은 기존 동기 뷰)
+os.environ.setdefault('ASYNC_READ_VIEWS', 'True')
 
 application = get_asgi_application()
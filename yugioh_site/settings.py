@@ -63,12 +63,15 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
     'corsheaders',
     'cards',
 ]
 
 MIDDLEWARE = [
+    # 요청별 DB/직렬화/이미지/전체 시간 측정 (다른 미들웨어 시간까지 포함하도록 맨 앞)
+    'cards.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',
@@ -155,6 +158,16 @@ STATIC_ROOT = BASE_DIR / 'staticfiles'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# 업로드 파일은 내용 해시로 저장 (중복 제거, URL 불변 → nginx에서 immutable 캐시)
+STORAGES = {
+    'default': {
+        'BACKEND': 'cards.storage.ContentAddressedStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage',
+    },
+}
+
 # CORS settings for Vue.js
 CORS_ALLOWED_ORIGINS = [
     "http://silbuntu.mooo.com",
@@ -240,17 +253,68 @@ LOGGING = {
 }
 
 # Cache configuration (Rate limiting용)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',
-        'OPTIONS': {
-            'MAX_ENTRIES': 10000
+# REDIS_URL이 있으면 모든 워커가 공유하는 Redis 캐시 사용 (응답 캐시/요청 제한이 워커 간에 일관됨)
+# 없으면 프로세스별 메모리 캐시로 대체
+REDIS_URL = os.getenv('REDIS_URL', '')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'yugioh',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',
+            'OPTIONS': {
+                'MAX_ENTRIES': 10000
+            }
         }
     }
+
+# 카드 목록/상세 응답 캐시 (cards/response_cache.py)
+CARD_RESPONSE_CACHE = {
+    'ENABLED': True,
+    'TIMEOUT': 300,          # 공유 캐시(Redis) 유효 시간(초), 카드 변경 시 즉시 무효화
+    'LOCAL_TIMEOUT': 5,      # 메모리 캐시로 대체된 경우 유효 시간(초)
+}
+
+# 카드 이미지 파생본 설정 (해상도별 WebP/AVIF/JPEG, AVIF는 Pillow 지원 시에만 생성)
+IMAGE_DERIVATIVES = {
+    'WIDTHS': [200, 400, 800],
+    'FORMATS': ['avif', 'webp', 'jpeg'],
+    'QUALITY': {'avif': 60, 'webp': 80, 'jpeg': 85},
+}
+
+# 업로드 이미지 최대 픽셀 수 (decompression bomb 방지, 약 8000x5000)
+IMAGE_MAX_PIXELS = 40_000_000
+
+# 요청 성능 계측 (cards/instrumentation.py, 집계는 GET /api/cards/metrics/에서 Prometheus 형식으로 조회)
+PERFORMANCE_METRICS = {
+    'ENABLED': os.getenv('PERFORMANCE_METRICS', 'True') == 'True',
+    'SERVER_TIMING': True,                                          # Server-Timing 응답 헤더
+    'SLOW_QUERY_MS': int(os.getenv('SLOW_QUERY_MS', '100')),       # 이보다 오래 걸린 쿼리는 경고 로그
+    'SLOW_REQUEST_MS': int(os.getenv('SLOW_REQUEST_MS', '1000')),  # 이보다 오래 걸린 요청은 경고 로그
+    'N_PLUS_ONE_THRESHOLD': 10,   # 한 요청에서 같은 SQL이 이 횟수 이상 실행되면 N+1 의심 경고
+    'FLUSH_INTERVAL': 10,         # 프로세스 집계를 공유 캐시에 반영하는 주기(초)
+}
+
+# 백그라운드 작업 큐 설정 (python manage.py run_jobs 워커에서 사용)
+JOB_QUEUE = {
+    'MAX_ATTEMPTS': 3,       # 작업당 최대 시도 횟수
+    'RETRY_BACKOFF': 30,     # 재시도 대기 시간(초), 시도마다 2배씩 증가
+    'STALE_TIMEOUT': 600,    # 이 시간(초) 이상 실행중인 작업은 워커 중단으로 간주하고 재등록
+    'POLL_INTERVAL': 1.0,    # 대기 작업이 없을 때 조회 간격(초)
 }
 
 # REST Framework settings
+# 공개 조회 API(목록/상세/카드명 검색)를 비동기 뷰로 처리 (cards/async_views.py)
+# ASGI(yugioh_site.asgi)로 실행하면 기본으로 켜짐, WSGI(gunicorn)에서는 동기 CardViewSet 사용
+ASYNC_READ_VIEWS = os.getenv('ASYNC_READ_VIEWS', 'False').lower() == 'true'
+
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'rest_framework.authentication.SessionAuthentication',
@@ -260,5 +324,14 @@ REST_FRAMEWORK = {
         'rest_framework.permissions.AllowAny',
     ],
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
-    'PAGE_SIZE': 20
+    'PAGE_SIZE': 20,
+    # CardViewSet.throttle_scopes의 범위별 요청 빈도 제한 (사용자 또는 IP별, cards/throttles.py)
+    'DEFAULT_THROTTLE_RATES': {
+        'card_upload': os.getenv('THROTTLE_CARD_UPLOAD', '60/min'),
+        'card_search': os.getenv('THROTTLE_CARD_SEARCH', '300/min'),
+        'card_names': os.getenv('THROTTLE_CARD_NAMES', '30/min'),
+    },
+    # 앱 앞에 있는 프록시 수: X-Forwarded-For의 오른쪽에서 이 위치의 주소를 클라이언트 IP로 사용
+    # (운영은 nginx 1단, 개발 서버처럼 프록시가 없으면 0 → REMOTE_ADDR)
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES', '0' if DEBUG else '1')),
 }